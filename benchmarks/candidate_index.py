@@ -0,0 +1,148 @@
+"""
+/candidate-matcher: recorrido de todos los candidatos (agrupados por combinación de
+títulos y de skills, implementación anterior) frente al índice invertido de bitmaps
+de models/candidate/index.py.
+
+1. Equivalencia: mismos resultados (top-k y lista completa) para cada oferta sintética
+   y para puestos/categorías vacíos, de varias palabras o que cruzan dos títulos.
+2. Coste: construir el índice (una vez por tabla), ms por oferta con la tabla ya cargada
+   (anterior vs índice) y µs por alta/baja incremental.
+
+Uso:
+    python -m benchmarks.candidate_index --candidates 100000 --offers 200
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from benchmarks.synthetic import synthetic_candidates, synthetic_offers
+from models.candidate.index import CandidateIndex
+from models.candidate.matcher import match_candidates_from_offer
+from models.candidate.table import CandidateTable
+from models.matches.scoring import CANDIDATE_RULES, CANDIDATE_SCORE_TABLE, decode_reasons, top_k
+from utils.normalize import normalize
+
+EDGE_OFFERS = [
+    {"id": "vacia", "puesto": "", "descripcion": "", "categoria": ""},
+    {"id": "digitos", "puesto": "123", "descripcion": "", "categoria": "!!"},
+    {"id": "cruza", "puesto": "Mozo de", "descripcion": "de", "categoria": "Almacén"},
+    {"id": "frase", "puesto": "Mozo de almacén", "descripcion": "limpieza y cocina", "categoria": "Jefe de"},
+    {"id": "letras", "puesto": "o", "descripcion": "a e", "categoria": "de"},
+]
+
+
+def match_scan(offer: Dict, table: CandidateTable, limit: int = 10) -> List[Dict]:
+    """match_candidates_from_offer anterior: reglas por combinación única de títulos/skills."""
+    offer_puesto = normalize(offer["puesto"])
+    offer_desc = normalize(offer.get("descripcion", ""))
+    offer_cat = normalize(offer.get("categoria", ""))
+    desc_words = offer_desc.split()
+
+    norm_titles = table.normalized_titles()
+    title_groups, title_inv = table.title_groups()
+    title_flags = np.zeros(len(title_groups), dtype=np.uint8)
+    for g, title_ids in enumerate(title_groups):
+        exp_titles = " ".join(norm_titles[t] if t >= 0 else "" for t in title_ids)
+        flags = 0
+        if offer_puesto in exp_titles:
+            flags |= 1
+        if offer_desc and any(w in exp_titles for w in desc_words):
+            flags |= 2
+        if offer_cat and offer_cat in exp_titles:
+            flags |= 8
+        title_flags[g] = flags
+
+    skill_flags = np.zeros(0, dtype=np.uint8)
+    skill_groups, skill_inv = table.skill_groups()
+    if offer_desc:
+        skill_hit = [any(tok in offer_desc for tok in s.split()) for s in table.normalized_skills()]
+        skill_flags = np.fromiter(
+            (4 if any(skill_hit[s] for s in skill_ids if s >= 0) else 0 for skill_ids in skill_groups),
+            dtype=np.uint8,
+            count=len(skill_groups),
+        )
+
+    flags = title_flags[title_inv]
+    if len(skill_flags):
+        flags = flags | skill_flags[skill_inv]
+    cols, top_scores = top_k(CANDIDATE_SCORE_TABLE[flags][None, :], table.id_ranks(), limit)
+    return [
+        {
+            "id": table.ids[i],
+            "name": table.names[i],
+            "email": table.emails[i],
+            "phone": table.phones[i],
+            "current_position": table.current_position(i),
+            "match_percentage": score,
+            "reasons": decode_reasons(int(flags[i]), CANDIDATE_RULES),
+        }
+        for i, score in zip(cols[0].tolist(), top_scores[0].tolist()) if i >= 0
+    ]
+
+
+def per_offer_ms(func, offers: List[Dict], table: CandidateTable) -> float:
+    started = time.perf_counter()
+    for offer in offers:
+        func(offer, table)
+    return (time.perf_counter() - started) / len(offers) * 1000
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="/candidate-matcher: recorrido completo vs índice de bitmaps")
+    parser.add_argument("--candidates", type=int, default=100000)
+    parser.add_argument("--offers", type=int, default=200)
+    parser.add_argument("--updates", type=int, default=1000, help="altas/bajas incrementales a medir")
+    parser.add_argument("--out", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    candidates = synthetic_candidates(args.candidates)
+    offers = synthetic_offers(args.offers)
+    table = CandidateTable.from_dicts(candidates)
+
+    started = time.perf_counter()
+    index = table.token_index()
+    build_ms = (time.perf_counter() - started) * 1000
+    bitmaps_mb = sum(
+        (b.bit_length() + 7) // 8 for vocab in (index._titles, index._skills) for b in vocab.values()
+    ) / 1e6
+
+    mismatches = sum(
+        match_scan(o, table, limit) != match_candidates_from_offer(o, table, limit)
+        for o in offers[:50] + EDGE_OFFERS for limit in (10, len(table))
+    )
+    # Los derivados memoizados de la tabla (grupos, títulos normalizados) ya están calculados
+    results = {
+        "scan_ms_per_offer": round(per_offer_ms(match_scan, offers, table), 2),
+        "index_ms_per_offer": round(per_offer_ms(match_candidates_from_offer, offers, table), 2),
+    }
+
+    rows = list(range(0, len(table), max(1, len(table) // args.updates)))[:args.updates]
+    started = time.perf_counter()
+    for i in rows:
+        index.remove(i)
+    results["remove_us"] = round((time.perf_counter() - started) / len(rows) * 1e6, 1)
+    started = time.perf_counter()
+    for i in rows:
+        index.add(i, [t for t, _ in table.experience(i)], table.skills(i))
+    results["add_us"] = round((time.perf_counter() - started) / len(rows) * 1e6, 1)
+
+    summary = {
+        "candidates": len(table),
+        "title_words": len(index._titles),
+        "skill_words": len(index._skills),
+        "mismatches": mismatches,
+        "index_build_ms": round(build_ms, 1),
+        "bitmaps_mb": round(bitmaps_mb, 2),
+        **results,
+    }
+    print(json.dumps(summary, indent=2))
+    if args.out:
+        args.out.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Memoria de los candidatos en el matching: lista de dicts frente a CandidateTable.
+
+Las filas se pasan por JSON antes de medir para que cada candidato tenga sus propios
+objetos str (como los devuelve el driver de la DB) y no compartan los de los datos
+sintéticos. Para cada tamaño reporta, con tracemalloc:
+
+  dicts   memoria retenida por la lista de dicts (lo que devolvía get_candidates_for_matching)
+  table   memoria retenida por la CandidateTable construida fila a fila
+  peak    pico durante la construcción de la tabla (incluye la fila en curso)
+
+Uso:
+    python -m benchmarks.candidate_memory --sizes 10000 100000 --out mem.json
+"""
+import argparse
+import gc
+import json
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List
+
+from benchmarks.synthetic import synthetic_candidates
+from models.candidate.table import CandidateTableBuilder
+
+
+def _mb(n: int) -> float:
+    return round(n / 2**20, 2)
+
+
+def _rows(payload: List[str]):
+    # Un dict nuevo por fila, como los Row de un cursor
+    for raw in payload:
+        yield json.loads(raw)
+
+
+def measure_size(n: int) -> Dict:
+    payload = [json.dumps(c, ensure_ascii=False) for c in synthetic_candidates(n)]
+    gc.collect()
+
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    dicts = [row for row in _rows(payload)]
+    dicts_bytes = tracemalloc.get_traced_memory()[0] - base
+    del dicts
+    gc.collect()
+
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    builder = CandidateTableBuilder()
+    for row in _rows(payload):
+        builder.append(row["id"], row.get("name"), row.get("email"), row.get("phone"),
+                       row.get("experience"), row.get("skills"))
+    table = builder.build()
+    del builder
+    gc.collect()
+    table_bytes, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "candidates": n,
+        "dicts_mb": _mb(dicts_bytes),
+        "table_mb": _mb(table_bytes - base),
+        "table_peak_mb": _mb(peak - base),
+        "table_nbytes_mb": _mb(table.nbytes),
+        "titles": len(table.titles),
+        "skills": len(table.skill_vocab),
+        "ratio": round(dicts_bytes / max(table_bytes - base, 1), 1),
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Memoria de candidatos: lista de dicts vs CandidateTable")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--out", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    results = []
+    print(f"{'candidatos':>10} {'dicts(MB)':>10} {'tabla(MB)':>10} {'pico(MB)':>9} {'x':>6}")
+    for n in args.sizes:
+        r = measure_size(n)
+        results.append(r)
+        print(f"{n:>10} {r['dicts_mb']:>10} {r['table_mb']:>10} {r['table_peak_mb']:>9} {r['ratio']:>6}")
+
+    if args.out:
+        args.out.write_text(json.dumps({"results": results}, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
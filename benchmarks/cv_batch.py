@@ -0,0 +1,125 @@
+"""
+Extracción de N CVs: N subidas a /extract-cv-data (encolar + sondear /jobs/{id}/result)
+frente a una sola subida a /extract-cv-data/batch (varios archivos o un ZIP) con la
+respuesta NDJSON en streaming.
+
+Arranca la app (uvicorn) y un servidor NER falso, como benchmarks.loadtest. Para cada
+modo: tiempo total, tiempo hasta el primer resultado y CVs extraídos correctamente.
+
+Uso:
+    python -m benchmarks.cv_batch --cvs 30 --concurrency 8 --ner-latency-ms 40
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.loadtest import _free_port, start_app, start_fake_ner, wait_ready
+from benchmarks.synthetic import write_cv_fixtures
+
+
+async def single_uploads(client: httpx.AsyncClient, paths: List[Path], concurrency: int) -> Dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    started = time.perf_counter()
+    first: List[float] = []
+    ok = 0
+
+    async def one(path: Path) -> None:
+        nonlocal ok
+        async with semaphore:
+            r = await client.post("/extract-cv-data", files={"file": (path.name, path.read_bytes())})
+            r.raise_for_status()
+            result_url = r.json()["result_url"]
+            while True:
+                r = await client.get(result_url)
+                if r.status_code != 202:
+                    break
+                await asyncio.sleep(0.02)
+        first.append(time.perf_counter() - started)
+        ok += r.status_code == 200
+
+    await asyncio.gather(*(one(p) for p in paths))
+    return {"total_s": time.perf_counter() - started, "first_s": min(first), "ok": ok}
+
+
+async def batch_upload(client: httpx.AsyncClient, files: list) -> Dict:
+    started = time.perf_counter()
+    first = None
+    ok = 0
+    async with client.stream("POST", "/extract-cv-data/batch", files=files) as r:
+        r.raise_for_status()
+        async for line in r.aiter_lines():
+            if not line:
+                continue
+            item = json.loads(line)
+            if "summary" in item:
+                break
+            first = first or time.perf_counter() - started
+            ok += item["status"] == "ok"
+    return {"total_s": time.perf_counter() - started, "first_s": first, "ok": ok}
+
+
+def _zip(paths: List[Path]) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        for path in paths:
+            zf.write(path, f"cvs/{path.name}")
+    return buffer.getvalue()
+
+
+async def run(base_url: str, paths: List[Path], concurrency: int) -> Dict:
+    async with httpx.AsyncClient(base_url=base_url, timeout=300) as client:
+        return {
+            "single": await single_uploads(client, paths, concurrency),
+            "batch": await batch_upload(client, [("files", (p.name, p.read_bytes())) for p in paths]),
+            "zip": await batch_upload(client, [("files", ("cvs.zip", _zip(paths)))]),
+        }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="N subidas individuales frente a un lote NDJSON")
+    parser.add_argument("--cvs", type=int, default=30, help="CVs por formato (PDF, DOCX, TXT)")
+    parser.add_argument("--concurrency", type=int, default=8, help="subidas individuales a la vez")
+    parser.add_argument("--ner-latency-ms", type=float, default=40.0)
+    parser.add_argument("--out", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fixtures = write_cv_fixtures(Path(tmp) / "cvs", args.cvs)
+        paths = [p for group in fixtures.values() for p in group]
+        ner_port, app_port = _free_port(), _free_port()
+        ner_server = start_fake_ner(ner_port, args.ner_latency_ms)
+        app_proc = start_app(app_port, {
+            "DATABASE_URL_PYTHON": f"sqlite+aiosqlite:///{Path(tmp) / 'batch.db'}",
+            "NER_ENDPOINT_URL": f"http://127.0.0.1:{ner_port}",
+            "HF_API_TOKEN": os.getenv("HF_API_TOKEN", "benchmark"),
+            "LOG_LEVEL": "WARNING",
+            "PYTHONWARNINGS": "ignore",
+        }, 1)
+        base_url = f"http://127.0.0.1:{app_port}"
+        try:
+            wait_ready(base_url)
+            results = asyncio.run(run(base_url, paths, args.concurrency))
+        finally:
+            app_proc.terminate()
+            app_proc.wait(timeout=30)
+            ner_server.shutdown()
+
+    print(f"{len(paths)} CVs")
+    print(f"{'modo':<8} {'total(s)':>9} {'primero(s)':>11} {'ok':>5}")
+    for name, r in results.items():
+        print(f"{name:<8} {r['total_s']:>9.2f} {r['first_s']:>11.2f} {r['ok']:>5}")
+    if args.out:
+        args.out.write_text(json.dumps({"cvs": len(paths), "results": results}, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Extracción de texto DOCX: DOM de python-docx frente a utils.docx_text (streaming).
+
+Para un CV sintético y un documento grande (párrafos + tabla) mide el tiempo por
+documento y el pico de RSS de un proceso nuevo que solo extrae ese documento
+(VmHWM; tracemalloc no ve la memoria de lxml). Comprueba también que, en los CVs sin tablas
+ni cuadros de texto, ambos devuelven el mismo texto.
+
+Uso:
+    python -m benchmarks.docx_extract --paragraphs 3000 --rows 300
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+from benchmarks.synthetic import write_cv_fixtures
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def docx_dom(path: str) -> str:
+    """Extractor anterior: párrafos del cuerpo vía python-docx."""
+    from docx import Document
+
+    return "".join(paragraph.text + "\n" for paragraph in Document(path).paragraphs)
+
+
+def docx_stream(path: str) -> str:
+    from utils.docx_text import extract_docx_text
+
+    return extract_docx_text(path)
+
+
+EXTRACTORS: Dict[str, Callable[[str], str]] = {"python-docx": docx_dom, "stream": docx_stream}
+
+_RSS_SNIPPET = """
+import sys
+import docx, utils.docx_text  # imports de ambos extractores en la base
+from benchmarks.docx_extract import EXTRACTORS
+
+def status(key):
+    with open("/proc/self/status") as f:
+        return next(int(line.split()[1]) for line in f if line.startswith(key))
+
+with open("/proc/self/clear_refs", "w") as f:
+    f.write("5")  # reinicia VmHWM (pico de RSS) tras los imports
+base = status("VmRSS:")
+EXTRACTORS[sys.argv[1]](sys.argv[2])
+print(status("VmHWM:") - base)
+"""
+
+
+def write_big_docx(path: Path, paragraphs: int, rows: int) -> None:
+    from docx import Document
+
+    doc = Document()
+    for i in range(paragraphs):
+        doc.add_paragraph(f"Línea {i}: experiencia laboral como mozo de almacén en Mercadona, turnos rotativos")
+    table = doc.add_table(rows=rows, cols=3)
+    for row in table.rows:
+        for cell in row.cells:
+            cell.text = "Auxiliar de limpieza 2019 - 2021"
+    doc.save(path)
+
+
+def measure(name: str, path: Path, repeat: int) -> Dict:
+    extract = EXTRACTORS[name]
+    extract(str(path))
+    started = time.perf_counter()
+    for _ in range(repeat):
+        extract(str(path))
+    ms = (time.perf_counter() - started) / repeat * 1000
+    # KB (Linux): crecimiento del pico de RSS durante la extracción
+    out = subprocess.run(
+        [sys.executable, "-c", _RSS_SNIPPET, name, str(path)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return {"ms": round(ms, 2), "peak_rss_growth_mb": round(int(out.stdout.strip()) / 1024, 2)}
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Extracción DOCX: python-docx vs streaming")
+    parser.add_argument("--paragraphs", type=int, default=3000)
+    parser.add_argument("--rows", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--out", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        cvs = write_cv_fixtures(Path(tmp), 20)[".docx"]
+        same = sum(docx_dom(str(p)) == docx_stream(str(p)) for p in cvs)
+        print(f"Mismo texto en {same}/{len(cvs)} CVs sintéticos")
+        big = Path(tmp) / "big.docx"
+        write_big_docx(big, args.paragraphs, args.rows)
+
+        print(f"{'extractor':<12} {'doc':<5} {'ms/doc':>9} {'pico RSS(MB)':>13}")
+        for label, path, repeat in (("cv", cvs[0], args.repeat * 5), ("big", big, args.repeat)):
+            for name in EXTRACTORS:
+                r = results[f"{name} {label}"] = measure(name, path, repeat)
+                print(f"{name:<12} {label:<5} {r['ms']:>9} {r['peak_rss_growth_mb']:>13}")
+
+    if args.out:
+        args.out.write_text(json.dumps({"same_text": same, "results": results}, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
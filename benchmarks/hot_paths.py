@@ -0,0 +1,318 @@
+"""
+Benchmark offline de los caminos calientes, a varios tamaños de datos.
+
+Sin red ni DB: CVs sintéticos (TXT/DOCX/PDF), ofertas y candidatos escalados desde
+data/*.json y NER simulado (benchmarks.synthetic.fake_ner en lugar de ner_via_hf).
+
+Mide:
+  extract_text_from_file (por formato), extract_cv_data_from_text (completo y fields=),
+  _transform_data_for_employability_model, predict_employability, recommend_jobs,
+  match_offers (1 candidato x N ofertas) y match_candidates_from_offer (1 oferta x N candidatos).
+
+Uso:
+    python -m benchmarks.hot_paths                                   # tamaños por defecto
+    python -m benchmarks.hot_paths --quick                           # tamaños pequeños
+    python -m benchmarks.hot_paths --out bench.json --baseline benchmarks/baselines/hot_paths.json
+    python -m benchmarks.hot_paths --save-baseline                   # reescribe la baseline
+
+La baseline guarda una referencia por juego de tamaños ("default" y "quick"): cada
+ejecución se compara con la de sus tamaños y --save-baseline solo reescribe esa. Con
+--baseline el proceso termina con código 1 si algún caso es más lento que
+baseline * (1 + --tolerance) en la mediana, o si ningún caso está en la baseline (no
+se habría comparado nada).
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "hot_paths.json"
+
+DEFAULT_SIZES = {
+    "cvs": [5, 25],
+    "employability": [10, 100],
+    "recommend": [100, 1000],
+    "offers": [34, 1000, 10000],
+    "candidates": [1000, 10000, 100000],
+}
+QUICK_SIZES = {
+    "cvs": [3],
+    "employability": [5],
+    "recommend": [100],
+    "offers": [34, 500],
+    "candidates": [1000, 5000],
+}
+
+
+# =====================
+# MEDICIÓN
+# =====================
+
+def measure(func: Callable[[], object], repeat: int, items: int) -> Dict:
+    """Ejecuta func `repeat` veces (tras una de calentamiento) y resume los tiempos."""
+    func()
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - t0)
+    median = statistics.median(times)
+    return {
+        "items": items,
+        "repeat": repeat,
+        "median_s": median,
+        "min_s": min(times),
+        "mean_s": statistics.mean(times),
+        "per_item_us": median / items * 1e6 if items else None,
+    }
+
+
+def _run(coro_func: Callable, *args):
+    return asyncio.run(coro_func(*args))
+
+
+# =====================
+# CASOS
+# =====================
+
+def bench_cv_extraction(sizes: List[int], repeat: int, results: Dict) -> None:
+    import models.cv_processing as cv_processing
+    from benchmarks.synthetic import fake_ner, write_cv_fixtures
+
+    # NER simulado: misma firma que ner_via_hf
+    async def fake_ner_via_hf(text, head_only=False):
+        return fake_ner(text)
+
+    cv_processing.ner_via_hf = fake_ner_via_hf
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = write_cv_fixtures(Path(tmp), max(sizes))
+        for n in sizes:
+            for ext, paths in files.items():
+                batch = paths[:n]
+
+                async def extract_texts():
+                    return [await cv_processing.extract_text_from_file(str(p)) for p in batch]
+
+                results[f"extract_text_from_file[{ext[1:]}] n={n}"] = measure(lambda: _run(extract_texts), repeat, n)
+
+            texts = [p.read_text(encoding="utf-8") for p in files[".txt"][:n]]
+
+            async def extract_all():
+                return [await cv_processing.extract_cv_data_from_text(t, str(i), f"cv_{i}.txt") for i, t in enumerate(texts)]
+
+            results[f"extract_cv_data_from_text n={n}"] = measure(lambda: _run(extract_all), repeat, n)
+
+            # fields= del front de matching: solo skills y experience (sin NER ni resumen)
+            async def extract_selected():
+                return [
+                    await cv_processing.extract_cv_data_from_text(t, str(i), f"cv_{i}.txt", fields=("skills", "experience"))
+                    for i, t in enumerate(texts)
+                ]
+
+            results[f"extract_cv_data_from_text[skills,experience] n={n}"] = measure(lambda: _run(extract_selected), repeat, n)
+
+
+def bench_employability(sizes: List[int], repeat: int, results: Dict) -> None:
+    from models.employability_model import _transform_data_for_employability_model, predict_employability
+    from benchmarks.synthetic import synthetic_candidates, to_candidate_data
+
+    rng = random.Random(7)
+    for n in sizes:
+        data = [to_candidate_data(c, rng) for c in synthetic_candidates(n)]
+        results[f"_transform_data_for_employability_model n={n}"] = measure(
+            lambda: [_transform_data_for_employability_model(d) for d in data], repeat, n
+        )
+
+        async def predict_all():
+            return [await predict_employability(d) for d in data]
+
+        results[f"predict_employability n={n}"] = measure(lambda: _run(predict_all), repeat, n)
+
+
+def bench_recommend(sizes: List[int], repeat: int, results: Dict) -> None:
+    from models.recommendation_model import recommend_jobs
+    from schemas.cv import ExtractedCVData
+    from benchmarks.synthetic import synthetic_candidates
+
+    for n in sizes:
+        data = [ExtractedCVData(name=c["name"], experience=c["experience"], skills=c["skills"]) for c in synthetic_candidates(n)]
+
+        async def recommend_all():
+            return [await recommend_jobs(d) for d in data]
+
+        results[f"recommend_jobs n={n}"] = measure(lambda: _run(recommend_all), repeat, n)
+
+
+def bench_match_offers(sizes: List[int], repeat: int, results: Dict) -> None:
+    from models.offers.matcher import match_offers
+    from models.recommendation_model import recommend_positions
+    from schemas.cv import ExtractedCVData
+    from benchmarks.synthetic import synthetic_candidates, synthetic_offers
+
+    candidate = synthetic_candidates(1, seed=3)[0]
+    candidate_data = ExtractedCVData(name=candidate["name"], experience=candidate["experience"], skills=candidate["skills"])
+    recommended = recommend_positions((e["title"], e["years"]) for e in candidate["experience"])
+    for n in sizes:
+        offers = synthetic_offers(n)
+        results[f"match_offers offers={n}"] = measure(
+            lambda: _run(match_offers, candidate_data, recommended, None, offers), repeat, n
+        )
+
+
+def bench_match_candidates(sizes: List[int], repeat: int, results: Dict) -> None:
+    from models.candidate.matcher import match_candidates_from_offer
+    from models.candidate.table import CandidateTable
+    from benchmarks.synthetic import synthetic_candidates, synthetic_offers
+
+    offer = synthetic_offers(1)[0]
+    candidates = synthetic_candidates(max(sizes))
+    for n in sizes:
+        subset = candidates[:n]
+        # Como en /candidate-matcher: la tabla se construye en cada petición
+        results[f"match_candidates_from_offer candidates={n}"] = measure(
+            lambda: match_candidates_from_offer(offer, CandidateTable.from_dicts(subset)), repeat, n
+        )
+
+
+BENCHES = {
+    "cvs": bench_cv_extraction,
+    "employability": bench_employability,
+    "recommend": bench_recommend,
+    "offers": bench_match_offers,
+    "candidates": bench_match_candidates,
+}
+
+
+# =====================
+# BASELINE
+# =====================
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[Dict]:
+    rows = []
+    for case, current in results.items():
+        base = baseline.get(case)
+        if not base:
+            rows.append({"case": case, "ratio": None, "status": "nuevo"})
+            continue
+        ratio = current["median_s"] / base["median_s"] if base["median_s"] else None
+        if ratio is None:
+            status = "?"
+        elif ratio > 1 + tolerance:
+            status = "REGRESIÓN"
+        elif ratio < 1 - tolerance:
+            status = "mejora"
+        else:
+            status = "igual"
+        rows.append({"case": case, "ratio": ratio, "status": status})
+    return rows
+
+
+def load_baseline(path: Path, size_set: str) -> Dict:
+    """Referencia del juego de tamaños; las baselines antiguas (sin juegos) son de "default"."""
+    if not path.exists():
+        return {}
+    with open(path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if "results" in baseline:
+        baseline = {"default": baseline}
+    return baseline.get(size_set, {})
+
+
+def save_baseline(path: Path, size_set: str, report: Dict) -> None:
+    baselines = {}
+    if path.exists():
+        with open(path, encoding="utf-8") as f:
+            baselines = json.load(f)
+        if "results" in baselines:
+            baselines = {"default": baselines}
+    baselines[size_set] = report
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(baselines, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark offline de los caminos calientes")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHES), default=list(BENCHES))
+    parser.add_argument("--quick", action="store_true", help="tamaños pequeños (CI / humo)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", type=Path, default=None, help="JSON con los resultados")
+    parser.add_argument("--baseline", type=Path, default=None, help="JSON de referencia para comparar")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="margen relativo antes de marcar regresión")
+    parser.add_argument(
+        "--save-baseline", action="store_true",
+        help=f"escribe los resultados en {BASELINE_PATH} (solo el juego de tamaños ejecutado)",
+    )
+    args = parser.parse_args(argv)
+
+    size_set = "quick" if args.quick else "default"
+    sizes = QUICK_SIZES if args.quick else DEFAULT_SIZES
+    results: Dict[str, Dict] = {}
+    for name in args.only:
+        t0 = time.perf_counter()
+        BENCHES[name](sizes[name], args.repeat, results)
+        print(f"[{name}] {time.perf_counter() - t0:.1f}s")
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "quick": args.quick,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+    print(f"\n{'caso':<60} {'mediana(s)':>11} {'us/item':>10}")
+    for case, r in results.items():
+        print(f"{case:<60} {r['median_s']:>11.4f} {r['per_item_us']:>10.1f}")
+
+    exit_code = 0
+    if args.baseline:
+        baseline = load_baseline(args.baseline, size_set)
+        rows = compare(results, baseline.get("results", {}), args.tolerance)
+        report["comparison"] = {
+            "baseline": str(args.baseline), "sizes": size_set, "tolerance": args.tolerance, "cases": rows,
+        }
+        print(f"\nComparación con {args.baseline} [{size_set}] (commit {baseline.get('meta', {}).get('commit')}):")
+        for row in rows:
+            ratio = f"{row['ratio']:.2f}x" if row["ratio"] is not None else "-"
+            print(f"{row['case']:<60} {ratio:>8} {row['status']}")
+        if any(row["status"] == "REGRESIÓN" for row in rows):
+            exit_code = 1
+        if all(row["status"] == "nuevo" for row in rows):
+            print(
+                f"\nERROR: ningún caso está en la baseline [{size_set}] de {args.baseline}: no se ha "
+                f"comparado nada. Genérala con --save-baseline{' --quick' if args.quick else ''}.",
+                file=sys.stderr,
+            )
+            exit_code = 1
+
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    if args.save_baseline:
+        save_baseline(BASELINE_PATH, size_set, report)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""
+Presupuesto de tiempo de importación de la API (arranque en frío de cada worker/pod).
+
+Ejecuta `python -X importtime -c "import main"` en un proceso limpio, varias veces, y
+comprueba:
+  - que el tiempo acumulado de `main` (mediana) no supera --budget-ms;
+  - que ninguna librería pesada se importa al arrancar (HEAVY_MODULES): deben
+    importarse dentro de las funciones que las usan o cargarse vía utils.model_registry.
+
+Uso:
+    python -m benchmarks.import_time                      # presupuesto por defecto
+    python -m benchmarks.import_time --budget-ms 800 --top 25 --out imports.json
+
+Termina con código 1 si se supera el presupuesto o aparece un módulo prohibido.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+DEFAULT_BUDGET_MS = 1500.0
+
+# Deben importarse bajo demanda (cv_processing, employability_model, cv_summarizer, bulk_matching)
+HEAVY_MODULES = (
+    "transformers",
+    "torch",
+    "sklearn",
+    "scipy",
+    "pandas",
+    "joblib",
+    "rapidfuzz",
+    "huggingface_hub",
+    "pdfplumber",
+    "docx",
+)
+
+
+def import_profile(module: str = "main") -> Tuple[float, Dict[str, float]]:
+    """Importa `module` con -X importtime; devuelve (ms acumulados del módulo, ms acumulados por módulo)."""
+    env = {
+        **os.environ,
+        "LOG_LEVEL": "WARNING",
+        # db.session crea el engine al importarse; no hace falta una DB real
+        "DATABASE_URL_PYTHON": os.getenv("DATABASE_URL_PYTHON", "sqlite+aiosqlite:///:memory:"),
+    }
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=env, cwd=Path(__file__).resolve().parent.parent,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Fallo al importar {module}:\n{proc.stderr[-2000:]}")
+
+    cumulative: Dict[str, float] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        # "import time:      self |  cumulative |   paquete" (microsegundos)
+        _, cum_us, name = line[len("import time:"):].split("|")
+        cumulative[name.strip()] = int(cum_us) / 1000
+    return cumulative.get(module, 0.0), cumulative
+
+
+def heavy_imports(cumulative: Dict[str, float]) -> List[str]:
+    return sorted({name.split(".")[0] for name in cumulative if name.split(".")[0] in HEAVY_MODULES})
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Presupuesto de tiempo de importación de main")
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="módulos más caros a listar")
+    parser.add_argument("--out", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    runs = [import_profile(args.module) for _ in range(args.repeat)]
+    totals = [total for total, _ in runs]
+    median = statistics.median(totals)
+    # Perfil de la ejecución mediana (la primera suele ir con la caché de disco fría)
+    profile = sorted(runs, key=lambda r: r[0])[len(runs) // 2][1]
+    heavy = heavy_imports(profile)
+
+    top_level = {name: ms for name, ms in profile.items() if "." not in name and name != args.module}
+    print(f"{'módulo':<40} {'acumulado(ms)':>14}")
+    for name, ms in sorted(top_level.items(), key=lambda kv: -kv[1])[:args.top]:
+        print(f"{name:<40} {ms:>14.1f}")
+    print(f"\nimport {args.module}: mediana {median:.0f} ms (min {min(totals):.0f}, max {max(totals):.0f}) "
+          f"| presupuesto {args.budget_ms:.0f} ms")
+
+    exit_code = 0
+    if median > args.budget_ms:
+        print(f"REGRESIÓN: {median:.0f} ms > {args.budget_ms:.0f} ms")
+        exit_code = 1
+    if heavy:
+        print(f"REGRESIÓN: librerías pesadas importadas al arrancar: {', '.join(heavy)}")
+        exit_code = 1
+
+    if args.out:
+        args.out.write_text(json.dumps({
+            "module": args.module,
+            "median_ms": median,
+            "runs_ms": totals,
+            "budget_ms": args.budget_ms,
+            "heavy_imports": heavy,
+            "top_level_ms": top_level,
+        }, indent=2, ensure_ascii=False), encoding="utf-8")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,381 @@
+"""
+Prueba de carga HTTP reproducible contra la API real (uvicorn), sin servicios externos:
+
+- DB: SQLite (aiosqlite) sembrada con ofertas y candidatos sintéticos escalados desde
+  data/*.json (o --database-url para apuntar a un Postgres local ya sembrado).
+- NER: servidor local que imita token_classification de Hugging Face (NER_ENDPOINT_URL),
+  con latencia configurable para simular la red.
+
+Recorre /extract-cv-data y /process-candidate-data (encolar + sondear hasta el resultado),
+/offer-matcher y /candidate-matcher con una mezcla ponderada, para cada nivel de
+concurrencia, y reporta p50/p95/p99, throughput y tasa de errores por endpoint.
+El punto de saturación es el nivel a partir del cual el throughput deja de crecer y el p99 se dispara.
+
+Uso:
+    python -m benchmarks.loadtest --concurrency 1 8 32 --duration 20
+    python -m benchmarks.loadtest --mix offer=3,candidate=3,extract=1,process=1 --workers 2 --out load.json
+"""
+import argparse
+import asyncio
+import datetime
+import itertools
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.synthetic import (
+    fake_ner,
+    synthetic_candidates,
+    synthetic_offers,
+    to_candidate_data,
+    write_cv_fixtures,
+)
+
+DEFAULT_MIX = "offer=3,candidate=3,extract=1,process=1"
+POLL_INTERVAL = 0.05
+
+
+# =====================
+# DOBLES LOCALES (DB y NER)
+# =====================
+
+async def seed_database(url: str, n_offers: int, n_candidates: int) -> None:
+    from sqlalchemy import insert
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from models.offers.model import Base as OfferBase, Offer
+    from models.candidate.model import Base as CandidateBase, Candidate
+    from models.matches.model import Base as MatchBase
+
+    engine = create_async_engine(url)
+    today = datetime.date.today()
+    offers = [
+        {
+            "id": int(o["id"]),
+            "puesto": o["puesto"],
+            "categoria": o["categoria"],
+            "empresa": o["empresa"],
+            "descripcion": o.get("descripcion"),
+            "activo": True,
+            # Fechas relativas a hoy: las del JSON de ejemplo ya han vencido
+            "fechaInicio": today - datetime.timedelta(days=30),
+            "fechaFin": today + datetime.timedelta(days=30),
+            "createdAt": today,
+        }
+        for o in synthetic_offers(n_offers)
+    ]
+    candidates = synthetic_candidates(n_candidates)
+    async with engine.begin() as conn:
+        # match_results vacía: /candidate-matcher y /offer-matcher calculan en vivo
+        for base in (OfferBase, CandidateBase, MatchBase):
+            await conn.run_sync(base.metadata.drop_all)
+            await conn.run_sync(base.metadata.create_all)
+        await conn.execute(insert(Offer), offers)
+        for i in range(0, len(candidates), 1000):
+            await conn.execute(insert(Candidate), candidates[i:i + 1000])
+    await engine.dispose()
+
+
+class _FakeNERHandler(BaseHTTPRequestHandler):
+    latency_s = 0.0
+    # Cola lenta: una fracción de las respuestas tarda slow_s (para probar el hedging)
+    slow_fraction = 0.0
+    slow_s = 0.0
+    # Las primeras `loading` respuestas son 503 "Model is currently loading"
+    loading = 0
+    # Fracción de respuestas 500
+    error_rate = 0.0
+    _served = None
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        served = next(self._served)
+        delay = self.slow_s if random.random() < self.slow_fraction else self.latency_s
+        if delay:
+            time.sleep(delay)
+        if served < self.loading:
+            status, payload = 503, {"error": "Model fake-ner is currently loading", "estimated_time": 0.2}
+        elif random.random() < self.error_rate:
+            status, payload = 500, {"error": "Internal Server Error"}
+        else:
+            status, payload = 200, fake_ner(body.get("inputs", ""))
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        try:
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            # El cliente ya no espera la respuesta (p. ej. el intento perdedor de un hedge)
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+def start_fake_ner(
+    port: int,
+    latency_ms: float,
+    slow_fraction: float = 0.0,
+    slow_ms: float = 0.0,
+    loading: int = 0,
+    error_rate: float = 0.0,
+) -> ThreadingHTTPServer:
+    handler = type("FakeNERHandler", (_FakeNERHandler,), {
+        "latency_s": latency_ms / 1000,
+        "slow_fraction": slow_fraction,
+        "slow_s": slow_ms / 1000,
+        "loading": loading,
+        "error_rate": error_rate,
+        "_served": itertools.count(),
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_app(port: int, env: Dict[str, str], workers: int) -> subprocess.Popen:
+    cmd = [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+           "--workers", str(workers), "--log-level", "warning", "--no-access-log"]
+    return subprocess.Popen(cmd, env={**os.environ, **env})
+
+
+def wait_ready(base_url: str, timeout: float = 120.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(base_url + "/", timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"La API no respondió en {timeout}s")
+
+
+# =====================
+# ESCENARIOS
+# =====================
+
+class Workload:
+    def __init__(self, cv_files: List[Path], n_candidates: int, n_offers: int, seed: int = 11):
+        self.rng = random.Random(seed)
+        self.cv_files = cv_files
+        self.candidates = synthetic_candidates(min(n_candidates, 2000), seed=seed)
+        self.offers = synthetic_offers(n_offers)
+
+    async def _poll(self, client: httpx.AsyncClient, accepted: httpx.Response, timeout: float) -> httpx.Response:
+        result_url = accepted.json()["result_url"]
+        deadline = time.monotonic() + timeout
+        while True:
+            response = await client.get(result_url)
+            if response.status_code != 202 or time.monotonic() > deadline:
+                return response
+            await asyncio.sleep(POLL_INTERVAL)
+
+    async def extract(self, client: httpx.AsyncClient, job_timeout: float) -> httpx.Response:
+        path = self.rng.choice(self.cv_files)
+        files = {"file": (path.name, path.read_bytes())}
+        response = await client.post("/extract-cv-data", files=files)
+        return await self._poll(client, response, job_timeout) if response.status_code == 202 else response
+
+    async def process(self, client: httpx.AsyncClient, job_timeout: float) -> httpx.Response:
+        candidate = to_candidate_data(self.rng.choice(self.candidates), self.rng)
+        response = await client.post("/process-candidate-data", content=candidate.model_dump_json(),
+                                     headers={"Content-Type": "application/json"})
+        return await self._poll(client, response, job_timeout) if response.status_code == 202 else response
+
+    async def offer(self, client: httpx.AsyncClient, job_timeout: float) -> httpx.Response:
+        c = self.rng.choice(self.candidates)
+        return await client.post("/offer-matcher", json={"name": c["name"], "experience": c["experience"], "skills": c["skills"]})
+
+    async def candidate(self, client: httpx.AsyncClient, job_timeout: float) -> httpx.Response:
+        o = self.rng.choice(self.offers)
+        return await client.post("/candidate-matcher", json={
+            "id": str(o["id"]), "puesto": o["puesto"], "categoria": o["categoria"], "descripcion": o.get("descripcion"),
+        })
+
+
+SCENARIOS = ("extract", "process", "offer", "candidate")
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    mix = {}
+    for item in spec.split(","):
+        name, _, weight = item.partition("=")
+        if name.strip() not in SCENARIOS:
+            raise ValueError(f"Escenario desconocido '{name}'. Opciones: {SCENARIOS}")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+# =====================
+# CARGA Y REPORTE
+# =====================
+
+def percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    idx = min(len(sorted_values) - 1, max(0, round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+def summarize(samples: List[Tuple[float, bool, int]], elapsed: float) -> Dict:
+    latencies = sorted(s[0] for s in samples)
+    errors = sum(1 for s in samples if not s[1])
+    status_counts: Dict[str, int] = {}
+    for _, _, code in samples:
+        status_counts[str(code)] = status_counts.get(str(code), 0) + 1
+    return {
+        "requests": len(samples),
+        "throughput_rps": len(samples) / elapsed if elapsed else 0.0,
+        "error_rate": errors / len(samples) if samples else 0.0,
+        "p50_ms": _ms(percentile(latencies, 50)),
+        "p95_ms": _ms(percentile(latencies, 95)),
+        "p99_ms": _ms(percentile(latencies, 99)),
+        "mean_ms": _ms(statistics.mean(latencies)) if latencies else None,
+        "status": status_counts,
+    }
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return round(seconds * 1000, 1) if seconds is not None else None
+
+
+async def run_level(
+    base_url: str, workload: Workload, mix: Dict[str, float], concurrency: int,
+    duration: float, request_timeout: float, job_timeout: float,
+) -> Dict:
+    names, weights = list(mix), list(mix.values())
+    samples: Dict[str, List[Tuple[float, bool, int]]] = {name: [] for name in names}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=request_timeout, limits=limits) as client:
+        deadline = time.monotonic() + duration
+
+        async def user():
+            while time.monotonic() < deadline:
+                name = workload.rng.choices(names, weights)[0]
+                t0 = time.perf_counter()
+                try:
+                    response = await getattr(workload, name)(client, job_timeout)
+                    code = response.status_code
+                    ok = code == 200
+                except httpx.HTTPError:
+                    code, ok = 0, False
+                samples[name].append((time.perf_counter() - t0, ok, code))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    all_samples = [s for values in samples.values() for s in values]
+    return {
+        "concurrency": concurrency,
+        "duration_s": round(elapsed, 2),
+        "overall": summarize(all_samples, elapsed),
+        "endpoints": {name: summarize(values, elapsed) for name, values in samples.items() if values},
+    }
+
+
+def print_level(level: Dict) -> None:
+    print(f"\n== concurrencia {level['concurrency']} ({level['duration_s']}s) ==")
+    print(f"{'endpoint':<10} {'req':>6} {'rps':>8} {'err%':>6} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for name, r in [*level["endpoints"].items(), ("TOTAL", level["overall"])]:
+        print(f"{name:<10} {r['requests']:>6} {r['throughput_rps']:>8.1f} {r['error_rate'] * 100:>6.1f} "
+              f"{r['p50_ms']!s:>8} {r['p95_ms']!s:>8} {r['p99_ms']!s:>8}")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Prueba de carga HTTP con DB y NER locales")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--duration", type=float, default=20.0, help="segundos por nivel")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"pesos por escenario ({', '.join(SCENARIOS)})")
+    parser.add_argument("--offers", type=int, default=1000)
+    parser.add_argument("--candidates", type=int, default=10000)
+    parser.add_argument("--cvs", type=int, default=10, help="CVs sintéticos por formato")
+    parser.add_argument("--ner-latency-ms", type=float, default=150.0)
+    parser.add_argument("--workers", type=int, default=1, help="workers de uvicorn")
+    parser.add_argument("--database-url", default=None, help="DB ya sembrada (por defecto SQLite temporal)")
+    parser.add_argument("--request-timeout", type=float, default=30.0)
+    parser.add_argument("--job-timeout", type=float, default=60.0, help="espera máxima de un trabajo encolado")
+    parser.add_argument("--base-url", default=None, help="API ya levantada (no arranca uvicorn ni dobles)")
+    parser.add_argument("--out", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    mix = parse_mix(args.mix)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        files = write_cv_fixtures(tmp_path / "cvs", args.cvs)
+        workload = Workload([p for paths in files.values() for p in paths], args.candidates, args.offers)
+
+        app_proc, ner_server = None, None
+        base_url = args.base_url
+        if base_url is None:
+            database_url = args.database_url or f"sqlite+aiosqlite:///{tmp_path / 'loadtest.db'}"
+            if args.database_url is None:
+                asyncio.run(seed_database(database_url, args.offers, args.candidates))
+            ner_port, app_port = _free_port(), _free_port()
+            ner_server = start_fake_ner(ner_port, args.ner_latency_ms)
+            app_proc = start_app(app_port, {
+                "DATABASE_URL_PYTHON": database_url,
+                "NER_ENDPOINT_URL": f"http://127.0.0.1:{ner_port}",
+                "HF_API_TOKEN": os.getenv("HF_API_TOKEN", "loadtest"),
+                "LOG_LEVEL": "WARNING",
+                "PYTHONWARNINGS": "ignore",
+            }, args.workers)
+            base_url = f"http://127.0.0.1:{app_port}"
+
+        try:
+            wait_ready(base_url)
+            levels = []
+            for concurrency in args.concurrency:
+                level = asyncio.run(run_level(
+                    base_url, workload, mix, concurrency, args.duration, args.request_timeout, args.job_timeout
+                ))
+                print_level(level)
+                levels.append(level)
+        finally:
+            if app_proc is not None:
+                app_proc.terminate()
+                try:
+                    app_proc.wait(timeout=30)
+                except subprocess.TimeoutExpired:
+                    app_proc.kill()
+            if ner_server is not None:
+                ner_server.shutdown()
+
+    if args.out:
+        report = {
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "mix": mix,
+                "offers": args.offers,
+                "candidates": args.candidates,
+                "ner_latency_ms": args.ner_latency_ms,
+                "workers": args.workers,
+            },
+            "levels": levels,
+        }
+        args.out.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Cliente NER asíncrono (utils.ner_client) contra el servidor token_classification falso
+de benchmarks.loadtest, sin red ni token real.
+
+Escenarios:
+  blocking   llamada síncrona dentro de la corrutina (como el InferenceClient anterior):
+             las llamadas concurrentes se serializan y el event loop queda bloqueado
+  async      NERClient sin hedging
+  hedged     NERClient con NER_HEDGE_AFTER_MS (--hedge-ms) frente a una cola lenta
+  loading    las primeras respuestas son 503 "Model is currently loading": reintentos
+  outage     todas las respuestas son 500: el circuit breaker corta las llamadas
+  cached     ner_via_hf con la caché NER: --calls llamadas sobre --distinct textos
+             (re-subidas del mismo CV); reporta la tasa de aciertos
+
+Para cada uno: p50/p95/p99 por llamada, tiempo total, retraso máximo del event loop
+y resultado de las llamadas (ok / motivo del error).
+
+Uso:
+    python -m benchmarks.ner_client --calls 200 --concurrency 16 --latency-ms 40 --slow-fraction 0.05 --slow-ms 800
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.loadtest import _free_port, start_fake_ner
+from utils.ner_client import CircuitBreaker, NERClient, NERError
+
+TEXT = "María García López\nExperiencia laboral\nLimpiezas Lavi\nMercadona\n" * 20
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def _loop_lag(stop: asyncio.Event, lags: List[float]) -> None:
+    # Cuánto tarda el loop en despertar una tarea que duerme 5 ms
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.005)
+        lags.append(time.perf_counter() - started - 0.005)
+
+
+async def _drive(call, calls: int, concurrency: int) -> Dict:
+    latencies: List[float] = []
+    outcomes: Counter = Counter()
+    lags: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await call()
+                outcomes["ok"] += 1
+            except NERError as e:
+                outcomes[e.reason] += 1
+            latencies.append(time.perf_counter() - started)
+
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(_loop_lag(stop, lags))
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(calls)))
+    total = time.perf_counter() - started
+    stop.set()
+    await lag_task
+
+    ms = [v * 1000 for v in latencies]
+    return {
+        "p50_ms": round(_percentile(ms, 0.50), 1),
+        "p95_ms": round(_percentile(ms, 0.95), 1),
+        "p99_ms": round(_percentile(ms, 0.99), 1),
+        "mean_ms": round(statistics.fmean(ms), 1),
+        "total_s": round(total, 2),
+        "max_loop_lag_ms": round(max(lags, default=0.0) * 1000, 1),
+        "outcomes": dict(outcomes),
+    }
+
+
+async def run_scenario(name: str, url: str, args) -> Dict:
+    if name == "cached":
+        import models.cv_processing as cv_processing
+
+        os.environ.setdefault("HF_API_TOKEN", "benchmark")
+        cv_processing.NER_ENDPOINT_URL = url
+        texts = [f"{TEXT}\nCV {i % args.distinct}" for i in range(args.calls)]
+        random.Random(0).shuffle(texts)
+        pending = iter(texts)
+        result = await _drive(lambda: cv_processing.ner_via_hf(next(pending), head_only=False), args.calls, args.concurrency)
+        result["outcomes"]["hit_ratio"] = round(cv_processing.get_ner_cache().hit_ratio, 3)
+        return result
+
+    if name == "blocking":
+        with httpx.Client() as client:
+            async def call():
+                client.post(url, json={"inputs": TEXT}).raise_for_status()
+            return await _drive(call, args.calls, args.concurrency)
+
+    client = NERClient(
+        url,
+        hedge_after_ms=args.hedge_ms if name == "hedged" else 0,
+        breaker=CircuitBreaker(failures=5, reset_s=30),
+        deadline_s=10,
+    )
+    try:
+        return await _drive(lambda: client.token_classification(TEXT), args.calls, args.concurrency)
+    finally:
+        await client.aclose()
+
+
+SERVER_OPTIONS = {
+    "blocking": lambda a: {"slow_fraction": a.slow_fraction, "slow_ms": a.slow_ms},
+    "async": lambda a: {"slow_fraction": a.slow_fraction, "slow_ms": a.slow_ms},
+    "hedged": lambda a: {"slow_fraction": a.slow_fraction, "slow_ms": a.slow_ms},
+    "loading": lambda a: {"loading": a.concurrency},
+    "outage": lambda a: {"error_rate": 1.0},
+    "cached": lambda a: {"slow_fraction": a.slow_fraction, "slow_ms": a.slow_ms},
+}
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Cliente NER asíncrono frente a un servidor NER falso")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SERVER_OPTIONS), default=list(SERVER_OPTIONS))
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=40.0)
+    parser.add_argument("--slow-fraction", type=float, default=0.05, help="fracción de respuestas lentas")
+    parser.add_argument("--slow-ms", type=float, default=800.0)
+    parser.add_argument("--hedge-ms", type=float, default=120.0)
+    parser.add_argument("--distinct", type=int, default=50, help="textos distintos en el escenario cached")
+    parser.add_argument("--out", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    results = {}
+    print(f"{'escenario':<10} {'p50':>8} {'p95':>8} {'p99':>8} {'total(s)':>9} {'lag(ms)':>8}  resultados")
+    for name in args.scenarios:
+        port = _free_port()
+        server = start_fake_ner(port, args.latency_ms, **SERVER_OPTIONS[name](args))
+        try:
+            r = asyncio.run(run_scenario(name, f"http://127.0.0.1:{port}", args))
+        finally:
+            server.shutdown()
+        results[name] = r
+        print(f"{name:<10} {r['p50_ms']:>8} {r['p95_ms']:>8} {r['p99_ms']:>8} {r['total_s']:>9} "
+              f"{r['max_loop_lag_ms']:>8}  {r['outcomes']}")
+
+    if args.out:
+        args.out.write_text(json.dumps({"args": vars(args) | {"out": str(args.out)}, "results": results}, indent=2),
+                            encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Normalización de texto: implementaciones anteriores (lower + NFKD + encode ASCII + re.sub
+en cada llamada) frente a utils.normalize.
+
+1. Equivalencia: mismo resultado para cada punto de código Unicode (solo y entre letras),
+   para textos aleatorios con tildes, ligaduras y signos, y para los puestos,
+   categorías, descripciones, títulos y skills sintéticos.
+2. Velocidad por texto: textos distintos sin LRU, cadenas cortas repetidas (títulos y
+   skills, con la LRU vaciada y llena), descripciones, listas (normalize_many) y fold
+   frente a normalizar.
+
+Uso:
+    python -m benchmarks.normalize --candidates 20000 --offers 2000
+"""
+import argparse
+import json
+import random
+import re
+import time
+import unicodedata
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from benchmarks.synthetic import synthetic_candidates, synthetic_offers
+from utils import normalize as fast
+
+
+def normalize_old(text: str) -> str:
+    """utils.auxiliar.normalize anterior."""
+    text = text.lower()
+    text = unicodedata.normalize("NFKD", text)
+    text = text.encode("ascii", "ignore").decode("utf-8")
+    text = re.sub(r"[^a-z\s]", "", text)
+    return text.strip()
+
+
+def normalizar_old(texto: str) -> str:
+    """employability_model.normalizar anterior."""
+    texto = texto.lower()
+    texto = unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode("utf-8")
+    return texto.strip()
+
+
+def corpus(candidates: int, offers: int, seed: int = 0) -> Dict[str, List[str]]:
+    cands = synthetic_candidates(candidates, seed)
+    offs = synthetic_offers(offers, seed)
+    rng = random.Random(seed)
+    alphabet = [chr(c) for c in range(0x20, 0x250)] + list("́̃ –—“”¿¡ÑñİΣσς ﬁ½\t\n\x1f")
+    return {
+        "short": [e["title"] for c in cands for e in c["experience"] if e.get("title")]
+                 + [s for c in cands for s in c["skills"]]
+                 + [o["puesto"] for o in offs] + [o["categoria"] for o in offs if o.get("categoria")],
+        "long": [o["descripcion"] for o in offs if o.get("descripcion")],
+        "random": ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 80))) for _ in range(20000)],
+    }
+
+
+def check_equivalence(texts: Dict[str, List[str]]) -> Dict[str, int]:
+    mismatches = {"normalize": 0, "normalize_many": 0, "fold": 0}
+    samples = [chr(cp) for cp in range(0x110000) if not 0xD800 <= cp < 0xE000]
+    samples += [f"a{ch}b" for ch in samples]
+    for group in (samples, *texts.values()):
+        expected = [normalize_old(t) for t in group]
+        mismatches["normalize"] += sum(fast.normalize(t) != e for t, e in zip(group, expected))
+        mismatches["normalize_many"] += sum(a != e for a, e in zip(fast.normalize_many(group), expected))
+        mismatches["fold"] += sum(fast.fold(t) != normalizar_old(t) for t in group)
+    return mismatches
+
+
+def per_item_ns(func: Callable[[], object], items: int, repeat: int, setup: Callable[[], None] = lambda: None) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        setup()
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best / items * 1e9
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Normalización de texto: anterior vs utils.normalize")
+    parser.add_argument("--candidates", type=int, default=20000)
+    parser.add_argument("--offers", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--out", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    texts = corpus(args.candidates, args.offers)
+    mismatches = check_equivalence(texts)
+    print(f"Diferencias con la implementación anterior: {mismatches}")
+
+    short, long = texts["short"], texts["long"]
+    # Sin repeticiones ni LRU: el coste de la traducción en sí. Los aleatorios tienen
+    # caracteres fuera de la tabla (Latin Extended-B...): peor caso, se calculan dos veces
+    unique = list(dict.fromkeys(short + long))
+    rand = texts["random"]
+    clear = fast._normalize_cached.cache_clear
+    cases = {
+        "distintos old": (lambda: [normalize_old(t) for t in unique], len(unique), lambda: None),
+        "distintos new (sin LRU)": (lambda: [fast._normalize(t) for t in unique], len(unique), lambda: None),
+        "aleatorios old": (lambda: [normalize_old(t) for t in rand], len(rand), lambda: None),
+        "aleatorios new (sin LRU)": (lambda: [fast._normalize(t) for t in rand], len(rand), lambda: None),
+        "short old": (lambda: [normalize_old(t) for t in short], len(short), lambda: None),
+        "short new (LRU vaciada)": (lambda: [fast.normalize(t) for t in short], len(short), clear),
+        "short new (LRU llena)": (lambda: [fast.normalize(t) for t in short], len(short), lambda: None),
+        "short normalize_many": (lambda: fast.normalize_many(short), len(short), lambda: None),
+        "long old": (lambda: [normalize_old(t) for t in long], len(long), lambda: None),
+        "long new": (lambda: [fast.normalize(t) for t in long], len(long), lambda: None),
+        "long normalize_many": (lambda: fast.normalize_many(long), len(long), lambda: None),
+        "normalizar old": (lambda: [normalizar_old(t) for t in short], len(short), lambda: None),
+        "fold": (lambda: [fast.fold(t) for t in short], len(short), lambda: None),
+    }
+    results = {}
+    print(f"{'caso':<26} {'ns/texto':>10}")
+    for name, (func, items, setup) in cases.items():
+        results[name] = round(per_item_ns(func, items, args.repeat, setup), 1)
+        print(f"{name:<26} {results[name]:>10}")
+
+    if args.out:
+        args.out.write_text(json.dumps({"mismatches": mismatches, "ns_per_text": results}, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
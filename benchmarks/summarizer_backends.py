@@ -0,0 +1,164 @@
+"""
+Benchmark de backends del resumidor (torch fp32 vs int8 vs ONNX) sobre los CVs de
+benchmarks/fixtures/cvs.
+
+Cada backend se mide en un proceso nuevo (RSS limpio): latencia por CV, RSS pico y
+ROUGE-1 / ROUGE-L (F1) de sus resúmenes frente a los del pipeline actual (torch).
+
+Uso:
+    python -m benchmarks.summarizer_backends
+    python -m benchmarks.summarizer_backends --backends torch int8 --mode greedy --out bench_summarizer.json
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "cvs"
+REFERENCE_BACKEND = "torch"
+
+
+# =====================
+# ROUGE (F1 sobre tokens en minúsculas)
+# =====================
+
+def _tokens(text: str) -> List[str]:
+    return text.lower().split()
+
+
+def rouge_1(candidate: str, reference: str) -> float:
+    cand, ref = _tokens(candidate), _tokens(reference)
+    if not cand or not ref:
+        return 0.0
+    ref_counts: Dict[str, int] = {}
+    for t in ref:
+        ref_counts[t] = ref_counts.get(t, 0) + 1
+    overlap = 0
+    for t in cand:
+        if ref_counts.get(t, 0) > 0:
+            ref_counts[t] -= 1
+            overlap += 1
+    return _f1(overlap, len(cand), len(ref))
+
+
+def rouge_l(candidate: str, reference: str) -> float:
+    cand, ref = _tokens(candidate), _tokens(reference)
+    if not cand or not ref:
+        return 0.0
+    prev = [0] * (len(ref) + 1)
+    for c in cand:
+        curr = [0] * (len(ref) + 1)
+        for j, r in enumerate(ref, 1):
+            curr[j] = prev[j - 1] + 1 if c == r else max(prev[j], curr[j - 1])
+        prev = curr
+    return _f1(prev[-1], len(cand), len(ref))
+
+
+def _f1(overlap: int, n_cand: int, n_ref: int) -> float:
+    if overlap == 0:
+        return 0.0
+    precision, recall = overlap / n_cand, overlap / n_ref
+    return 2 * precision * recall / (precision + recall)
+
+
+# =====================
+# MEDICIÓN (proceso hijo)
+# =====================
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss está en KB en Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_backend(backend: str, mode: str, out_path: str) -> None:
+    os.environ["SUMMARIZER_BACKEND"] = backend
+    from models.cv_summarizer import initialize_summarizer, summarize_cv
+
+    started = time.perf_counter()
+    initialize_summarizer()
+    load_seconds = time.perf_counter() - started
+
+    results = {}
+    for path in sorted(FIXTURES_DIR.glob("*.txt")):
+        text = path.read_text(encoding="utf-8")
+        t0 = time.perf_counter()
+        summary = summarize_cv(text, mode=mode)
+        results[path.name] = {"seconds": time.perf_counter() - t0, "summary": summary}
+
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "backend": backend,
+            "load_seconds": load_seconds,
+            "peak_rss_mb": _peak_rss_mb(),
+            "results": results,
+        }, f, ensure_ascii=False)
+
+
+# =====================
+# ORQUESTACIÓN
+# =====================
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de backends del resumidor")
+    parser.add_argument("--backends", nargs="+", default=["torch", "int8", "onnx"])
+    parser.add_argument("--mode", choices=["beam", "greedy"], default="beam")
+    parser.add_argument("--out", type=Path, default=None, help="JSON con los resultados")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--worker-out", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        run_backend(args.worker, args.mode, args.worker_out)
+        return
+
+    backends = list(dict.fromkeys([REFERENCE_BACKEND] + args.backends))
+    measured: Dict[str, Dict] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in backends:
+            out_path = os.path.join(tmp, f"{backend}.json")
+            proc = subprocess.run([
+                sys.executable, "-m", "benchmarks.summarizer_backends",
+                "--worker", backend, "--worker-out", out_path, "--mode", args.mode,
+            ])
+            if proc.returncode != 0:
+                print(f"[{backend}] falló (código {proc.returncode}), se omite")
+                continue
+            with open(out_path, encoding="utf-8") as f:
+                measured[backend] = json.load(f)
+
+    reference = measured.get(REFERENCE_BACKEND, {}).get("results", {})
+    report = []
+    for backend, data in measured.items():
+        latencies = [r["seconds"] for r in data["results"].values()]
+        r1 = [rouge_1(r["summary"], reference[name]["summary"]) for name, r in data["results"].items() if name in reference]
+        rl = [rouge_l(r["summary"], reference[name]["summary"]) for name, r in data["results"].items() if name in reference]
+        report.append({
+            "backend": backend,
+            "load_s": round(data["load_seconds"], 2),
+            "latency_mean_s": round(statistics.mean(latencies), 3) if latencies else None,
+            "latency_max_s": round(max(latencies), 3) if latencies else None,
+            "peak_rss_mb": round(data["peak_rss_mb"], 1),
+            "rouge1_vs_torch": round(statistics.mean(r1), 3) if r1 else None,
+            "rougeL_vs_torch": round(statistics.mean(rl), 3) if rl else None,
+        })
+
+    print(f"{'backend':<8} {'carga(s)':>9} {'media(s)':>9} {'max(s)':>8} {'RSS(MB)':>8} {'R-1':>6} {'R-L':>6}")
+    for r in report:
+        print(
+            f"{r['backend']:<8} {r['load_s']:>9} {r['latency_mean_s']!s:>9} {r['latency_max_s']!s:>8} "
+            f"{r['peak_rss_mb']:>8} {r['rouge1_vs_torch']!s:>6} {r['rougeL_vs_torch']!s:>6}"
+        )
+
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
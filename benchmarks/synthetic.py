@@ -0,0 +1,250 @@
+"""
+Datos sintéticos para los benchmarks (deterministas por semilla, sin red).
+
+- CVs en español en TXT, DOCX y PDF con las mismas secciones que los CVs reales.
+- Candidatos y ofertas escalados a partir de data/candidates_mock.json y
+  data/ofertas_activas.json, con puestos y categorías del catálogo.
+- NER simulado con el formato de token_classification(aggregation_strategy="simple").
+"""
+import json
+import random
+import re
+from pathlib import Path
+from typing import Dict, List
+
+from schemas.cv import CandidateData, EducationItem, ExperienceItem, LanguageItem
+
+DATA_DIR = Path("data")
+
+NOMBRES = ["María", "José", "Lucía", "Antonio", "Carmen", "Manuel", "Ana", "Francisco", "Laura", "David",
+           "Paula", "Javier", "Sofía", "Daniel", "Marta", "Alejandro", "Elena", "Pablo", "Sara", "Sergio"]
+APELLIDOS = ["García", "Fernández", "González", "Rodríguez", "López", "Martínez", "Sánchez", "Pérez",
+             "Gómez", "Martín", "Jiménez", "Ruiz", "Hernández", "Díaz", "Moreno", "Álvarez", "Romero", "Navarro"]
+EMPRESAS = ["Limpiezas Lavi", "Hospital Universitario La Paz", "Mercadona", "Grupo Eulen", "Hotel Meliá Castilla",
+            "Transportes Ochoa", "Securitas", "Carrefour", "Clece", "Ilunion", "Sodexo", "Correos", "Leroy Merlin"]
+HABILIDADES = ["trabajo en equipo", "responsabilidad", "puntualidad", "organización", "atención al cliente",
+               "limpieza", "carretilla elevadora", "manipulación de alimentos", "PRL", "comunicación",
+               "gestión de inventario", "ofimática", "conducción", "cocina", "reparto", "liderazgo"]
+FORMACION = ["Graduado en ESO", "Bachillerato", "FP Grado Medio en Cocina y Gastronomía",
+             "Certificado de profesionalidad en limpieza de superficies y mobiliario",
+             "FP Grado Superior en Administración y Finanzas", "Curso de carretillero", "Grado en Educación Social"]
+CENTROS = ["IES Ramiro de Maeztu", "Centro de Formación Madrid", "Universidad Complutense", "CEPA Vallecas"]
+IDIOMAS = [("Español", "nativo"), ("Inglés", "básico"), ("Inglés", "intermedio"), ("Francés", "básico"),
+           ("Árabe", "nativo"), ("Rumano", "nativo")]
+FRASES_PERFIL = [
+    "Persona responsable, puntual y acostumbrada a trabajar en equipo siguiendo protocolos de calidad.",
+    "Busco una oportunidad estable donde aportar organización, compromiso y ganas de aprender.",
+    "Experiencia atendiendo a clientes y resolviendo incidencias con rapidez y amabilidad.",
+    "Me adapto con facilidad a turnos rotativos y a entornos de trabajo exigentes.",
+]
+
+
+def _catalog() -> List[Dict]:
+    with open(DATA_DIR / "puestos_keywords.json", "r", encoding="utf-8") as f:
+        return [p for p in json.load(f) if "NO USAR" not in p["puesto"] and p["puesto"] != "N/C"]
+
+
+# =====================
+# CVs
+# =====================
+
+def synthetic_cv_text(rng: random.Random, n_experiences: int = 3) -> str:
+    catalog = _catalog()
+    nombre = f"{rng.choice(NOMBRES)} {rng.choice(APELLIDOS)} {rng.choice(APELLIDOS)}"
+    usuario = re.sub(r"[^a-z]", "", nombre.lower().split()[0].translate(str.maketrans("áéíóú", "aeiou")))
+    lines = [
+        nombre,
+        f"Teléfono: 6{rng.randint(10, 99)} {rng.randint(100, 999)} {rng.randint(100, 999)}",
+        f"{usuario}.{rng.randint(1, 999)}@correo.es",
+        "",
+        "Perfil profesional",
+        " ".join(rng.sample(FRASES_PERFIL, 3)) + " Profesional con más de cinco años de experiencia en distintos sectores.",
+        "",
+        "Experiencia laboral",
+    ]
+    year = 2024
+    for _ in range(n_experiences):
+        puesto = rng.choice(catalog)
+        start = year - rng.randint(1, 5)
+        lines += [
+            puesto["puesto"],
+            rng.choice(EMPRESAS),
+            f"{start} - {year}",
+            f"Tareas de {', '.join(puesto['keywords'][:3])} en el área de {puesto['categoria'].lower()}.",
+            "",
+        ]
+        year = start
+    lines += [
+        "Formación",
+        rng.choice(FORMACION),
+        rng.choice(CENTROS),
+        str(year - rng.randint(0, 3)),
+        "",
+        "Habilidades",
+        ", ".join(rng.sample(HABILIDADES, 5)) + ".",
+        "",
+        "Idiomas",
+    ]
+    lines += [f"{idioma} {nivel}" for idioma, nivel in rng.sample(IDIOMAS, 2)]
+    return "\n".join(lines) + "\n"
+
+
+def write_txt(text: str, path: Path) -> None:
+    path.write_text(text, encoding="utf-8")
+
+
+def write_docx(text: str, path: Path) -> None:
+    from docx import Document
+
+    doc = Document()
+    for line in text.split("\n"):
+        doc.add_paragraph(line)
+    doc.save(str(path))
+
+
+def _pdf_escape(line: str) -> bytes:
+    raw = line.encode("cp1252", errors="replace")
+    return raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def write_pdf(text: str, path: Path, lines_per_page: int = 60) -> None:
+    """PDF mínimo de solo texto (Helvetica, WinAnsi): suficiente para pdfplumber, sin dependencias."""
+    lines = text.split("\n")
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    objects: List[bytes] = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",  # Pages: se rellena al final
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    page_ids = []
+    for page_lines in pages:
+        stream = b"BT /F1 10 Tf 12 TL 50 800 Td " + b" ".join(b"(" + _pdf_escape(l) + b") Tj T*" for l in page_lines) + b" ET"
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+    kids = b" ".join(b"%d 0 R" % i for i in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_ids)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, obj in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % i + obj + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % off for off in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(out))
+
+
+WRITERS = {".txt": write_txt, ".docx": write_docx, ".pdf": write_pdf}
+
+
+def write_cv_fixtures(out_dir: Path, n_per_format: int, seed: int = 42) -> Dict[str, List[Path]]:
+    """Genera n CVs por formato; mismo texto en los tres formatos para comparar extractores."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    files: Dict[str, List[Path]] = {ext: [] for ext in WRITERS}
+    for i in range(n_per_format):
+        text = synthetic_cv_text(rng)
+        for ext, writer in WRITERS.items():
+            path = out_dir / f"cv_{i:04d}{ext}"
+            writer(text, path)
+            files[ext].append(path)
+    return files
+
+
+def fake_ner(text: str) -> List[Dict]:
+    """NER simulado: la primera línea como PER y las empresas conocidas como ORG."""
+    entities = []
+    first_line = text.split("\n", 1)[0].strip()
+    if first_line:
+        entities.append({"entity_group": "PER", "word": first_line, "score": 0.99, "start": 0, "end": len(first_line)})
+    for empresa in EMPRESAS:
+        start = text.find(empresa)
+        if start >= 0:
+            entities.append({"entity_group": "ORG", "word": empresa, "score": 0.95, "start": start, "end": start + len(empresa)})
+    return entities
+
+
+# =====================
+# CANDIDATOS Y OFERTAS
+# =====================
+
+def synthetic_candidates(n: int, seed: int = 42) -> List[Dict]:
+    """Escala candidates_mock.json a n candidatos (mismo formato que load_candidates)."""
+    with open(DATA_DIR / "candidates_mock.json", "r", encoding="utf-8") as f:
+        mock = json.load(f)
+    catalog = _catalog()
+    rng = random.Random(seed)
+    candidates = []
+    for i in range(n):
+        base = mock[i % len(mock)]
+        experience = [
+            {"title": rng.choice(catalog)["puesto"], "company": rng.choice(EMPRESAS), "years": rng.randint(0, 10)}
+            for _ in range(rng.randint(0, 3))
+        ]
+        # Conservar también la experiencia real del mock para que haya coincidencias directas
+        experience += base.get("experience", [])[:1]
+        candidates.append({
+            "id": f"cand-{i + 1}",
+            "name": f"{rng.choice(NOMBRES)} {rng.choice(APELLIDOS)}",
+            "email": f"cand{i + 1}@mail.com",
+            "phone": f"6{rng.randint(10000000, 99999999)}",
+            "experience": experience,
+            "skills": rng.sample(HABILIDADES, rng.randint(1, 5)) + base.get("skills", [])[:1],
+        })
+    return candidates
+
+
+def synthetic_offers(n: int, seed: int = 42) -> List[Dict]:
+    """Escala ofertas_activas.json a n ofertas (dicts, como acepta match_offers)."""
+    with open(DATA_DIR / "ofertas_activas.json", "r", encoding="utf-8") as f:
+        mock = json.load(f)
+    catalog = _catalog()
+    rng = random.Random(seed)
+    offers = []
+    for i in range(n):
+        if i < len(mock):
+            offers.append(dict(mock[i]))
+            continue
+        puesto = rng.choice(catalog)
+        offers.append({
+            "id": i + 1,
+            "puesto": puesto["puesto"],
+            "activo": True,
+            "empresa": rng.choice(EMPRESAS),
+            "categoria": puesto["categoria"],
+            "descripcion": f"Buscamos {puesto['puesto'].lower()} con experiencia en {', '.join(puesto['keywords'][:3])}.",
+        })
+    return offers
+
+
+def to_candidate_data(candidate: Dict, rng: random.Random) -> CandidateData:
+    """Candidato sintético -> CandidateData completo para el modelo de empleabilidad."""
+    idiomas = rng.sample(IDIOMAS, rng.randint(1, 3))
+    return CandidateData(
+        id=candidate["id"],
+        name=candidate["name"],
+        experience=[ExperienceItem(**e) for e in candidate["experience"]],
+        education=[EducationItem(degree=rng.choice(FORMACION), institution=rng.choice(CENTROS), year=rng.randint(2000, 2022))],
+        skills=candidate["skills"],
+        languages=[LanguageItem(name=n, level=l) for n, l in idiomas],
+        gender=rng.choice(["Hombre", "Mujer"]),
+        age=rng.randint(18, 64),
+        maritalStatus=rng.choice(["Soltero/a", "Casado/a"]),
+        birthCountry=rng.choice(["España", "Marruecos", "Rumanía", "Colombia"]),
+        numLanguages=len(idiomas),
+        hasCar=rng.random() < 0.4,
+        criminalRecord=rng.random() < 0.5,
+        restrainingOrder=rng.random() < 0.1,
+        numChildren=rng.randint(0, 3),
+        workDisability=rng.random() < 0.1,
+        disabilityFlag=rng.random() < 0.1,
+        jobSeeker=True,
+    )
@@ -0,0 +1,118 @@
+"""
+Memoria por worker de gunicorn según dónde se cargan los modelos.
+
+Escenarios (mismo número de workers y mismos modelos):
+  per-worker  cada worker carga los modelos en su lifespan (MODEL_WARMUP)
+  preload     el maestro los carga antes del fork (MODEL_PRELOAD) y los workers comparten páginas
+  mmap        como per-worker, pero con los arrays de los .joblib mapeados desde disco (MODEL_MMAP=1)
+
+Para cada worker reporta RSS, PSS y USS (utils.memory). La USS es lo que cuesta cada
+worker adicional; la suma de PSS, la memoria real del conjunto.
+
+Uso:
+    python -m benchmarks.worker_memory --workers 4 --models employability
+    python -m benchmarks.worker_memory --workers 2 --models employability,summarizer --out mem.json
+
+Con `uvicorn --workers N` los workers se crean con spawn (no heredan nada del maestro):
+para compartir modelos hay que usar gunicorn (gunicorn.conf.py) o MODEL_MMAP.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from benchmarks.loadtest import _free_port, wait_ready
+from utils.memory import child_pids, memory_usage
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SCENARIOS = {
+    "per-worker": lambda models: {"MODEL_WARMUP": models},
+    "preload": lambda models: {"MODEL_PRELOAD": models},
+    "mmap": lambda models: {"MODEL_WARMUP": models, "MODEL_MMAP": "1"},
+}
+
+
+def _mb(n: int) -> float:
+    return round(n / 2**20, 1)
+
+
+def measure_scenario(name: str, models: str, workers: int, settle: float) -> Dict:
+    port = _free_port()
+    env = {
+        **os.environ,
+        **SCENARIOS[name](models),
+        "PORT": str(port),
+        "WEB_CONCURRENCY": str(workers),
+        "DATABASE_URL_PYTHON": os.getenv("DATABASE_URL_PYTHON", "sqlite+aiosqlite:///:memory:"),
+        "LOG_LEVEL": "WARNING",
+        "PYTHONWARNINGS": "ignore",
+    }
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "main:app", "-c", "gunicorn.conf.py", "--bind", f"127.0.0.1:{port}"],
+        env=env, cwd=ROOT,
+    )
+    try:
+        wait_ready(f"http://127.0.0.1:{port}")
+        # Todos los workers deben haber terminado su lifespan (carga de modelos incluida)
+        deadline = time.monotonic() + 120
+        while len(child_pids(proc.pid)) < workers and time.monotonic() < deadline:
+            time.sleep(0.5)
+        time.sleep(settle)
+
+        per_worker: List[Dict] = []
+        for pid in child_pids(proc.pid):
+            usage = memory_usage(pid)
+            per_worker.append({"pid": pid, **{k: _mb(v) for k, v in usage.items()}})
+        master = {k: _mb(v) for k, v in memory_usage(proc.pid).items()}
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+    return {
+        "scenario": name,
+        "master_mb": master,
+        "workers_mb": per_worker,
+        "mean_worker_uss_mb": round(sum(w["uss"] for w in per_worker) / len(per_worker), 1) if per_worker else None,
+        "total_pss_mb": round(master.get("pss", 0) + sum(w["pss"] for w in per_worker), 1),
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="RSS/PSS/USS por worker de gunicorn según la carga de modelos")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--models", default="employability", help="modelos del registro (utils.model_registry)")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--settle", type=float, default=2.0, help="segundos de espera tras arrancar")
+    parser.add_argument("--out", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    results = []
+    for name in args.scenarios:
+        result = measure_scenario(name, args.models, args.workers, args.settle)
+        results.append(result)
+        print(f"\n== {name} ({args.workers} workers, modelos: {args.models}) ==")
+        print(f"{'proceso':<12} {'rss(MB)':>9} {'pss(MB)':>9} {'uss(MB)':>9}")
+        m = result["master_mb"]
+        print(f"{'maestro':<12} {m.get('rss', 0):>9} {m.get('pss', 0):>9} {m.get('uss', 0):>9}")
+        for w in result["workers_mb"]:
+            print(f"{w['pid']:<12} {w['rss']:>9} {w['pss']:>9} {w['uss']:>9}")
+        print(f"USS media por worker: {result['mean_worker_uss_mb']} MB | PSS total: {result['total_pss_mb']} MB")
+
+    if args.out:
+        args.out.write_text(json.dumps({
+            "workers": args.workers,
+            "models": args.models,
+            "results": results,
+        }, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,9 @@
+import time
+from uuid import uuid4
+from fastapi import Request
 from fastapi.middleware.cors import CORSMiddleware
+from utils.logging_config import log_context
+from utils.metrics import REGISTRY, collect_stages, server_timing, stage_totals
 
 def add_cors_middleware(app):
     app.add_middleware(
@@ -7,4 +12,38 @@ def add_cors_middleware(app):
         allow_credentials=True,
         allow_methods=["*"], 
         allow_headers=["*"],  
-    )
\ No newline at end of file
+    )
+
+
+def add_request_context_middleware(app):
+    @app.middleware("http")
+    async def request_context(request: Request, call_next):
+        request_id = request.headers.get("x-request-id") or uuid4().hex
+        with log_context(request_id=request_id, path=request.url.path):
+            response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+
+def add_metrics_middleware(app):
+    @app.middleware("http")
+    async def stage_metrics(request: Request, call_next):
+        started = time.perf_counter()
+        with collect_stages() as stages:
+            response = await call_next(request)
+        elapsed = time.perf_counter() - started
+
+        # Ruta de la plantilla (/jobs/{job_id}), no la URL: cardinalidad acotada
+        route = request.scope.get("route")
+        REGISTRY.observe(
+            "http_request_duration_seconds",
+            elapsed,
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=response.status_code,
+        )
+
+        header = server_timing({**stage_totals(stages), "total": elapsed * 1000})
+        existing = response.headers.get("Server-Timing")
+        response.headers["Server-Timing"] = f"{existing}, {header}" if existing else header
+        return response
@@ -1,24 +1,27 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
+import logging
 import os
 import ssl
+from sqlalchemy.engine import make_url
 
 from dotenv import load_dotenv
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL_PYTHON")
-print("DB URL:", os.getenv("DATABASE_URL_PYTHON"))
+logger = logging.getLogger(__name__)
+logger.info("DB URL: %s", make_url(DATABASE_URL).render_as_string(hide_password=True))
 
 ssl_context = ssl.create_default_context()
 
+# SSL solo contra Postgres (asyncpg); SQLite/aiosqlite local para pruebas de carga
+connect_args = {"ssl": ssl_context} if make_url(DATABASE_URL).get_backend_name() == "postgresql" else {}
 
 engine = create_async_engine(
     DATABASE_URL,
     echo=False,
     pool_pre_ping=True,
-    connect_args={
-        "ssl": ssl_context
-    }
+    connect_args=connect_args
 )
 
 AsyncSessionLocal = sessionmaker(
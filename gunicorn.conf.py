@@ -0,0 +1,21 @@
+# gunicorn.conf.py
+# Arranque con modelos precargados en el maestro (páginas compartidas copy-on-write):
+#   gunicorn main:app -c gunicorn.conf.py
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8080')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+timeout = 120
+
+
+def on_starting(server):
+    # Se ejecuta en el maestro antes de hacer fork de los workers: los modelos de
+    # MODEL_PRELOAD (p. ej. "employability,summarizer" o "all") se cargan una sola vez
+    from utils.model_registry import MODELS, MODEL_PRELOAD, warmup_names
+
+    names = warmup_names(MODEL_PRELOAD)
+    if names:
+        timings = MODELS.preload_for_fork(names)
+        server.log.info("Modelos precargados en el maestro: %s", ", ".join(f"{n} ({ms:.0f} ms)" for n, ms in timings.items()))
@@ -0,0 +1,311 @@
+"""
+Procesamiento masivo offline de CVs históricos: extracción de texto y datos, empleabilidad
+y puestos recomendados de cada CV de un directorio, en un pool de procesos y sin pasar
+por la API HTTP.
+
+Uso (CLI):
+    python -m jobs.bulk_cvs data/cvs_historicos --out data/cvs.jsonl --workers 4
+    python -m jobs.bulk_cvs data/cvs_historicos --out data/cvs_parquet --format parquet --no-ner
+
+- Los resultados se escriben por tandas (--flush-every): JSONL (una línea por CV) o un
+  directorio de partes Parquet (part-00000.parquet, ...; los campos anidados en JSON).
+- Tras cada tanda se anota en <out>.checkpoint qué CVs están escritos. Si el proceso se
+  interrumpe, volver a lanzar el mismo comando continúa donde se quedó (lo escrito
+  después del último checkpoint se descarta); --restart empieza de cero.
+- --no-ner (NER_MODE=off) no llama al NER remoto: sin red ni HF_API_TOKEN.
+- Al terminar imprime (y registra) el resumen de rendimiento: CVs/s y ms por CV.
+"""
+import argparse
+import json
+import logging
+import os
+import shutil
+import statistics
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+from uuid import NAMESPACE_URL, uuid5
+
+from utils.logging_config import configure_logging
+from utils.model_registry import MODELS
+
+logger = logging.getLogger(__name__)
+
+# ==================================
+# CONFIG
+# ==================================
+CV_EXTENSIONS = (".pdf", ".docx", ".txt")
+DEFAULT_WORKERS = os.cpu_count() or 1
+DEFAULT_FLUSH_EVERY = 100  # CVs por tanda escrita y anotada en el checkpoint
+FORMATS = ("jsonl", "parquet")
+# Columnas anidadas que se guardan como JSON en Parquet (el esquema varía entre partes)
+_NESTED = ("data", "areas_for_development", "recommendations")
+
+
+# ==================================
+# WORKERS DEL POOL
+# ==================================
+def _init_worker(use_ner: bool) -> None:
+    configure_logging()
+    if not use_ner:
+        import models.cv_processing as cv_processing
+
+        cv_processing.NER_MODE = "off"
+
+
+async def _process(path: str, candidate_id: str, keep_raw_text: bool) -> Dict:
+    from models.cv_processing import extract_text_from_file, extract_cv_data_from_text
+    from models.employability_model import predict_employability
+    from models.recommendation_model import recommend_jobs
+    from schemas.cv import CandidateData
+
+    raw_text = await extract_text_from_file(path)
+    extracted = await extract_cv_data_from_text(raw_text, candidate_id, os.path.basename(path))
+    candidate = CandidateData(
+        id=candidate_id,
+        name=extracted.name or "",
+        **extracted.model_dump(include={"summary", "experience", "education", "skills", "languages"}),
+    )
+    employability = await predict_employability(candidate)
+    return {
+        "data": extracted.model_dump(exclude=None if keep_raw_text else {"raw_text"}),
+        "employability_score": employability["employability_score"],
+        "areas_for_development": employability["areas_for_development"],
+        "recommendations": await recommend_jobs(extracted),
+    }
+
+
+def process_cv(path: str, file: str, keep_raw_text: bool = False) -> Dict:
+    """Un CV completo; los errores se devuelven en el registro para no parar el lote."""
+    from jobs.cv_tasks import _run
+
+    # Id estable por ruta: re-procesar el mismo directorio da los mismos ids
+    candidate_id = str(uuid5(NAMESPACE_URL, file))
+    record = {"file": file, "candidate_id": candidate_id}
+    started = time.perf_counter()
+    try:
+        record.update(_run(_process(path, candidate_id, keep_raw_text)), status="ok")
+    except Exception as e:
+        logger.warning("Error procesando %s: %s", file, e)
+        record.update(status="error", error=f"{type(e).__name__}: {e}")
+    record["ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return record
+
+
+# ==================================
+# SALIDA Y CHECKPOINT
+# ==================================
+class JSONLWriter:
+    """Una línea por CV; la posición del checkpoint es el tamaño en bytes ya confirmado."""
+
+    def __init__(self, path: Path, position: int):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(path, "a+b")
+        # Lo escrito tras el último checkpoint (tanda a medias) se descarta
+        self._file.truncate(position)
+        self._file.seek(position)
+
+    def write(self, records: List[Dict]) -> int:
+        for record in records:
+            self._file.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return self._file.tell()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ParquetWriter:
+    """Una parte Parquet por tanda; la posición del checkpoint es el número de partes."""
+
+    def __init__(self, path: Path, position: int):
+        path.mkdir(parents=True, exist_ok=True)
+        self._dir = path
+        self._part = position
+        for stale in path.glob("part-*.parquet"):
+            if int(stale.stem.split("-")[1]) >= position:
+                stale.unlink()
+
+    def write(self, records: List[Dict]) -> int:
+        # pandas/pyarrow solo los necesita esta salida
+        import pandas as pd
+
+        rows = [
+            {**r, **{k: json.dumps(r[k], ensure_ascii=False) for k in _NESTED if k in r}}
+            for r in records
+        ]
+        df = pd.DataFrame(rows, columns=["file", "candidate_id", "status", "error", "ms",
+                                         "employability_score", *_NESTED])
+        tmp = self._dir / f".part-{self._part:05d}.parquet.tmp"
+        df.to_parquet(tmp, index=False)
+        tmp.replace(self._dir / f"part-{self._part:05d}.parquet")
+        self._part += 1
+        return self._part
+
+    def close(self) -> None:
+        pass
+
+
+WRITERS = {"jsonl": JSONLWriter, "parquet": ParquetWriter}
+
+
+def checkpoint_path(out: Path) -> Path:
+    return out.with_name(out.name + ".checkpoint")
+
+
+def load_checkpoint(path: Path) -> Tuple[Set[str], int]:
+    """CVs ya escritos y posición de la salida confirmada en el último checkpoint."""
+    done: Set[str] = set()
+    position = 0
+    if not path.exists():
+        return done, position
+    valid = 0
+    with open(path, "r+b") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                break
+            if not line.endswith(b"\n"):
+                break
+            done.update(entry["files"])
+            position = entry["position"]
+            valid += len(line)
+        # Última línea a medio escribir: se corta para que los nuevos checkpoints no la continúen
+        f.truncate(valid)
+    return done, position
+
+
+def _append_checkpoint(path: Path, position: int, files: List[str]) -> None:
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"position": position, "files": files}, ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def find_cvs(input_dir: Path) -> List[Path]:
+    return sorted(
+        p for p in input_dir.rglob("*")
+        if p.is_file() and p.suffix.lower() in CV_EXTENSIONS and not p.name.startswith(".")
+    )
+
+
+# ==================================
+# JOB
+# ==================================
+def run_bulk_cvs(
+    input_dir: Path,
+    out: Path,
+    output_format: str = "jsonl",
+    workers: int = DEFAULT_WORKERS,
+    use_ner: bool = True,
+    flush_every: int = DEFAULT_FLUSH_EVERY,
+    restart: bool = False,
+    keep_raw_text: bool = False,
+) -> Dict:
+    if output_format not in FORMATS:
+        raise ValueError(f"Formato no soportado: {output_format}. Opciones: {', '.join(FORMATS)}")
+
+    input_dir, out = Path(input_dir), Path(out)
+    checkpoint = checkpoint_path(out)
+    if restart:
+        checkpoint.unlink(missing_ok=True)
+        if out.is_dir():
+            shutil.rmtree(out)
+        else:
+            out.unlink(missing_ok=True)
+
+    files = find_cvs(input_dir)
+    done, position = load_checkpoint(checkpoint)
+    pending = [p for p in files if p.relative_to(input_dir).as_posix() not in done]
+    if done:
+        logger.info("Reanudando: %d CVs ya procesados, %d pendientes", len(files) - len(pending), len(pending))
+
+    writer = WRITERS[output_format](out, position)
+    buffer: List[Dict] = []
+    ms: List[float] = []
+    counts = {"ok": 0, "error": 0}
+
+    def flush() -> None:
+        if buffer:
+            _append_checkpoint(checkpoint, writer.write(buffer), [r["file"] for r in buffer])
+            buffer.clear()
+
+    # Modelos cargados antes del fork: los procesos del pool los comparten
+    MODELS.preload_for_fork(["employability"])
+    started = time.perf_counter()
+    queue = iter(pending)
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(use_ner,))
+    try:
+        in_flight = set()
+
+        def submit_next() -> None:
+            path = next(queue, None)
+            if path is not None:
+                in_flight.add(pool.submit(
+                    process_cv, str(path), path.relative_to(input_dir).as_posix(), keep_raw_text,
+                ))
+
+        # Pocas tareas en vuelo: la memoria no crece con el tamaño del directorio
+        for _ in range(workers * 4):
+            submit_next()
+        while in_flight:
+            finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                record = future.result()
+                counts[record["status"]] += 1
+                ms.append(record["ms"])
+                buffer.append(record)
+                submit_next()
+            if len(buffer) >= flush_every:
+                flush()
+                logger.info("Procesados %d/%d CVs", len(files) - len(pending) + len(ms), len(files))
+    finally:
+        # También al interrumpir: lo ya terminado queda escrito y anotado
+        flush()
+        writer.close()
+        pool.shutdown(cancel_futures=True)
+
+    seconds = time.perf_counter() - started
+    summary = {
+        "files": len(files),
+        "skipped": len(files) - len(pending),
+        "processed": len(ms),
+        "ok": counts["ok"],
+        "failed": counts["error"],
+        "seconds": round(seconds, 2),
+        "cvs_per_second": round(len(ms) / seconds, 2) if seconds else 0.0,
+        "ms_p50": round(statistics.median(ms), 1) if ms else 0.0,
+        "ms_p95": round(sorted(ms)[int(0.95 * (len(ms) - 1))], 1) if ms else 0.0,
+        "workers": workers,
+        "ner": use_ner,
+        "output": str(out),
+    }
+    logger.info("bulk_cvs terminado", extra=summary)
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Procesamiento masivo offline de CVs")
+    parser.add_argument("input_dir", type=Path)
+    parser.add_argument("--out", type=Path, required=True, help="archivo .jsonl o directorio de partes Parquet")
+    parser.add_argument("--format", choices=FORMATS, default="jsonl")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--flush-every", type=int, default=DEFAULT_FLUSH_EVERY)
+    parser.add_argument("--no-ner", action="store_true", help="sin NER remoto (nombre por reglas)")
+    parser.add_argument("--raw-text", action="store_true", help="incluir el texto completo de cada CV")
+    parser.add_argument("--restart", action="store_true", help="ignorar el checkpoint y empezar de cero")
+    args = parser.parse_args(argv)
+    configure_logging()
+
+    summary = run_bulk_cvs(
+        args.input_dir, args.out, args.format, args.workers, not args.no_ner,
+        args.flush_every, args.restart, args.raw_text,
+    )
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
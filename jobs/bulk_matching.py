@@ -0,0 +1,270 @@
+"""
+Cruce masivo nocturno: top-k candidatos por oferta activa y top-k ofertas por candidato.
+
+Uso (CLI):
+    python -m jobs.bulk_matching --top-k 10 --workers 4 --output parquet --path data/bulk_matches.parquet
+    python -m jobs.bulk_matching --output db
+
+También se lanza como tarea en segundo plano desde POST /bulk-matching (main.py).
+"""
+import argparse
+import asyncio
+import logging
+import datetime
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from utils.logging_config import configure_logging
+
+from models.candidate.loader import load_candidates
+from models.candidate.table import CandidateTable
+from models.offers.loader import load_offers
+from models.matches.repository import replace_bulk_matches
+from models.matches.scoring import (
+    CANDIDATE_RULES,
+    CANDIDATE_SCORE_TABLE,
+    OFFER_RULES,
+    OFFER_SCORE_TABLE,
+    CandidateMatrix,
+    build_candidate_matrix,
+    decode_reasons,
+    score_offers_chunk,
+    top_k,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# ==================================
+# CONFIG
+# ==================================
+DEFAULT_TOP_K = 10
+DEFAULT_CHUNK_SIZE = 64  # ofertas por tarea del pool
+DEFAULT_WORKERS = os.cpu_count() or 1
+DEFAULT_OUTPUT_PATH = Path("data/bulk_matches.parquet")
+OUTPUTS = ("parquet", "db")
+
+# ==================================
+# WORKERS DEL POOL
+# ==================================
+_worker_matrix: Optional[CandidateMatrix] = None
+
+
+def _init_worker(matrix: CandidateMatrix) -> None:
+    # La matriz de candidatos viaja una sola vez por proceso, no por chunk
+    global _worker_matrix
+    _worker_matrix = matrix
+
+
+def _call_with_matrix(func: Callable, task):
+    return func(task, _worker_matrix)
+
+
+def map_offer_chunks(
+    func: Callable,
+    offers: List[Dict],
+    matrix: CandidateMatrix,
+    workers: int = DEFAULT_WORKERS,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> List:
+    """Aplica func((start, ofertas), matrix) a cada chunk de ofertas, en un pool si workers > 1."""
+    tasks = [(start, offers[start:start + chunk_size]) for start in range(0, len(offers), chunk_size)]
+
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(tasks)),
+            initializer=_init_worker,
+            initargs=(matrix,),
+        ) as pool:
+            return list(pool.map(partial(_call_with_matrix, func), tasks))
+    return [func(task, matrix) for task in tasks]
+
+
+def _score_chunk(task: Tuple[int, List[Dict]], matrix: CandidateMatrix, k: int):
+    start, offers = task
+
+    candidate_flags, offer_flags = score_offers_chunk(offers, matrix)
+    candidate_scores = CANDIDATE_SCORE_TABLE[candidate_flags]
+    offer_scores = OFFER_SCORE_TABLE[offer_flags]
+
+    # Top-k candidatos de cada oferta del chunk (empate -> orden de candidatos)
+    cand_cols, cand_top = top_k(candidate_scores, np.arange(len(matrix)), k)
+    cand_reason_flags = np.take_along_axis(candidate_flags, np.maximum(cand_cols, 0), axis=1)
+
+    # Top-k parcial de ofertas de cada candidato (empate -> orden global de ofertas)
+    offer_positions = start + np.arange(len(offers))
+    offer_cols, offer_top = top_k(offer_scores.T, offer_positions, k)
+    offer_reason_flags = np.take_along_axis(offer_flags.T, np.maximum(offer_cols, 0), axis=1)
+    offer_global = np.where(offer_cols >= 0, offer_cols + start, -1)
+
+    return (
+        (cand_cols, cand_top, cand_reason_flags),
+        (offer_global, offer_top, offer_reason_flags),
+    )
+
+
+# ==================================
+# CRUCE COMPLETO
+# ==================================
+def compute_cross_match(
+    offers: List[Dict],
+    candidates: CandidateTable,
+    k: int = DEFAULT_TOP_K,
+    workers: int = DEFAULT_WORKERS,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> "pd.DataFrame":
+    """
+    Calcula ambas direcciones del matching y devuelve un DataFrame con columnas
+    direction, offer_id, candidate_id, rank, score, reasons.
+    """
+    # pandas solo lo necesita el cruce masivo: no se importa al arrancar la API
+    import pandas as pd
+
+    matrix = build_candidate_matrix(candidates)
+    results = map_offer_chunks(partial(_score_chunk, k=k), offers, matrix, workers, chunk_size)
+
+    offer_ids = [str(o["id"]) for o in offers]
+    candidate_ids = matrix.ids
+    frames = []
+
+    # --- Dirección "offer": top-k candidatos por oferta ---
+    if results:
+        cols = np.concatenate([r[0][0] for r in results])
+        scores = np.concatenate([r[0][1] for r in results])
+        flags = np.concatenate([r[0][2] for r in results])
+        frames.append(_to_frame("offer", cols, scores, flags, CANDIDATE_RULES,
+                                row_ids=offer_ids, col_ids=candidate_ids, rows_are_offers=True))
+
+    # --- Dirección "candidate": merge de los top-k parciales de cada chunk ---
+    if results and candidate_ids:
+        cols = np.concatenate([r[1][0] for r in results], axis=1)
+        scores = np.concatenate([r[1][1] for r in results], axis=1)
+        flags = np.concatenate([r[1][2] for r in results], axis=1)
+        positions = np.where(cols >= 0, cols, len(offers))
+        pick, merged = top_k(np.where(cols >= 0, scores, 0), positions, k)
+        safe = np.maximum(pick, 0)
+        frames.append(_to_frame(
+            "candidate",
+            np.where(pick >= 0, np.take_along_axis(cols, safe, axis=1), -1),
+            merged,
+            np.take_along_axis(flags, safe, axis=1),
+            OFFER_RULES,
+            row_ids=candidate_ids, col_ids=offer_ids, rows_are_offers=False,
+        ))
+
+    if not frames:
+        return pd.DataFrame(columns=["direction", "offer_id", "candidate_id", "rank", "score", "reasons"])
+    return pd.concat(frames, ignore_index=True)
+
+
+def _to_frame(direction, cols, scores, flags, rules, row_ids, col_ids, rows_are_offers) -> "pd.DataFrame":
+    import pandas as pd
+
+    rows, ranks = np.nonzero(cols >= 0)
+    picked = cols[rows, ranks]
+    reasons_table = [decode_reasons(f, rules) for f in range(1 << len(rules))]
+
+    row_ids = np.asarray(row_ids, dtype=object)[rows]
+    col_ids = np.asarray(col_ids, dtype=object)[picked]
+    return pd.DataFrame({
+        "direction": direction,
+        "offer_id": row_ids if rows_are_offers else col_ids,
+        "candidate_id": col_ids if rows_are_offers else row_ids,
+        "rank": ranks + 1,
+        "score": scores[rows, ranks].astype(int),
+        "reasons": [reasons_table[f] for f in flags[rows, ranks]],
+    })
+
+
+def offer_to_dict(offer) -> Dict:
+    if isinstance(offer, dict):
+        return offer
+    return {
+        "id": offer.id,
+        "puesto": offer.puesto,
+        "categoria": offer.categoria,
+        "empresa": offer.empresa,
+        "descripcion": offer.descripcion,
+    }
+
+
+# ==================================
+# JOB
+# ==================================
+async def run_bulk_matching(
+    db: AsyncSession,
+    k: int = DEFAULT_TOP_K,
+    workers: int = DEFAULT_WORKERS,
+    output: str = "parquet",
+    path: Path = DEFAULT_OUTPUT_PATH,
+    run_id: Optional[str] = None,
+) -> Dict:
+    if output not in OUTPUTS:
+        raise ValueError(f"Salida no soportada: {output}. Opciones: {', '.join(OUTPUTS)}")
+
+    run_id = run_id or str(uuid4())
+    started = time.perf_counter()
+
+    offers = [offer_to_dict(o) for o in (await load_offers(db) or [])]
+    candidates = await load_candidates(db)
+
+    # El cálculo es CPU-bound: fuera del event loop
+    loop = asyncio.get_running_loop()
+    df = await loop.run_in_executor(
+        None, partial(compute_cross_match, offers, candidates, k, workers)
+    )
+    df.insert(0, "run_id", run_id)
+    df["created_at"] = datetime.datetime.now()
+
+    if output == "parquet":
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(path, index=False)
+    else:
+        await replace_bulk_matches(db, df.to_dict("records"))
+
+    summary = {
+        "run_id": run_id,
+        "offers": len(offers),
+        "candidates": len(candidates),
+        "rows": len(df),
+        "output": output if output == "db" else str(path),
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+    logger.info("bulk_matching terminado", extra=summary)
+    return summary
+
+
+async def run_bulk_matching_job(**kwargs) -> Dict:
+    """Punto de entrada para BackgroundTasks: abre su propia sesión de DB."""
+    from db.session import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        return await run_bulk_matching(db, **kwargs)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Cruce masivo ofertas x candidatos")
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--output", choices=OUTPUTS, default="parquet")
+    parser.add_argument("--path", type=Path, default=DEFAULT_OUTPUT_PATH)
+    args = parser.parse_args(argv)
+    configure_logging()
+
+    asyncio.run(run_bulk_matching_job(
+        k=args.top_k, workers=args.workers, output=args.output, path=args.path
+    ))
+
+
+if __name__ == "__main__":
+    main()
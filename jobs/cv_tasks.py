@@ -0,0 +1,154 @@
+"""
+Tareas de CV que la JobQueue ejecuta en el pool de procesos.
+
+Deben ser funciones de módulo (picklables) y devolver tipos simples (dict): el
+resultado vuelve al proceso principal, donde se reconstruye el modelo Pydantic.
+"""
+import asyncio
+import datetime
+import os
+import threading
+from multiprocessing.util import Finalize
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from schemas.cv import CandidateData
+from schemas.candidate import CandidateSummary
+from models.cv_processing import extract_text_from_bytes, extract_text_from_file, extract_cv_data_from_text
+from models.employability_model import compute_employability
+from models.recommendation_model import recommend_positions
+from models.interview_prep import build_interview_questions
+from utils.dag import run_dag
+
+CANDIDATE_STAGE_THREADS = int(os.getenv("CANDIDATE_STAGE_THREADS", "2"))
+
+_stage_pool: Optional[ThreadPoolExecutor] = None
+_local = threading.local()
+_loops: List[asyncio.AbstractEventLoop] = []
+_loops_pid: Optional[int] = None
+
+
+def _run(coro):
+    # Un event loop persistente por proceso/hilo del pool en lugar de asyncio.run por
+    # trabajo: el cliente NER (utils.ner_client) reutiliza sus conexiones entre trabajos
+    global _loops_pid
+    loop = getattr(_local, "loop", None)
+    if loop is None:
+        loop = _local.loop = asyncio.new_event_loop()
+        if _loops_pid != os.getpid():
+            # Finalize (no atexit): también corre al salir un proceso hijo de multiprocessing
+            _loops.clear()
+            _loops_pid = os.getpid()
+            Finalize(None, _close_loops, exitpriority=10)
+        _loops.append(loop)
+    return loop.run_until_complete(coro)
+
+
+def _close_loops() -> None:
+    """Al terminar el proceso (shutdown del pool): cierra el cliente NER de cada loop y el loop."""
+    from utils.ner_client import close_ner_client
+
+    for loop in _loops:
+        if loop.is_closed() or loop.is_running():
+            continue
+        try:
+            loop.run_until_complete(close_ner_client())
+        finally:
+            loop.close()
+    _loops.clear()
+
+
+async def _extract_cv(file_location: str, candidate_id: str, file_name: str, **options):
+    raw_text = await extract_text_from_file(file_location)
+    # Microservicio 1 - despues de que saca la info con hugging NER envio el texto plano a esta funcion
+    return await extract_cv_data_from_text(raw_text, candidate_id, file_name, **options)
+
+
+def run_extract_cv(
+    file_location: str,
+    candidate_id: str,
+    file_name: str,
+    fields: Optional[List[str]] = None,
+    raw_text_max_chars: Optional[int] = None,
+) -> Dict:
+    # exclude_unset: solo los campos pedidos (todos si fields es None)
+    try:
+        return _run(_extract_cv(
+            file_location, candidate_id, file_name, fields=fields, raw_text_max_chars=raw_text_max_chars,
+        )).model_dump(exclude_unset=True)
+    finally:
+        if os.path.exists(file_location):
+            os.remove(file_location)
+
+
+async def _extract_cv_bytes(data: bytes, candidate_id: str, file_name: str, **options):
+    raw_text = await extract_text_from_bytes(data, file_name)
+    return await extract_cv_data_from_text(raw_text, candidate_id, file_name, **options)
+
+
+def run_extract_cv_bytes(
+    data: bytes,
+    candidate_id: str,
+    file_name: str,
+    fields: Optional[List[str]] = None,
+    raw_text_max_chars: Optional[int] = None,
+) -> Dict:
+    """Extracción de un CV en memoria (lotes y ZIP de /extract-cv-data/batch): sin pasar por disco."""
+    return _run(_extract_cv_bytes(
+        data, candidate_id, file_name, fields=fields, raw_text_max_chars=raw_text_max_chars,
+    )).model_dump(exclude_unset=True)
+
+
+def _stage_executor() -> ThreadPoolExecutor:
+    # Un pool por proceso del JobQueue, reutilizado entre trabajos
+    global _stage_pool
+    if _stage_pool is None:
+        _stage_pool = ThreadPoolExecutor(max_workers=CANDIDATE_STAGE_THREADS)
+    return _stage_pool
+
+
+async def build_candidate_summary(candidate_data: CandidateData) -> Tuple[CandidateSummary, Dict[str, float]]:
+    """
+    Empleabilidad y recomendación son independientes y corren a la vez; la preparación
+    de entrevista espera a ambas. Devuelve el resumen y la duración (ms) de cada etapa.
+    """
+    stages = {
+        # 1. Evaluación de empleabilidad (Microservicio 2)
+        "employability": (lambda: compute_employability(candidate_data), []),
+        # 2. Recomendación de puestos (Microservicio 3)
+        "recommendations": (
+            lambda: recommend_positions((exp.title, exp.years) for exp in candidate_data.experience or []),
+            [],
+        ),
+        # 3. Microservicio opcional: Preparación de entrevista
+        "interview": (
+            lambda employability, recommendations: build_interview_questions(
+                candidate_name=candidate_data.name if candidate_data.name else "Candidato",
+                skills=candidate_data.skills,
+                experience=candidate_data.experience,
+                areas_for_development=employability.get("areas_for_development", []),
+                job_recommendations=recommendations,
+            ),
+            ["employability", "recommendations"],
+        ),
+    }
+    results, timings = await run_dag(stages, executor=_stage_executor())
+    employability_results = results["employability"]
+
+    # Construir el resumen final del candidato
+    summary = CandidateSummary(
+        id=candidate_data.id,
+        name=candidate_data.name if candidate_data.name else "Candidato Desconocido",
+        employability_score=employability_results["employability_score"],
+        top_recommendations=results["recommendations"],
+        last_processed=datetime.datetime.now().isoformat(),
+        areas_for_development=employability_results["areas_for_development"],
+        interview_questions=results["interview"]
+    )
+    return summary, timings
+
+
+def run_process_candidate(candidate_payload: Dict) -> Dict:
+    candidate_data = CandidateData(**candidate_payload)
+    summary, timings = _run(build_candidate_summary(candidate_data))
+    return {"summary": summary.model_dump(), "timings": timings}
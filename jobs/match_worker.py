@@ -0,0 +1,188 @@
+"""
+Worker de la tabla materializada `match_results`.
+
+Compara la huella (puesto/descripcion/categoria de cada oferta, experiencia/skills de
+cada candidato) con la última puntuada, invalida solo las filas afectadas y vuelve a
+puntuar: ofertas cambiadas x todos los candidatos + ofertas sin cambios x candidatos
+cambiados. /candidate-matcher y /offer-matcher leen después la tabla con un único
+ORDER BY score LIMIT k; los triggers de la DB anotan en match_changes las altas y
+cambios posteriores, que las lecturas descartan y puntúan en vivo hasta la siguiente
+pasada.
+
+Uso (CLI):
+    python -m jobs.match_worker                 # una pasada
+    python -m jobs.match_worker --interval 300  # en bucle cada 5 minutos
+"""
+import argparse
+import asyncio
+import logging
+import time
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from utils.logging_config import configure_logging
+
+from jobs.bulk_matching import DEFAULT_WORKERS, map_offer_chunks, offer_to_dict
+from models.candidate.loader import load_candidates
+from models.candidate.table import CandidateTable
+from models.offers.repository import get_open_offers
+from models.matches.repository import apply_match_updates, ensure_match_tables, get_changes, get_fingerprints
+from models.matches.scoring import (
+    CANDIDATE_RULES,
+    CANDIDATE_SCORE_TABLE,
+    OFFER_RULES,
+    OFFER_SCORE_TABLE,
+    CandidateMatrix,
+    build_candidate_matrix,
+    candidate_fingerprint,
+    decode_reasons,
+    offer_fingerprint,
+    score_offers_chunk,
+)
+
+logger = logging.getLogger(__name__)
+
+DIRECTIONS = (
+    ("offer", CANDIDATE_SCORE_TABLE, CANDIDATE_RULES),
+    ("candidate", OFFER_SCORE_TABLE, OFFER_RULES),
+)
+
+
+def _nonzero_pairs(task: Tuple[int, List[Dict]], matrix: CandidateMatrix):
+    """Pares (oferta, candidato, flags) con score > 0 en ambas direcciones."""
+    start, offers = task
+    out = []
+    for flags, (_, table, _) in zip(score_offers_chunk(offers, matrix), DIRECTIONS):
+        rows, cols = np.nonzero(table[flags] > 0)
+        out.append((rows + start, cols, flags[rows, cols]))
+    return out
+
+
+def score_pairs(
+    offers: List[Dict],
+    candidates: CandidateTable,
+    offer_fps: Dict[str, str],
+    candidate_fps: Dict[str, str],
+    workers: int = DEFAULT_WORKERS,
+) -> List[Dict]:
+    """Filas de match_results para todos los pares offers x candidates con score > 0."""
+    if not offers or not candidates:
+        return []
+
+    matrix = build_candidate_matrix(candidates)
+    results = map_offer_chunks(_nonzero_pairs, offers, matrix, workers)
+
+    offer_ids = [str(o["id"]) for o in offers]
+    reasons_tables = [
+        [decode_reasons(f, rules) for f in range(1 << len(rules))] for _, _, rules in DIRECTIONS
+    ]
+    rows = []
+    for chunk in results:
+        for (direction, table, _), reasons, (offer_idx, cand_idx, flags) in zip(DIRECTIONS, reasons_tables, chunk):
+            for o, c, f in zip(offer_idx.tolist(), cand_idx.tolist(), flags.tolist()):
+                offer_id, candidate_id = offer_ids[o], matrix.ids[c]
+                rows.append({
+                    "direction": direction,
+                    "offer_id": offer_id,
+                    "candidate_id": candidate_id,
+                    "score": int(table[f]),
+                    "reasons": reasons[f],
+                    "offer_fp": offer_fps[offer_id],
+                    "candidate_fp": candidate_fps[candidate_id],
+                })
+    return rows
+
+
+async def refresh_match_results(db: AsyncSession, workers: int = DEFAULT_WORKERS) -> Dict:
+    started = time.perf_counter()
+    await ensure_match_tables(db)
+    # Antes de cargar: lo que cambie después sube de versión y sigue en match_changes
+    changes = await get_changes(db)
+
+    offers = [offer_to_dict(o) for o in await get_open_offers(db)]
+    candidates = await load_candidates(db)
+    stored = await get_fingerprints(db)
+
+    offer_fps = {str(o["id"]): offer_fingerprint(o) for o in offers}
+    candidate_fps = {
+        candidates.ids[i]: candidate_fingerprint(candidates.experience(i), candidates.skills(i))
+        for i in range(len(candidates))
+    }
+
+    changed_offers = [o for o in offers if stored.get(("offer", str(o["id"]))) != offer_fps[str(o["id"])]]
+    changed_candidates = candidates.take([
+        i for i, cid in enumerate(candidates.ids) if stored.get(("candidate", cid)) != candidate_fps[cid]
+    ])
+    changed_offer_ids = {str(o["id"]) for o in changed_offers}
+    unchanged_offers = [o for o in offers if str(o["id"]) not in changed_offer_ids]
+
+    removed = [
+        (kind, source_id) for kind, source_id in stored
+        if source_id not in (offer_fps if kind == "offer" else candidate_fps)
+    ]
+
+    loop = asyncio.get_running_loop()
+    rows = await loop.run_in_executor(None, partial(
+        score_pairs, changed_offers, candidates, offer_fps, candidate_fps, workers
+    ))
+    rows += await loop.run_in_executor(None, partial(
+        score_pairs, unchanged_offers, changed_candidates, offer_fps, candidate_fps, workers
+    ))
+
+    fingerprints = {("offer", str(o["id"])): offer_fps[str(o["id"])] for o in changed_offers}
+    fingerprints.update(
+        {("candidate", cid): candidate_fps[cid] for cid in changed_candidates.ids}
+    )
+
+    await apply_match_updates(
+        db,
+        stale_offer_ids=changed_offer_ids | {sid for kind, sid in removed if kind == "offer"},
+        stale_candidate_ids=set(changed_candidates.ids) | {sid for kind, sid in removed if kind == "candidate"},
+        rows=rows,
+        fingerprints=fingerprints,
+        removed=removed,
+        changes=changes,
+    )
+
+    summary = {
+        "changed_offers": len(changed_offers),
+        "changed_candidates": len(changed_candidates),
+        "removed": len(removed),
+        "rows_written": len(rows),
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+    logger.info("match_worker terminado", extra=summary)
+    return summary
+
+
+async def refresh_match_results_job(workers: int = DEFAULT_WORKERS) -> Dict:
+    """Punto de entrada para BackgroundTasks: abre su propia sesión de DB."""
+    from db.session import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        return await refresh_match_results(db, workers)
+
+
+async def _run_forever(interval: int, workers: int) -> None:
+    while True:
+        await refresh_match_results_job(workers)
+        await asyncio.sleep(interval)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Refresca la tabla materializada match_results")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--interval", type=int, default=0, help="segundos entre pasadas (0 = una sola)")
+    args = parser.parse_args(argv)
+    configure_logging()
+
+    if args.interval > 0:
+        asyncio.run(_run_forever(args.interval, args.workers))
+    else:
+        asyncio.run(refresh_match_results_job(args.workers))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,34 +1,97 @@
 # main.py
-from fastapi import FastAPI, UploadFile, File, HTTPException, status
-from typing import Dict
+from fastapi import FastAPI, UploadFile, File, HTTPException, status, BackgroundTasks, Response
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from typing import AsyncIterator, Dict, List, Optional
 from uuid import uuid4
+from contextlib import asynccontextmanager
+import asyncio
+import json
 import os
+import time
 import datetime
-from config import add_cors_middleware
+import logging
+from utils.logging_config import configure_logging
+# Antes de importar los módulos que registran al cargarse (modelos, loaders, DB)
+configure_logging()
+from config import add_cors_middleware, add_request_context_middleware, add_metrics_middleware
 from schemas.cv import ExtractedCVData, CandidateData
 from schemas.candidate import CandidateSummary, CVProcessedData
 from schemas.offer import OfferInput
 from fastapi import Depends
 from db.session import get_db
 from sqlalchemy.ext.asyncio import AsyncSession
-from utils.file_handler import save_upload_file
-from models.cv_processing import extract_text_from_file, extract_cv_data_from_text
-from models.employability_model import predict_employability
+from schemas.job import JobStatus
+from utils.file_handler import save_upload_file, read_batch_entries, BatchEntry, BatchTooLargeError
+from utils.job_queue import JobQueue, QueueFullError, DONE, FAILED
+from utils.metrics import REGISTRY, server_timing
+from utils.model_registry import MODELS, warmup_names
+from utils.memory import register_memory_gauges
 from models.recommendation_model import recommend_jobs
-from models.interview_prep import generate_interview_questions 
 from models.offers.matcher import match_offers
 from models.candidate.matcher import match_candidates_from_offer
 from models.candidate.loader import load_candidates
+from models.candidate.repository import count_candidates
 from models.offers.model import Offer, OfferMatcherResponse, OfferMatcherSummary, OfferMatch
+from models.matches.repository import (
+    read_precomputed,
+    get_top_candidates_for_offer,
+    get_top_offers_for_candidate,
+)
+from models.matches.scoring import offer_fingerprint, candidate_fingerprint
+from jobs.bulk_matching import run_bulk_matching_job, DEFAULT_TOP_K, OUTPUTS
+from jobs.match_worker import refresh_match_results_job
+from jobs.cv_tasks import run_extract_cv, run_extract_cv_bytes, run_process_candidate
+from models.cv_processing import CV_FIELDS
+
+# Cola de trabajos de CV (extracción y procesamiento) ejecutados en un pool de procesos
+job_queue = JobQueue()
+# CVs de lotes extraídos a la vez en todo el proceso, sumando todos los lotes (por
+# defecto, la mitad del pool: el resto queda para los trabajos de la cola)
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", str(max(1, job_queue.pool_size // 2))))
+# Lotes en curso a la vez (cada uno retiene hasta BATCH_MAX_BYTES en memoria); 429 al superarlo
+BATCH_MAX_INFLIGHT = int(os.getenv("BATCH_MAX_INFLIGHT", "2"))
+_batch_slots = asyncio.Semaphore(BATCH_CONCURRENCY)
+_batch_requests = asyncio.Semaphore(BATCH_MAX_INFLIGHT)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Modelos bajo demanda salvo los de MODEL_WARMUP; se cargan antes de arrancar la
+    # JobQueue para que los procesos del pool los hereden en el fork
+    names = warmup_names()
+    if names:
+        timings = await asyncio.to_thread(MODELS.warmup, names)
+        logger.info("Modelos precargados: %s", server_timing(timings))
+    # RSS/PSS/USS de este worker en /metrics (tras el fork: cada worker con su pid)
+    register_memory_gauges(REGISTRY)
+    # Calentamiento opcional del resumidor (SUMMARIZER_WARMUP=1): el modelo se carga
+    # antes de aceptar tráfico y no en el primer request
+    if os.getenv("SUMMARIZER_WARMUP", "0") == "1":
+        from models.cv_summarizer import warmup_summarizer
+        await asyncio.to_thread(warmup_summarizer)
+    await job_queue.start()
+    yield
+    await job_queue.stop()
+    # Cliente NER (pool de conexiones httpx) de este event loop, si se llegó a crear
+    from utils.ner_client import close_ner_client
+    await close_ner_client()
+
 
 app = FastAPI(
     title="T3 Chat - API de Inclusión Laboral",
     description="API para procesar CVs, evaluar empleabilidad, recomendar puestos y generar preguntas de entrevista para personas en reclusión.",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Añadir el middleware CORS
 add_cors_middleware(app)
+# Histogramas por etapa y cabecera Server-Timing en cada respuesta
+add_metrics_middleware(app)
+# request_id en cada registro de log y en la cabecera X-Request-ID
+add_request_context_middleware(app)
+
+logger = logging.getLogger(__name__)
 
 processed_candidates_db: Dict[str, CVProcessedData] = {}
 extracted_data_db: Dict[str, ExtractedCVData] = {}
@@ -39,20 +102,82 @@ candidate_summaries_db: Dict[str, CandidateSummary] = {}
 async def read_root():
     return {"message": "Bienvenido a la API de Inclusión Laboral"}
 
+
+@app.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    summary="Métricas de latencia por etapa en formato Prometheus",
+    include_in_schema=False,
+)
+async def metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+def _job_status(job) -> JobStatus:
+    return JobStatus(
+        job_id=job.id,
+        kind=job.kind,
+        status=job.status,
+        created_at=datetime.datetime.fromtimestamp(job.created_at).isoformat(),
+        finished_at=datetime.datetime.fromtimestamp(job.finished_at).isoformat() if job.finished_at else None,
+        error=job.error,
+        status_url=f"/jobs/{job.id}",
+        result_url=f"/jobs/{job.id}/result",
+    )
+
+
+def _accepted(job, response: Response) -> JobStatus:
+    response.headers["Location"] = f"/jobs/{job.id}"
+    return _job_status(job)
+
+
+def _queue_full(e: QueueFullError) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=f"Servidor saturado, reintenta más tarde: {e}",
+        headers={"Retry-After": "5"},
+    )
+
+
+def _extraction_options(fields: Optional[str], raw_text_max_chars: Optional[int]) -> Dict:
+    """fields="skills,experience" -> solo esos extractores (sin NER si no se pide name)."""
+    requested = None
+    if fields is not None:
+        requested = sorted({f.strip() for f in fields.split(",") if f.strip()})
+        unknown = set(requested) - CV_FIELDS
+        if not requested or unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Campos inválidos en fields: {', '.join(sorted(unknown)) or '(vacío)'}. "
+                       f"Opciones: {', '.join(sorted(CV_FIELDS))}."
+            )
+    if raw_text_max_chars is not None and raw_text_max_chars < 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="raw_text_max_chars debe ser >= 0 (0 = sin raw_text)."
+        )
+    return {"fields": requested, "raw_text_max_chars": raw_text_max_chars}
+
+
 @app.post(
     "/extract-cv-data",
-    response_model=ExtractedCVData,
+    response_model=JobStatus,
     status_code=status.HTTP_202_ACCEPTED,
-    summary="Extrae información de un CV con PLN para revisión",
+    summary="Encola la extracción de información de un CV con PLN para revisión",
     responses={
-        202: {"description": "CV recibido y extracción de datos iniciada"},
-        400: {"model": dict, "description": "Formato de archivo no soportado o error al procesar CV"}, # dict para error
+        202: {"description": "CV recibido y extracción encolada; consultar /jobs/{job_id}"},
+        400: {"model": dict, "description": "Formato de archivo no soportado o fields inválido"}, # dict para error
+        429: {"model": dict, "description": "Cola de trabajos llena"},
         500: {"model": dict, "description": "Error interno del servidor"}
     }
 )
-
-async def extract_cv_data_endpoint(file: UploadFile = File(...)):
+async def extract_cv_data_endpoint(
+    response: Response,
+    file: UploadFile = File(...),
+    fields: Optional[str] = None,
+    raw_text_max_chars: Optional[int] = None,
+):
     candidate_id = str(uuid4()) 
+    options = _extraction_options(fields, raw_text_max_chars)
 
     if not file.filename:
         raise HTTPException(
@@ -68,83 +193,194 @@ async def extract_cv_data_endpoint(file: UploadFile = File(...)):
                    "Solo se aceptan PDF, DOCX y TXT."
         )
 
-    file_location = ""
-    try:
-        file_location = await save_upload_file(file)
-        raw_text = await extract_text_from_file(file_location)
-        
-        # Microservicio 1 - despues de que saca la info con hugging NER envio el texto plano a esta funcion
-        extracted_data = await extract_cv_data_from_text(raw_text, candidate_id, file.filename)
-        
+    # Comprobar capacidad antes de escribir el archivo a disco
+    if job_queue.qsize() >= job_queue.maxsize:
+        raise _queue_full(QueueFullError(f"Cola de trabajos llena ({job_queue.maxsize})"))
+
+    file_location = await save_upload_file(file, file_id=candidate_id)
+
+    def on_result(data: dict, job) -> dict:
+        extracted_data = ExtractedCVData(**data)
         extracted_data_db[candidate_id] = extracted_data
-        
-        return extracted_data
+        # Solo los campos calculados: el tamaño de la respuesta depende de lo pedido
+        return extracted_data.model_dump(mode="json", exclude_unset=True)
 
-    except ValueError as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
-    except Exception as e:
-        print(f"Error inesperado al extraer datos del CV: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error interno del servidor al procesar el CV: {e}"
+    try:
+        job = job_queue.submit(
+            "extract-cv-data", run_extract_cv, file_location, candidate_id, file.filename,
+            options["fields"], options["raw_text_max_chars"],
+            on_result=on_result,
         )
+    except QueueFullError as e:
+        os.remove(file_location)
+        raise _queue_full(e)
+
+    return _accepted(job, response)
+
+
+def _ndjson(line: dict) -> bytes:
+    return (json.dumps(line, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+async def _extract_batch(entries: List[BatchEntry], options: Dict) -> AsyncIterator[bytes]:
+    """Una línea NDJSON por CV según van terminando (no en orden de subida) y un resumen final."""
+    started = time.perf_counter()
+
+    async def extract(index: int, entry: BatchEntry) -> dict:
+        line = {"index": index, "file": entry.name}
+        if entry.error:
+            return {**line, "status": "error", "status_code": status.HTTP_400_BAD_REQUEST, "error": entry.error}
+        candidate_id = str(uuid4())
+        async with _batch_slots:
+            try:
+                data = await job_queue.run(
+                    "extract-cv-data-batch", run_extract_cv_bytes, entry.data, candidate_id,
+                    os.path.basename(entry.name), options["fields"], options["raw_text_max_chars"],
+                )
+            except ValueError as e:
+                return {**line, "status": "error", "status_code": status.HTTP_400_BAD_REQUEST, "error": str(e)}
+            except Exception as e:
+                logger.exception("Error al extraer %s en lote", entry.name)
+                return {**line, "status": "error", "status_code": status.HTTP_500_INTERNAL_SERVER_ERROR, "error": str(e)}
+        extracted_data = ExtractedCVData(**data)
+        extracted_data_db[candidate_id] = extracted_data
+        return {**line, "status": "ok", "candidate_id": candidate_id, "data": extracted_data.model_dump(mode="json", exclude_unset=True)}
+
+    tasks = [asyncio.create_task(extract(i, entry)) for i, entry in enumerate(entries)]
+    ok = 0
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            line = await next_done
+            ok += line["status"] == "ok"
+            yield _ndjson(line)
+        yield _ndjson({"summary": {
+            "total": len(entries),
+            "ok": ok,
+            "failed": len(entries) - ok,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }})
     finally:
-        if os.path.exists(file_location):
-            os.remove(file_location)
+        # Cliente desconectado: no seguir extrayendo lo que nadie va a leer
+        for task in tasks:
+            task.cancel()
 
 
-# Segundo endpoint: Recibe los datos ya extraídos (y posiblemente modificados) y ejecuta los modelos de ML
+@app.post(
+    "/extract-cv-data/batch",
+    response_class=StreamingResponse,
+    summary="Extrae en lote varios CVs (o los de un ZIP) y devuelve los resultados en NDJSON",
+    responses={
+        200: {
+            "content": {"application/x-ndjson": {}},
+            "description": "Una línea por CV ({index, file, status, candidate_id, data} o "
+                           "{index, file, status, status_code, error}) y una línea final {summary}",
+        },
+        400: {"model": dict, "description": "Lote vacío o fields inválido"},
+        413: {"model": dict, "description": "El lote supera BATCH_MAX_FILES o BATCH_MAX_BYTES"},
+        429: {"model": dict, "description": "Demasiados lotes en curso (BATCH_MAX_INFLIGHT)"},
+    }
+)
+async def extract_cv_data_batch_endpoint(
+    files: List[UploadFile] = File(...),
+    fields: Optional[str] = None,
+    raw_text_max_chars: Optional[int] = None,
+):
+    options = _extraction_options(fields, raw_text_max_chars)
+
+    # Plaza de lote antes de leer nada a memoria; se libera al terminar (o cortarse) el stream
+    if _batch_requests.locked():
+        raise _queue_full(QueueFullError(f"Lotes en curso ({BATCH_MAX_INFLIGHT})"))
+    await _batch_requests.acquire()
+    try:
+        # Los archivos del formulario se cierran al volver del endpoint, antes de enviar el
+        # stream: se leen (y se descomprimen los ZIP) en memoria ahora
+        try:
+            entries = await asyncio.to_thread(read_batch_entries, [(f.filename or "", f.file) for f in files])
+        except BatchTooLargeError as e:
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+        if not entries:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="El lote no contiene ningún CV.")
+    except BaseException:
+        _batch_requests.release()
+        raise
+    return StreamingResponse(
+        _extract_batch(entries, options),
+        media_type="application/x-ndjson",
+        background=BackgroundTask(_batch_requests.release),
+    )
+
+
+# Segundo endpoint: Recibe los datos ya extraídos (y posiblemente modificados) y encola los modelos de ML
 @app.post(
     "/process-candidate-data",
-    response_model=CandidateSummary,
+    response_model=JobStatus,
     status_code=status.HTTP_202_ACCEPTED,
-    summary="Procesa los datos de un candidato para generar un resumen de empleabilidad",
+    summary="Encola el procesamiento de los datos de un candidato para generar un resumen de empleabilidad",
     responses={
-        202: {"description": "Datos del candidato recibidos y procesamiento iniciado"},
+        202: {"description": "Datos del candidato recibidos y procesamiento encolado; consultar /jobs/{job_id}"},
         400: {"model": dict, "description": "Datos de entrada inválidos"},
+        429: {"model": dict, "description": "Cola de trabajos llena"},
         500: {"model": dict, "description": "Error interno del servidor"}
     }
 )
-async def process_candidate_data_endpoint(candidate_data: CandidateData):
+async def process_candidate_data_endpoint(candidate_data: CandidateData, response: Response):
     # Usamos el ID de los datos extraídos como ID del candidato para el summary
     candidate_id = candidate_data.id
 
+    def on_result(data: dict, job) -> CandidateSummary:
+        job.timings.update(data["timings"])
+        summary = CandidateSummary(**data["summary"])
+        candidate_summaries_db[candidate_id] = summary
+        return summary
+
     try:
-        # 1. Evaluación de empleabilidad (Microservicio 2)
-        employability_results = await predict_employability(candidate_data)
+        job = job_queue.submit(
+            "process-candidate-data", run_process_candidate, candidate_data.model_dump(),
+            on_result=on_result,
+        )
+    except QueueFullError as e:
+        raise _queue_full(e)
 
-        # 2. Recomendación de puestos (Microservicio 3)
-        job_recommendations = await recommend_jobs(candidate_data)
+    return _accepted(job, response)
 
-        # 3. Microservicio opcional: Preparación de entrevista
-        interview_questions = await generate_interview_questions(
-            candidate_name=candidate_data.name if candidate_data.name else "Candidato",
-            skills=candidate_data.skills,
-            experience=candidate_data.experience,
-            areas_for_development=employability_results.get("areas_for_development", []),
-            job_recommendations=job_recommendations
-        )
 
-        # Construir el resumen final del candidato
-        summary = CandidateSummary(
-            id=candidate_id,
-            name=candidate_data.name if candidate_data.name else "Candidato Desconocido",
-            employability_score=employability_results["employability_score"],
-            top_recommendations=job_recommendations,
-            last_processed=datetime.datetime.now().isoformat(),
-            areas_for_development=employability_results["areas_for_development"],
-            interview_questions=interview_questions
-        )
-        candidate_summaries_db[candidate_id] = summary
-        
-        return summary
+@app.get(
+    "/jobs/{job_id}",
+    response_model=JobStatus,
+    summary="Estado de un trabajo asíncrono",
+    responses={404: {"description": "Trabajo inexistente o expirado"}},
+)
+async def get_job_status(job_id: str):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Trabajo no encontrado o expirado.")
+    return _job_status(job)
 
-    except Exception as e:
-        print(f"Error inesperado al procesar los datos del candidato: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error interno del servidor al procesar los datos: {e}"
+
+@app.get(
+    "/jobs/{job_id}/result",
+    summary="Resultado de un trabajo asíncrono (ExtractedCVData o CandidateSummary)",
+    responses={
+        200: {"description": "Trabajo terminado"},
+        202: {"description": "Trabajo aún en cola o en ejecución"},
+        404: {"description": "Trabajo inexistente o expirado"},
+    },
+)
+async def get_job_result(job_id: str, response: Response):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Trabajo no encontrado o expirado.")
+    if job.status == FAILED:
+        raise HTTPException(status_code=job.error_status or 500, detail=job.error)
+    if job.status != DONE:
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=_job_status(job).model_dump(),
+            headers={"Retry-After": "1"},
         )
+    # Cola, ejecución y, si las hay, cada etapa del trabajo (p. ej. employability, interview)
+    response.headers["Server-Timing"] = server_timing(job.timings)
+    return job.result
 
 
 @app.post(
@@ -159,6 +395,8 @@ async def process_candidate_data_endpoint(candidate_data: CandidateData):
 )
 async def offer_matcher(
     candidate_data: ExtractedCVData,
+    candidate_id: Optional[str] = None,
+    limit: Optional[int] = None,
     db: AsyncSession = Depends(get_db)
 ) -> OfferMatcherResponse:
 
@@ -168,31 +406,51 @@ async def offer_matcher(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="El candidato debe tener al menos experiencia o habilidades para buscar ofertas."
         )
-    print("SKILLS:", candidate_data.skills)
-    print("EXPERIENCE:", candidate_data.experience)
+    logger.debug(
+        "offer-matcher: %d skills, %d experiencias",
+        len(candidate_data.skills), len(candidate_data.experience),
+    )
 
     try:
         job_recommendations = await recommend_jobs(candidate_data)
-        print("RECOMENDACIONES:", job_recommendations)
+        logger.debug("offer-matcher: recomendaciones %s", job_recommendations)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error al generar recomendaciones de puestos: {e}"
         )
 
+    # Lectura desde la tabla materializada si conocemos al candidato y sus datos no han cambiado
+    if candidate_id:
+        candidate_fp = candidate_fingerprint(
+            ((exp.title, exp.years) for exp in candidate_data.experience),
+            candidate_data.skills,
+        )
+        matched_offers = await read_precomputed(
+            db, get_top_offers_for_candidate, candidate_data, job_recommendations, candidate_id, candidate_fp, limit
+        )
+        if matched_offers:
+            return _offer_matcher_response(matched_offers)
+
     try:
         matched_offers = await match_offers(
             candidate_data=candidate_data,
             recommended_positions=job_recommendations,
             db=db
         )
-        print("MATCHES:", len(matched_offers))
+        logger.debug("offer-matcher: %d ofertas compatibles", len(matched_offers))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error al buscar ofertas compatibles: {e}"
         )
 
+    if limit is not None:
+        matched_offers = matched_offers[:limit]
+    return _offer_matcher_response(matched_offers)
+
+
+def _offer_matcher_response(matched_offers) -> OfferMatcherResponse:
     best_score = matched_offers[0]["score"] if matched_offers else 0
 
     return OfferMatcherResponse(
@@ -218,18 +476,62 @@ async def candidate_matcher(
     offer: OfferInput,
     db: AsyncSession = Depends(get_db)
 ):
-    candidates = await load_candidates(db)
+    offer_data = offer.model_dump()
 
-    matches = match_candidates_from_offer(
-        offer=offer.model_dump(),
-        candidates=candidates
+    # Lectura desde la tabla materializada si la oferta no ha cambiado desde la última pasada del worker
+    matches = await read_precomputed(
+        db, get_top_candidates_for_offer, offer_data, offer_fingerprint(offer_data), 10
     )
+    if matches:
+        total_candidates = await count_candidates(db)
+    else:
+        candidates = await load_candidates(db)
+        total_candidates = len(candidates)
+        matches = match_candidates_from_offer(
+            offer=offer_data,
+            candidates=candidates
+        )
 
     return {
         "summary": {
-            "total_candidates": len(candidates),
+            "total_candidates": total_candidates,
             "matched_candidates": len(matches),
             "best_match_score": matches[0]["match_percentage"] if matches else 0
         },
         "candidates": matches
     }
+
+
+@app.post(
+    "/bulk-matching",
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Lanza en segundo plano el cruce masivo de todas las ofertas activas con todos los candidatos",
+    responses={
+        202: {"description": "Cruce masivo programado"},
+        400: {"description": "Parámetros inválidos"},
+    }
+)
+async def bulk_matching_endpoint(
+    background_tasks: BackgroundTasks,
+    top_k: int = DEFAULT_TOP_K,
+    output: str = "db",
+):
+    if output not in OUTPUTS or top_k <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Parámetros inválidos: output debe ser uno de {OUTPUTS} y top_k > 0."
+        )
+
+    run_id = str(uuid4())
+    background_tasks.add_task(run_bulk_matching_job, k=top_k, output=output, run_id=run_id)
+    return {"run_id": run_id, "status": "scheduled", "top_k": top_k, "output": output}
+
+
+@app.post(
+    "/match-results/refresh",
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Invalida y vuelve a puntuar en segundo plano las filas de match_results afectadas por cambios",
+)
+async def refresh_match_results_endpoint(background_tasks: BackgroundTasks):
+    background_tasks.add_task(refresh_match_results_job)
+    return {"status": "scheduled"}
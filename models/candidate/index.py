@@ -0,0 +1,122 @@
+"""
+Índice invertido de candidatos para /candidate-matcher.
+
+Cada palabra de los títulos de experiencia y cada palabra de las skills (normalizadas)
+apunta a un bitmap con las filas de los candidatos que la tienen: un int de Python
+donde el bit i es la fila i. Las reglas del matcher buscan texto de la oferta *dentro*
+de los títulos y skills, así que una consulta recorre el vocabulario de palabras
+(cientos o pocos miles, no un candidato por iteración) y hace el OR de los bitmaps de
+las que coinciden: las filas que quedan fuera puntúan 0 y no se evalúan.
+
+  title_rows(fragments)  filas con alguna palabra de título que contiene algún fragmento
+  skill_rows(text)       filas con alguna palabra de skill contenida en text
+  add(row, ...)          alta (o reemplazo) de una fila
+  remove(row)            baja de una fila
+
+Memoria: un bitmap ocupa como mucho (filas / 8) bytes por palabra del vocabulario.
+"""
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from utils.normalize import normalize
+
+if TYPE_CHECKING:
+    from models.candidate.table import CandidateTable
+
+
+def bitmap_rows(bitmap: int) -> np.ndarray:
+    """Filas (bits a 1) de un bitmap, en orden."""
+    raw = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    return np.flatnonzero(np.unpackbits(np.frombuffer(raw, dtype=np.uint8), bitorder="little"))
+
+
+def rows_bitmap(rows: np.ndarray, size: int) -> int:
+    mask = np.zeros(size, dtype=bool)
+    mask[rows] = True
+    return int.from_bytes(np.packbits(mask, bitorder="little").tobytes(), "little")
+
+
+def _words(texts: Iterable[str]) -> set:
+    return {word for text in texts for word in text.split()}
+
+
+class CandidateIndex:
+    __slots__ = ("rows", "_titles", "_skills")
+
+    def __init__(self):
+        self.rows = 0                      # filas dadas de alta
+        self._titles: Dict[str, int] = {}  # palabra de título -> bitmap
+        self._skills: Dict[str, int] = {}  # palabra de skill -> bitmap
+
+    @classmethod
+    def from_table(cls, table: "CandidateTable") -> "CandidateIndex":
+        """Todas las filas de la tabla de una vez (un bitmap por palabra, sin OR fila a fila)."""
+        index = cls()
+        n = len(table)
+        index.rows = (1 << n) - 1
+        index._titles = _postings(table.exp_offsets, table.exp_title_ids, table.normalized_titles(), n)
+        index._skills = _postings(table.skill_offsets, table.skill_ids, table.normalized_skills(), n)
+        return index
+
+    def __len__(self) -> int:
+        return self.rows.bit_count()
+
+    # ---------- altas y bajas ----------
+    def add(self, row: int, titles: Iterable[Optional[str]], skills: Iterable[Optional[str]]) -> None:
+        """Títulos de experiencia y skills (sin normalizar) del candidato de la fila row."""
+        self.remove(row)
+        bit = 1 << row
+        self.rows |= bit
+        for vocab, texts in ((self._titles, titles), (self._skills, skills)):
+            for word in _words(normalize(t) for t in texts if t is not None):
+                vocab[word] = vocab.get(word, 0) | bit
+
+    def remove(self, row: int) -> None:
+        bit = 1 << row
+        if not self.rows & bit:
+            return
+        self.rows ^= bit
+        for vocab in (self._titles, self._skills):
+            for word, bitmap in list(vocab.items()):
+                if bitmap & bit:
+                    if bitmap == bit:
+                        del vocab[word]
+                    else:
+                        vocab[word] = bitmap ^ bit
+
+    # ---------- consultas ----------
+    def title_rows(self, fragments: List[str]) -> int:
+        rows = 0
+        for word, bitmap in self._titles.items():
+            if any(fragment in word for fragment in fragments):
+                rows |= bitmap
+        return rows
+
+    def skill_rows(self, text: str) -> int:
+        rows = 0
+        for word, bitmap in self._skills.items():
+            if word in text:
+                rows |= bitmap
+        return rows
+
+
+def _postings(offsets: np.ndarray, ids: np.ndarray, normalized: List[str], n: int) -> Dict[str, int]:
+    """Bitmap por palabra a partir de las columnas CSR (fila -> ids del vocabulario)."""
+    rows = np.repeat(np.arange(n), np.diff(offsets))
+    valid = ids >= 0
+    rows, ids = rows[valid], ids[valid]
+    order = np.argsort(ids, kind="stable")
+    bounds = np.searchsorted(ids[order], np.arange(len(normalized) + 1)).tolist()
+
+    by_word: Dict[str, List[int]] = {}
+    for vid, text in enumerate(normalized):
+        for word in set(text.split()):
+            by_word.setdefault(word, []).append(vid)
+    postings = {}
+    for word, vids in by_word.items():
+        bitmap = rows_bitmap(np.concatenate([rows[order[bounds[v]:bounds[v + 1]]] for v in vids]), n)
+        # Vocabulario compartido con otra tabla (take): palabras sin filas aquí
+        if bitmap:
+            postings[word] = bitmap
+    return postings
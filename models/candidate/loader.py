@@ -1,8 +1,10 @@
 import json
+import logging
 from pathlib import Path
-from typing import List, Dict
 from sqlalchemy.ext.asyncio import AsyncSession
 from models.candidate.repository import get_candidates_for_matching
+from models.candidate.table import CandidateTable
+from utils.metrics import timed
 
 # ==================================
 # CONFIG
@@ -10,19 +12,21 @@ from models.candidate.repository import get_candidates_for_matching
 CANDIDATES_SOURCE = "db"  # 👈 "json" | "db"
 CANDIDATES_PATH = Path("data/candidates_mock.json")
 
-print(f"[Candidates loader] Fuente seleccionada: {CANDIDATES_SOURCE}")
+logger = logging.getLogger(__name__)
+logger.info("Fuente de candidatos seleccionada: %s", CANDIDATES_SOURCE)
 
 # ==================================
 # LOADER
 # ==================================
+@timed("load_candidates")
 async def load_candidates(
     db: AsyncSession | None = None
-) -> List[Dict]:
+) -> CandidateTable:
 
     # -------- JSON LOCAL --------
     if CANDIDATES_SOURCE == "json":
         with open(CANDIDATES_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
+            return CandidateTable.from_dicts(json.load(f))
 
     # -------- DATABASE --------
     if CANDIDATES_SOURCE == "db":
@@ -1,64 +1,89 @@
-from typing import List, Dict
-from utils.auxiliar import normalize
+from typing import Dict, List, Tuple, Union
 
+import numpy as np
+
+from utils.normalize import normalize
+from utils.metrics import timed
+from models.candidate.index import CandidateIndex, bitmap_rows
+from models.candidate.table import CandidateTable
+from models.matches.scoring import CANDIDATE_RULES, CANDIDATE_SCORE_TABLE, decode_reasons, top_k
+
+@timed("match_candidates")
 def match_candidates_from_offer(
     offer: Dict,
-    candidates: List[Dict],
+    candidates: Union[CandidateTable, List[Dict]],
     limit: int = 10
 ) -> List[Dict]:
 
-    results = []
+    table = candidates if isinstance(candidates, CandidateTable) else CandidateTable.from_dicts(candidates)
+    if len(table) == 0:
+        return []
 
     offer_puesto = normalize(offer["puesto"])
     offer_desc = normalize(offer.get("descripcion", ""))
     offer_cat = normalize(offer.get("categoria", ""))
+    desc_words = offer_desc.split()
 
-    for c in candidates:
-        score = 0
-        reasons = []
-
-        exp_titles = " ".join(
-            normalize(exp.get("title", ""))
-            for exp in c["experience"]
-        )
-
-        skills_text = " ".join(
-            normalize(s) for s in c["skills"]
-        )
-
+    # Filas que cumple cada regla, como bitmaps del índice invertido: solo se recorre el
+    # vocabulario de palabras y los candidatos fuera de todas las reglas ni se miran
+    index = table.token_index()
+    rule_rows = (
         # 1 Puesto
-        if offer_puesto in exp_titles:
-            score += 40
-            reasons.append("Experiencia directa en el puesto")
-
+        _phrase_rows(table, index, offer_puesto),
         # 2 Experiencia relacionada
-        if offer_desc and any(w in exp_titles for w in offer_desc.split()):
-            score += 25
-            reasons.append("Experiencia relacionada")
-
+        index.title_rows(desc_words) if offer_desc else 0,
         # 3 Skills
-        if offer_desc and any(s in offer_desc for s in skills_text.split()):
-            score += 25
-            reasons.append("Habilidades relevantes")
-
+        index.skill_rows(offer_desc) if offer_desc else 0,
         # 4 Categoría
-        if offer_cat and offer_cat in exp_titles:
-            score += 10
-            reasons.append("Categoría compatible")
+        _phrase_rows(table, index, offer_cat) if offer_cat else 0,
+    )
+    flags = np.zeros(len(table), dtype=np.uint8)
+    for bit, bitmap in enumerate(rule_rows):
+        flags[bitmap_rows(bitmap)] |= 1 << bit
+    rows = np.flatnonzero(flags)
+    scores = CANDIDATE_SCORE_TABLE[flags[rows]]
+
+    # Score desc y, en empate, id: el mismo orden que la lectura de match_results
+    cols, top_scores = top_k(scores[None, :], table.id_ranks()[rows], limit)
+
+    results = []
+    for col, score in zip(cols[0].tolist(), top_scores[0].tolist()):
+        if col < 0:
+            break
+        i = int(rows[col])
+        results.append({
+            "id": table.ids[i],
+            "name": table.names[i],
+            "email": table.emails[i],
+            "phone": table.phones[i],
+            "current_position": table.current_position(i),
+            "match_percentage": score,
+            "reasons": decode_reasons(int(flags[i]), CANDIDATE_RULES),
+        })
+    return results
+
 
-        if score > 0:
-            results.append({
-                "id": c["id"],
-                "name": c["name"],
-                "email": c["email"],
-                "phone": c["phone"],
-                "current_position": (
-                    c["experience"][0]["title"]
-                    if c["experience"] else None
-                ),
-                "match_percentage": min(score, 100),
-                "reasons": reasons
-            })
+def _phrase_rows(table: CandidateTable, index: CandidateIndex, phrase: str) -> int:
+    """Filas cuyos títulos normalizados, unidos por espacios, contienen phrase."""
+    if not phrase:
+        return index.rows
+    words = phrase.split()
+    rows = index.title_rows(words[:1])
+    for word in words[1:]:
+        rows &= index.title_rows([word])
+    if len(words) == 1:
+        # Sin espacios solo puede estar dentro de una palabra: el índice es exacto
+        return rows
 
-    results.sort(key=lambda x: x["match_percentage"], reverse=True)
-    return results[:limit]
+    # Varias palabras (puede cruzar dos títulos): se confirma en las filas candidatas
+    norm_titles = table.normalized_titles()
+    texts: Dict[Tuple[int, ...], bool] = {}
+    confirmed = 0
+    for i in bitmap_rows(rows).tolist():
+        title_ids = tuple(table.exp_title_ids[table.exp_offsets[i]:table.exp_offsets[i + 1]].tolist())
+        hit = texts.get(title_ids)
+        if hit is None:
+            hit = texts[title_ids] = phrase in " ".join(norm_titles[t] if t >= 0 else "" for t in title_ids)
+        if hit:
+            confirmed |= 1 << i
+    return confirmed
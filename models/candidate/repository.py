@@ -1,10 +1,13 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import func, select
 from models.candidate.model import Candidate
+from models.candidate.table import CandidateTable, CandidateTableBuilder
 
 async def get_candidates_for_matching(
-    db: AsyncSession
-):
+    db: AsyncSession,
+    ids=None,
+) -> CandidateTable:
+    """Todos los candidatos o, con ids (lista o subconsulta), solo esos."""
     stmt = select(
         Candidate.id,
         Candidate.name,
@@ -12,20 +15,18 @@ async def get_candidates_for_matching(
         Candidate.phone,
         Candidate.experience,
         Candidate.skills
-    )
+    ).execution_options(yield_per=1000)
+    if ids is not None:
+        stmt = stmt.where(Candidate.id.in_(ids))
 
-    result = await db.execute(stmt)
-    rows = result.all()
+    # Fila a fila directamente a la tabla columnar, sin lista intermedia de dicts
+    builder = CandidateTableBuilder()
+    result = await db.stream(stmt)
+    async for r in result:
+        builder.append(r.id, r.name, r.email, r.phone, r.experience, r.skills)
+    return builder.build()
 
-    # Convertimos a dicts simples
-    return [
-        {
-            "id": r.id,
-            "name": r.name,
-            "email": r.email,
-            "phone": r.phone,
-            "experience": r.experience or [],
-            "skills": r.skills or []
-        }
-        for r in rows
-    ]
+
+async def count_candidates(db: AsyncSession) -> int:
+    result = await db.execute(select(func.count()).select_from(Candidate))
+    return result.scalar_one()
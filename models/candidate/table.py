@@ -0,0 +1,294 @@
+"""
+Tabla columnar de candidatos para el matching.
+
+En lugar de un dict por candidato (con sus listas de dicts de experiencia y de skills),
+cada columna se guarda una sola vez:
+
+  ids, names, emails, phones   StringColumn: un buffer UTF-8 + offsets
+  experiencia                  exp_offsets[i]:exp_offsets[i+1] -> exp_title_ids / exp_years
+  skills                       skill_offsets[i]:skill_offsets[i+1] -> skill_ids
+
+Los títulos y las skills se internan en vocabularios (`titles`, `skill_vocab`): cada
+texto distinto existe una vez aunque lo compartan miles de candidatos. Los matchers
+trabajan sobre los ids y agrupan candidatos con la misma combinación de títulos o de
+skills, así cada regla se evalúa una vez por combinación y no por candidato.
+
+Solo se guarda lo que usa el matching (título y años de cada experiencia, skills y
+datos de contacto); `row(i)` reconstruye el dict de get_candidates_for_matching.
+"""
+import sys
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.normalize import normalize_many
+from models.candidate.index import CandidateIndex
+
+
+class StringColumn:
+    """Cadenas en un único buffer UTF-8 con offsets (sin un objeto str por fila)."""
+    __slots__ = ("_data", "_offsets", "_nulls")
+
+    def __init__(self, values: Iterable[Optional[str]]):
+        data = bytearray()
+        offsets = array("q", [0])
+        nulls = []
+        for i, value in enumerate(values):
+            if value is None:
+                nulls.append(i)
+            else:
+                data += value.encode("utf-8")
+            offsets.append(len(data))
+        self._data = bytes(data)
+        self._offsets = np.frombuffer(offsets, dtype=np.int64)
+        self._nulls = frozenset(nulls)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i: int) -> Optional[str]:
+        if i in self._nulls:
+            return None
+        return self._data[self._offsets[i]:self._offsets[i + 1]].decode("utf-8")
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def take(self, indices: Sequence[int]) -> "StringColumn":
+        return StringColumn(self[int(i)] for i in indices)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._data) + self._offsets.nbytes + sys.getsizeof(self._nulls)
+
+
+class _Interner:
+    __slots__ = ("ids", "values")
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def __call__(self, value: Optional[str]) -> int:
+        if value is None:
+            return -1
+        idx = self.ids.get(value)
+        if idx is None:
+            idx = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return idx
+
+
+class CandidateTableBuilder:
+    """Acumula candidatos fila a fila (p. ej. desde un cursor de la DB) sin crear dicts."""
+
+    def __init__(self):
+        self._ids: List[str] = []
+        self._names: List[Optional[str]] = []
+        self._emails: List[Optional[str]] = []
+        self._phones: List[Optional[str]] = []
+        self._titles = _Interner()
+        self._skills = _Interner()
+        self._exp_offsets = array("q", [0])
+        self._exp_title_ids = array("i")
+        self._exp_years = array("i")
+        self._skill_offsets = array("q", [0])
+        self._skill_ids = array("i")
+
+    def append(
+        self,
+        id: str,
+        name: Optional[str],
+        email: Optional[str],
+        phone: Optional[str],
+        experience: Optional[Iterable[Dict]],
+        skills: Optional[Iterable[Optional[str]]],
+    ) -> None:
+        self._ids.append(str(id))
+        self._names.append(name)
+        self._emails.append(email)
+        self._phones.append(phone)
+        for exp in experience or []:
+            self._exp_title_ids.append(self._titles(exp.get("title")))
+            self._exp_years.append(exp.get("years") or 0)
+        self._exp_offsets.append(len(self._exp_title_ids))
+        for skill in skills or []:
+            self._skill_ids.append(self._skills(skill))
+        self._skill_offsets.append(len(self._skill_ids))
+
+    def build(self) -> "CandidateTable":
+        return CandidateTable(
+            ids=StringColumn(self._ids),
+            names=StringColumn(self._names),
+            emails=StringColumn(self._emails),
+            phones=StringColumn(self._phones),
+            titles=self._titles.values,
+            skill_vocab=self._skills.values,
+            exp_offsets=np.frombuffer(self._exp_offsets, dtype=np.int64),
+            exp_title_ids=np.frombuffer(self._exp_title_ids, dtype=np.int32),
+            exp_years=np.frombuffer(self._exp_years, dtype=np.int32),
+            skill_offsets=np.frombuffer(self._skill_offsets, dtype=np.int64),
+            skill_ids=np.frombuffer(self._skill_ids, dtype=np.int32),
+        )
+
+
+class CandidateTable:
+    __slots__ = (
+        "ids", "names", "emails", "phones",
+        "titles", "skill_vocab",
+        "exp_offsets", "exp_title_ids", "exp_years",
+        "skill_offsets", "skill_ids",
+        "_cache",
+    )
+
+    def __init__(
+        self,
+        ids: StringColumn,
+        names: StringColumn,
+        emails: StringColumn,
+        phones: StringColumn,
+        titles: List[str],
+        skill_vocab: List[str],
+        exp_offsets: np.ndarray,
+        exp_title_ids: np.ndarray,
+        exp_years: np.ndarray,
+        skill_offsets: np.ndarray,
+        skill_ids: np.ndarray,
+    ):
+        self.ids = ids
+        self.names = names
+        self.emails = emails
+        self.phones = phones
+        self.titles = titles
+        self.skill_vocab = skill_vocab
+        self.exp_offsets = exp_offsets
+        self.exp_title_ids = exp_title_ids
+        self.exp_years = exp_years
+        self.skill_offsets = skill_offsets
+        self.skill_ids = skill_ids
+        # Derivados memoizados (títulos normalizados, agrupaciones...)
+        self._cache: Dict[str, object] = {}
+
+    @classmethod
+    def from_dicts(cls, candidates: Iterable[Dict]) -> "CandidateTable":
+        builder = CandidateTableBuilder()
+        for c in candidates:
+            builder.append(
+                c["id"], c.get("name"), c.get("email"), c.get("phone"), c.get("experience"), c.get("skills")
+            )
+        return builder.build()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    # ---------- filas ----------
+    def experience(self, i: int) -> List[Tuple[Optional[str], int]]:
+        """(título, años) de cada experiencia del candidato i."""
+        start, end = self.exp_offsets[i], self.exp_offsets[i + 1]
+        return [
+            (self.titles[t] if t >= 0 else None, int(y))
+            for t, y in zip(self.exp_title_ids[start:end].tolist(), self.exp_years[start:end].tolist())
+        ]
+
+    def skills(self, i: int) -> List[Optional[str]]:
+        start, end = self.skill_offsets[i], self.skill_offsets[i + 1]
+        return [self.skill_vocab[s] if s >= 0 else None for s in self.skill_ids[start:end].tolist()]
+
+    def current_position(self, i: int) -> Optional[str]:
+        """Título de la primera experiencia (como `experience[0]["title"]`)."""
+        if self.exp_offsets[i] == self.exp_offsets[i + 1]:
+            return None
+        t = self.exp_title_ids[self.exp_offsets[i]]
+        return self.titles[t] if t >= 0 else None
+
+    def row(self, i: int) -> Dict:
+        return {
+            "id": self.ids[i],
+            "name": self.names[i],
+            "email": self.emails[i],
+            "phone": self.phones[i],
+            "experience": [{"title": t, "years": y} for t, y in self.experience(i)],
+            "skills": self.skills(i),
+        }
+
+    def take(self, indices: Sequence[int]) -> "CandidateTable":
+        """Subtabla con las filas indicadas (mismos vocabularios)."""
+        builder = CandidateTableBuilder()
+        builder._titles.values, builder._titles.ids = self.titles, {t: k for k, t in enumerate(self.titles)}
+        builder._skills.values, builder._skills.ids = self.skill_vocab, {s: k for k, s in enumerate(self.skill_vocab)}
+        for i in indices:
+            i = int(i)
+            builder._ids.append(self.ids[i])
+            builder._names.append(self.names[i])
+            builder._emails.append(self.emails[i])
+            builder._phones.append(self.phones[i])
+            start, end = self.exp_offsets[i], self.exp_offsets[i + 1]
+            builder._exp_title_ids.extend(self.exp_title_ids[start:end].tolist())
+            builder._exp_years.extend(self.exp_years[start:end].tolist())
+            builder._exp_offsets.append(len(builder._exp_title_ids))
+            start, end = self.skill_offsets[i], self.skill_offsets[i + 1]
+            builder._skill_ids.extend(self.skill_ids[start:end].tolist())
+            builder._skill_offsets.append(len(builder._skill_ids))
+        return builder.build()
+
+    # ---------- derivados para los matchers (memoizados) ----------
+    def _memo(self, key: str, compute):
+        value = self._cache.get(key)
+        if value is None:
+            value = self._cache[key] = compute()
+        return value
+
+    def normalized_titles(self) -> List[str]:
+        return self._memo("norm_titles", lambda: normalize_many(self.titles))
+
+    def normalized_skills(self) -> List[str]:
+        return self._memo("norm_skills", lambda: normalize_many(self.skill_vocab))
+
+    def title_groups(self) -> Tuple[List[Tuple[int, ...]], np.ndarray]:
+        """Combinaciones únicas de títulos (en orden) y el grupo de cada candidato."""
+        return self._memo("title_groups", lambda: _group(self.exp_offsets, self.exp_title_ids.tolist()))
+
+    def skill_groups(self) -> Tuple[List[Tuple[int, ...]], np.ndarray]:
+        """Combinaciones únicas de skills (en orden) y el grupo de cada candidato."""
+        return self._memo("skill_groups", lambda: _group(self.skill_offsets, self.skill_ids.tolist()))
+
+    def id_ranks(self) -> np.ndarray:
+        """Posición de cada fila ordenando por id: el desempate de los matchers y de match_results."""
+        def compute():
+            ranks = np.empty(len(self), dtype=np.int64)
+            ranks[sorted(range(len(self)), key=self.ids.__getitem__)] = np.arange(len(self))
+            return ranks
+        return self._memo("id_ranks", compute)
+
+    def token_index(self) -> "CandidateIndex":
+        """Índice invertido palabra de título / de skill -> bitmap de filas."""
+        return self._memo("token_index", lambda: CandidateIndex.from_table(self))
+
+    def experience_groups(self) -> Tuple[List[Tuple[Tuple[int, int], ...]], np.ndarray]:
+        """Combinaciones únicas de (título, años > 0): lo que usa recommend_positions."""
+        def compute():
+            pairs = list(zip(self.exp_title_ids.tolist(), (self.exp_years > 0).tolist()))
+            return _group(self.exp_offsets, pairs)
+        return self._memo("experience_groups", compute)
+
+    @property
+    def nbytes(self) -> int:
+        """Memoria propia de la tabla (columnas, arrays y vocabularios)."""
+        vocab = sum(sys.getsizeof(v) for v in self.titles) + sum(sys.getsizeof(v) for v in self.skill_vocab)
+        arrays = sum(a.nbytes for a in (
+            self.exp_offsets, self.exp_title_ids, self.exp_years, self.skill_offsets, self.skill_ids
+        ))
+        columns = sum(c.nbytes for c in (self.ids, self.names, self.emails, self.phones))
+        return vocab + arrays + columns
+
+
+def _group(offsets: np.ndarray, flat: List) -> Tuple[List[Tuple], np.ndarray]:
+    groups: Dict[Tuple, int] = {}
+    bounds = offsets.tolist()
+    inverse = np.fromiter(
+        (groups.setdefault(tuple(flat[bounds[i]:bounds[i + 1]]), len(groups)) for i in range(len(bounds) - 1)),
+        dtype=np.int32,
+        count=len(bounds) - 1,
+    )
+    return list(groups), inverse
@@ -1,13 +1,13 @@
+import asyncio
+import io
 import os
-from huggingface_hub import InferenceClient
-import pdfplumber
-from docx import Document
-from transformers import pipeline
-from typing import List, Optional, Dict, Any
+from typing import TYPE_CHECKING, BinaryIO, Collection, List, Optional, Dict, Any, Union
 import re
-from functools import lru_cache 
+from functools import lru_cache
 import logging
 from schemas.cv import ExtractedCVData, ExperienceItem, EducationItem, LanguageItem
+from utils.logging_config import truncate
+from utils.metrics import timed
 from utils.auxiliar import (
     parse_dates,
     normalize_job_title,
@@ -23,97 +23,138 @@ from utils.index import (
     summary_section_keywords,
 )
 
-logging.basicConfig(level=logging.INFO)
+if TYPE_CHECKING:
+    from utils.ner_cache import NERCache
+    from utils.ner_client import NERClient
+
 logger = logging.getLogger(__name__)
 
-# --- Cargar el modelo de Hugging Face para NER ---
+# --- Modelo NER (Hugging Face Inference API) ---
 NER_MODEL_NAME = "mrm8488/bert-spanish-cased-finetuned-ner"
+# URL propia (Inference Endpoint dedicado o servidor NER local de las pruebas de carga)
+NER_ENDPOINT_URL = os.getenv("NER_ENDPOINT_URL")
+# Ventanas solapadas (utils/ner_windows.py): el modelo trunca a 512 subtokens
+NER_WINDOW_TOKENS = int(os.getenv("NER_WINDOW_TOKENS", "200"))
+NER_WINDOW_OVERLAP = int(os.getenv("NER_WINDOW_OVERLAP", "32"))
+NER_WINDOW_CONCURRENCY = int(os.getenv("NER_WINDOW_CONCURRENCY", "4"))
+# "head": solo la primera ventana (el NER solo se usa para el nombre); "full": todo el texto;
+# "off": sin NER (procesos offline sin red ni token; nombre por reglas y nombre de archivo)
+NER_MODE = os.getenv("NER_MODE", "head")
+
+
+@lru_cache(maxsize=1)
+def get_ner_cache() -> "NERCache":
+    """Caché de resultados NER del proceso; el modelo forma parte de la clave."""
+    from utils.ner_cache import NERCache
+
+    return NERCache(model=NER_ENDPOINT_URL or NER_MODEL_NAME)
+
+
+def get_ner_client() -> "NERClient":
+    """Cliente NER asíncrono del event loop actual (se crea en la primera llamada)."""
+    from utils.ner_client import HF_INFERENCE_URL, get_ner_client as _client_for_loop
 
-# --- LAZY LOADER: solo se carga en el PRIMER request ---
-@lru_cache(maxsize=1)  # ← Caché para cargar UNA SOLA VEZ
-def get_hf_client() -> InferenceClient:
-    """Cliente de Hugging Face Inference API - se crea solo una vez."""
     token = os.getenv("HF_API_TOKEN")
     if not token:
         raise RuntimeError("HF_API_TOKEN no está definida en las variables de entorno.")
-    
-    logger.info("🔄 Creando cliente HF Inference API...")
-    client = InferenceClient(
-        model=NER_MODEL_NAME,
-        token=token,
-    )
-    logger.info("✅ Cliente HF creado exitosamente")
-    return client
+    return _client_for_loop(NER_ENDPOINT_URL or HF_INFERENCE_URL.format(model=NER_MODEL_NAME), token)
 
 
 # --- Funciones de extracción de texto (sin cambios si ya funcionan bien) ---
+@timed("extract_text")
 async def extract_text_from_file(file_path: str) -> str:
     """Extrae texto de un archivo PDF, DOCX o TXT."""
-    file_extension = os.path.splitext(file_path)[1].lower()
+    return _extract_text(file_path, file_path)
+
+
+@timed("extract_text")
+async def extract_text_from_bytes(data: bytes, file_name: str) -> str:
+    """Como extract_text_from_file, para un CV en memoria (p. ej. una entrada de un ZIP)."""
+    return _extract_text(io.BytesIO(data), file_name)
+
+
+def _extract_text(source: Union[str, BinaryIO], file_name: str) -> str:
+    file_extension = os.path.splitext(file_name)[1].lower()
     text = ""
 
+    # Lectores importados solo para el formato que llega (pdfplumber tarda en importarse)
     if file_extension == ".pdf":
+        import pdfplumber
+
         try:
-            with pdfplumber.open(file_path) as pdf:  
+            with pdfplumber.open(source) as pdf:  
                 for page in pdf.pages:
                     text += page.extract_text() or ""  
         except Exception as e:
-            logger.error(f"Error al leer PDF {file_path}: {e}")
+            logger.error(f"Error al leer PDF {file_name}: {e}")
             raise ValueError("No se pudo extraer texto del PDF.")
     elif file_extension == ".docx":
+        # Streaming desde el zip (sin el DOM de python-docx); incluye tablas, cuadros de texto y cabeceras
+        from utils.docx_text import extract_docx_text
+
         try:
-            doc = Document(file_path)
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
+            text = extract_docx_text(source)
         except Exception as e:
-            logger.error(f"Error al leer DOCX {file_path}: {e}")
+            logger.error(f"Error al leer DOCX {file_name}: {e}")
             raise ValueError("No se pudo extraer texto del DOCX.")
     elif file_extension == ".txt":
-        with open(file_path, "r", encoding="utf-8") as f:
-            text = f.read()
+        if isinstance(source, str):
+            with open(source, "r", encoding="utf-8") as f:
+                text = f.read()
+        else:
+            text = source.read().decode("utf-8")
     else:
         raise ValueError(f"Formato de archivo no soportado: {file_extension}")
 
     return text
 
-def ner_via_hf(text: str):
+@timed("ner")
+async def ner_via_hf(text: str, head_only: bool = False):
     """
-    Llama al modelo NER vía Hugging Face Inference API.
-    Devuelve el mismo formato que pipeline("ner").
+    Llama al modelo NER vía Hugging Face Inference API sin bloquear el event loop.
+    El texto se parte en ventanas solapadas que se envían en paralelo y cuyas
+    entidades se unen con offsets sobre el texto completo; con head_only solo se
+    envía la primera ventana. Devuelve el mismo formato que pipeline("ner").
     """
-    client = get_hf_client()
-    
+    from utils.ner_client import NERError
+    from utils.ner_windows import merge_entities, split_windows
+
+    # Mismo texto limpio, modelo y ventanas -> mismas entidades
+    cache = get_ner_cache()
+    key = cache.key(text, f"{'head' if head_only else 'full'}:{NER_WINDOW_TOKENS}:{NER_WINDOW_OVERLAP}")
+    cached = cache.get(key)
+    if cached is not None:
+        logger.info("✅ NER desde caché: %d entidades", len(cached))
+        return cached
+
+    client = get_ner_client()
+    windows = split_windows(text, NER_WINDOW_TOKENS, NER_WINDOW_OVERLAP, limit=1 if head_only else None)
+    semaphore = asyncio.Semaphore(NER_WINDOW_CONCURRENCY)
+
+    async def classify(start: int, end: int):
+        async with semaphore:
+            return await client.token_classification(text[start:end], aggregation_strategy="simple")
+
     try:
-        logger.info(f"📤 Enviando texto a HF (longitud: {len(text)} chars)...")
-        # Llama al modelo con el texto
-        raw_entities = client.token_classification(
-            text,
-            aggregation_strategy="simple",  
-        )
-        logger.info(f"✅ NER completado: {len(raw_entities)} entidades encontradas")
+        logger.info("📤 Enviando texto a HF (longitud: %d chars, %d ventanas)...", len(text), len(windows))
+        results = await asyncio.gather(*(classify(start, end) for start, end in windows))
+        raw_entities = merge_entities(windows, results)
+        logger.info("✅ NER completado: %d entidades encontradas", len(raw_entities))
+        cache.put(key, raw_entities)
         return raw_entities
-        
-    except Exception as e:
-        # Log COMPLETO del error para debuggear
-        error_msg = f"Error en HF Inference API: {type(e).__name__}: {str(e)}"
-        logger.error(error_msg)
-        logger.error(f"   Texto enviado (primeros 200 chars): {text[:200]}...")
-        
-        # Errores comunes de HF:
-        if "Model is currently loading" in str(e):
-            raise RuntimeError("Modelo HF está cargándose, espera 1-2 min y reintenta.")
-        elif "Not Found" in str(e):
-            raise RuntimeError(f"Modelo no encontrado: {NER_MODEL_NAME}")
-        else:
-            raise RuntimeError(f"Error al procesar NER: {str(e)}")
+
+    except NERError as e:
+        # Reintentos, plazo y circuit breaker ya aplicados por el cliente
+        logger.error("Error en HF Inference API (%s): %s", e.reason, e)
+        logger.debug("   Texto enviado: %s", truncate(text, 200))
+        raise
 
 
 # --- Nuevas funciones para la extracción modular ---
-def extract_name(
-    raw_text: str, file_name: str, ner_results: List[Dict[str, Any]]
-) -> Optional[str]:
+def extract_name_from_text(raw_text: str) -> Optional[str]:
+    """Pasos 0 y 1 de extract_name: solo reglas sobre el texto, sin NER."""
     name: Optional[str] = None
-    
+
     # 0. PRIORIDAD ABSOLUTA: "NOMBRE:"
     explicit_name_match = re.search(
         r"(?i)\bnombre\s*:\s*([A-ZÁÉÍÓÚÑ][A-Za-zÁÉÍÓÚÑáéíóúñ\s]{5,})",
@@ -137,6 +178,15 @@ def extract_name(
             if 2 <= len(candidate_name.split()) <= 4:
                 name = candidate_name
 
+    return name
+
+
+@timed("extract_name")
+def extract_name(
+    raw_text: str, file_name: str, ner_results: List[Dict[str, Any]]
+) -> Optional[str]:
+    name = extract_name_from_text(raw_text)
+
     # 2. Si no se encontró por regex, usa NER de los primeros segmentos
     if not name:
         person_entities = [
@@ -175,6 +225,7 @@ def extract_name(
     return name
 
 
+@timed("extract_email")
 def extract_email(raw_text: str) -> Optional[str]:
     email_match = re.search(
         r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b", raw_text
@@ -184,6 +235,7 @@ def extract_email(raw_text: str) -> Optional[str]:
     return None
 
 
+@timed("extract_phone")
 def extract_phone(raw_text: str) -> Optional[str]:
     explicit = re.search(
         r"(?i)\btel[eé]fono\s*:\s*([\d\s+-]{7,})",
@@ -199,6 +251,7 @@ def extract_phone(raw_text: str) -> Optional[str]:
     return re.sub(r"\D", "", generic.group(0)) if generic else None
 
 
+@timed("extract_skills")
 def extract_skills(raw_text: str) -> List[str]:
     detected_skills = []
     for skill_keyword in common_skills_keywords:
@@ -206,6 +259,7 @@ def extract_skills(raw_text: str) -> List[str]:
             detected_skills.append(skill_keyword)
     return list(set(detected_skills))
 
+@timed("extract_experience")
 def extract_experience(raw_text: str) -> List[ExperienceItem]:
     simplified_experience: List[ExperienceItem] = []
 
@@ -277,6 +331,7 @@ def extract_experience(raw_text: str) -> List[ExperienceItem]:
 
     return simplified_experience
 
+@timed("extract_education")
 def extract_education(raw_text: str) -> List[EducationItem]:
     categorized_education: List[EducationItem] = []
 
@@ -341,6 +396,7 @@ def extract_education(raw_text: str) -> List[EducationItem]:
     return categorized_education
 
 
+@timed("extract_languages")
 def extract_languages(raw_text: str) -> List[LanguageItem]:
     """Extrae idiomas y sus niveles del candidato."""
     languages: List[LanguageItem] = []
@@ -398,6 +454,7 @@ def extract_languages(raw_text: str) -> List[LanguageItem]:
     return languages
 
 
+@timed("extract_summary")
 def extract_summary(raw_text: str) -> Optional[str]:
     summary: Optional[str] = None
 
@@ -409,7 +466,7 @@ def extract_summary(raw_text: str) -> Optional[str]:
     # --- Estrategia 1: Buscar en el bloque inicial del CV ---
     max_paragraphs_for_initial_summary = 10
     initial_text_block = "\n".join(paragraphs[:max_paragraphs_for_initial_summary])
-    print(initial_text_block)
+    logger.debug("Bloque inicial del CV: %s", truncate(initial_text_block, 500))
 
     # Buscar el primer gran bloque de texto que no sea una lista o título
     current_summary_candidate = []
@@ -432,8 +489,9 @@ def extract_summary(raw_text: str) -> Optional[str]:
             potential_summary_start_index = (
                 i + 1
             )  # El resumen debería empezar en el siguiente párrafo
-            logger.info(
-                f"Found summary header: '{p}' at paragraph {i}. Potential summary starts at {potential_summary_start_index}"
+            logger.debug(
+                "Found summary header: '%s' at paragraph %d. Potential summary starts at %d",
+                p, i, potential_summary_start_index,
             )
             continue
 
@@ -442,9 +500,7 @@ def extract_summary(raw_text: str) -> Optional[str]:
             if (
                 re.search(section_start_keywords_regex, p_lower) and len(p.split()) < 10
             ):  # Es el inicio de OTRA sección
-                logger.info(
-                    f"Found other section header: '{p}' at paragraph {i}. Summary ends here."
-                )
+                logger.debug("Found other section header: '%s' at paragraph %d. Summary ends here.", p, i)
                 break  # El resumen termina aquí, salimos del bucle
 
             # Si el párrafo es lo suficientemente largo y no parece una lista/título
@@ -462,9 +518,7 @@ def extract_summary(raw_text: str) -> Optional[str]:
                     len(p.split()) < 10
                     or re.search(r"^\s*[-•*]\s*|\d+\.\s*", p.strip())
                 ):
-                    logger.info(
-                        f"Short/list paragraph after summary: '{p}'. Stopping summary collection."
-                    )
+                    logger.debug("Short/list paragraph after summary: '%s'. Stopping summary collection.", p)
                     break
 
     if current_summary_candidate:
@@ -474,7 +528,7 @@ def extract_summary(raw_text: str) -> Optional[str]:
             if (
                 len(summary.split()) > 20
             ):  # Un resumen debe tener al menos 20 palabras para ser válido
-                logger.info(f"Summary found after header: {summary[:100]}...")
+                logger.debug("Summary found after header: %s", truncate(summary, 100))
                 return summary
 
     # 1.2 Intentar encontrar el resumen en los PRIMEROS PÁRRAFOS, sin necesidad de un encabezado explícito
@@ -487,9 +541,7 @@ def extract_summary(raw_text: str) -> Optional[str]:
                 re.search(section_start_keywords_regex, p.lower())
                 and len(p.split()) < 10
             ):
-                logger.info(
-                    f"Early section header found: '{p}'. Stopping initial summary hunt."
-                )
+                logger.debug("Early section header found: '%s'. Stopping initial summary hunt.", p)
                 break
             # Si el párrafo es un resumen potencial (largo, no es una lista/título)
             if len(p.split()) > 15 and not re.search(
@@ -527,7 +579,7 @@ def extract_summary(raw_text: str) -> Optional[str]:
                     r"\d{7,}", candidate_summary_text
                 ):  # No es un número de teléfono muy largo
                     summary = candidate_summary_text
-                    logger.info(f"Summary found in initial block: {summary[:100]}...")
+                    logger.debug("Summary found in initial block: %s", truncate(summary, 100))
                     return summary
 
     # Si todavía no hay resumen, volvemos a una búsqueda más general (tu lógica original, pero mejorada)
@@ -568,7 +620,7 @@ def extract_summary(raw_text: str) -> Optional[str]:
             candidate_summary_text = " ".join(temp_summary_paragraphs).strip()
             if len(candidate_summary_text.split()) > 20:
                 summary = candidate_summary_text
-                logger.info(f"Summary found in general scan: {summary[:100]}...")
+                logger.debug("Summary found in general scan: %s", truncate(summary, 100))
 
     # Un último fallback si no se encontró nada por los métodos anteriores
     if not summary:
@@ -578,53 +630,68 @@ def extract_summary(raw_text: str) -> Optional[str]:
                 r"^\s*[-•*]\s*|\d+\.\s*|^\s*(\w+\s*){1,4}$", p.strip()
             ):
                 summary = p.strip()
-                logger.info(
-                    f"Fallback summary found (first long paragraph): {summary[:100]}..."
-                )
+                logger.debug("Fallback summary found (first long paragraph): %s", truncate(summary, 100))
                 break
 
     return summary
 
 
 # --- Función principal de orquestación ---
+# Campos de ExtractedCVData que se pueden pedir con fields=
+CV_FIELDS = frozenset(ExtractedCVData.model_fields)
+
+# Extractor de cada campo (name aparte: es el único que puede necesitar el NER)
+FIELD_EXTRACTORS = {
+    "email": extract_email,
+    "phone": extract_phone,
+    "skills": extract_skills,
+    "experience": extract_experience,
+    "education": extract_education,
+    "languages": extract_languages,
+    "summary": extract_summary,
+}
+
+
 async def extract_cv_data_from_text(
-    raw_text: str, file_id: str, file_name: str
+    raw_text: str,
+    file_id: str,
+    file_name: str,
+    fields: Optional[Collection[str]] = None,
+    raw_text_max_chars: Optional[int] = None,
 ) -> ExtractedCVData:
+    """
+    fields: campos a calcular (None = todos); solo se ejecutan sus extractores y los
+    demás quedan sin asignar (model_dump(exclude_unset=True) devuelve solo los pedidos).
+    raw_text_max_chars trunca el texto original devuelto (0 = no se devuelve).
+    """
+    wanted = CV_FIELDS if fields is None else frozenset(fields)
+    unknown = wanted - CV_FIELDS
+    if unknown:
+        raise ValueError(f"Campos desconocidos: {', '.join(sorted(unknown))}. "
+                         f"Opciones: {', '.join(sorted(CV_FIELDS))}")
 
     clean_text = re.sub(r"\s*\n\s*", "\n", raw_text.strip())
     clean_text = re.sub(r"[ \t]+", " ", clean_text)
-    logger.info(f"TEXTO LIMPIO (primeros 500 chars): \n {clean_text}")
+    logger.debug("TEXTO LIMPIO (%d chars): %s", len(clean_text), truncate(clean_text, 500))
 
-    # ner_pipeline = get_ner_pipeline()
-    # ner_results = ner_pipeline(clean_text)
-    
-    # SE CABIÓ AQUI PARA USAR HF INFERENCE API
-    ner_results = ner_via_hf(clean_text)
+    values: Dict[str, Any] = {}
 
-    # Llamadas a las funciones modulares
-    name = extract_name(clean_text, file_name, ner_results)
-    email = extract_email(clean_text)
-    phone = extract_phone(clean_text)
-    skills = extract_skills(clean_text)
-
-    # ¡Ahora llamamos a las funciones separadas!
-    experience = extract_experience(clean_text)
-    education = extract_education(clean_text)
-
-    languages = extract_languages(clean_text)
-    summary = extract_summary(clean_text)
+    # SE CABIÓ AQUI PARA USAR HF INFERENCE API
+    # El NER solo aporta el nombre: si no se pide o las reglas ya lo encuentran no se llama
+    if "name" in wanted:
+        name = extract_name_from_text(clean_text)
+        if name is None:
+            ner_results = await ner_via_hf(clean_text, head_only=NER_MODE == "head") if NER_MODE != "off" else []
+            name = extract_name(clean_text, file_name, ner_results)
+        values["name"] = name
+
+    # Llamadas a las funciones modulares, solo las de los campos pedidos
+    for field, extractor in FIELD_EXTRACTORS.items():
+        if field in wanted:
+            values[field] = extractor(clean_text)
+
+    if "raw_text" in wanted and raw_text_max_chars != 0:
+        values["raw_text"] = raw_text if raw_text_max_chars is None else raw_text[:raw_text_max_chars]
 
     # Construir el objeto ExtractedCVData
-    extracted_data = ExtractedCVData(
-        name=name,
-        email=email,
-        phone=phone,
-        skills=skills,
-        experience=experience,
-        education=education,
-        languages=languages,
-        summary=summary,
-        raw_text=raw_text,
-    )
-
-    return extracted_data
+    return ExtractedCVData(**values)
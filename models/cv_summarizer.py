@@ -1,6 +1,14 @@
 from transformers import pipeline, AutoTokenizer, AutoModelForSeq2SeqLM
 import torch
-from typing import Optional
+import logging
+import os
+import re
+import threading
+from bisect import bisect_left
+from typing import List, Optional, Tuple
+from utils.metrics import timed
+
+logger = logging.getLogger(__name__)
 
 # Configuración global del modelo (se carga una sola vez)
 _model_name = "PlanTL-GOB-ES/bsc-bart-large-es"
@@ -9,56 +17,248 @@ _model = None
 _summarizer = None
 _device = None
 
+# --- Configuración por entorno ---
+# Hilos intra-op de torch por proceso (con N workers conviene N * hilos <= núcleos)
+SUMMARIZER_NUM_THREADS = os.getenv("SUMMARIZER_NUM_THREADS")
+
+# Backend de inferencia: "torch" (fp32, el de siempre) | "int8" (cuantización dinámica) | "onnx" (ONNX Runtime)
+SUMMARIZER_BACKENDS = ("torch", "int8", "onnx")
+SUMMARIZER_BACKEND = os.getenv("SUMMARIZER_BACKEND", "torch")
+
+# Decodificación: "beam" (por defecto, como antes) o "greedy" (más rápido en CPU)
+SUMMARIZER_DECODING = os.getenv("SUMMARIZER_DECODING", "beam")
+SUMMARIZER_NUM_BEAMS = int(os.getenv("SUMMARIZER_NUM_BEAMS", "4"))
+# Chunks por llamada a generate (limita el pico de memoria en CVs muy largos)
+SUMMARIZER_BATCH_SIZE = int(os.getenv("SUMMARIZER_BATCH_SIZE", "8"))
+
+# Single-flight: solo un hilo carga el modelo, el resto espera y reutiliza la instancia
+_load_lock = threading.Lock()
+
+
+def _configure_torch_threads():
+    if SUMMARIZER_NUM_THREADS:
+        torch.set_num_threads(int(SUMMARIZER_NUM_THREADS))
+
+
 def initialize_summarizer():
-    """Inicializa el modelo la primera vez que se llama"""
+    """Inicializa el modelo la primera vez que se llama (thread-safe, una sola carga)."""
     global _tokenizer, _model, _summarizer, _device
-    
-    if _summarizer is None:
-        print(f"Cargando modelo: {_model_name}")
-        _tokenizer = AutoTokenizer.from_pretrained(_model_name)
-        _model = AutoModelForSeq2SeqLM.from_pretrained(_model_name)
-        _device = 0 if torch.cuda.is_available() else -1
-        _summarizer = pipeline(
-            "summarization", 
-            model=_model, 
-            tokenizer=_tokenizer, 
-            device=_device
-        )
-        print(f"Modelo cargado en device: {_device}")
+
+    if _model is not None:
+        return _summarizer
+
+    with _load_lock:
+        if _model is None:
+            _configure_torch_threads()
+            logger.info("Cargando modelo: %s (backend: %s)", _model_name, SUMMARIZER_BACKEND)
+            _tokenizer = AutoTokenizer.from_pretrained(_model_name)
+            model = _load_model()
+            # int8 y ONNX son backends de CPU
+            _device = 0 if torch.cuda.is_available() and SUMMARIZER_BACKEND == "torch" else -1
+            _summarizer = _build_pipeline(model)
+            _model = model
+            logger.info("Modelo cargado en device: %s", _device)
     
     return _summarizer
 
-def summarize_cv(raw_text: str, max_length: int = 120, chunk_size: int = 1000) -> str:
-    # Inicializa si no está cargado
-    summarizer = initialize_summarizer()
-    # Divide en chunks para textos largos de CV
-    chunks = [raw_text[i:i+chunk_size] for i in range(0, len(raw_text), chunk_size)]
-    summaries = []
-    
-    for i, chunk in enumerate(chunks):
-        print(f"Procesando chunk {i+1}/{len(chunks)} ({len(chunk)} chars)")
-        
-        # Prompt optimizado para CVs
-        prompt = (
-            "Resume de forma profesional este CV. "
-            "Mantén nombres, fechas y empleadores sin modificar. "
-            "No inventes información. "
-            f"Texto: {chunk}"
+
+def _build_pipeline(model):
+    if SUMMARIZER_BACKEND == "onnx":
+        # El pipeline de transformers no acepta modelos de ONNX Runtime: el de optimum sí
+        from optimum.pipelines import pipeline as ort_pipeline
+
+        return ort_pipeline("summarization", model=model, tokenizer=_tokenizer, accelerator="ort")
+    return pipeline(
+        "summarization",
+        model=model,
+        tokenizer=_tokenizer,
+        device=_device
+    )
+
+
+def _load_model():
+    if SUMMARIZER_BACKEND not in SUMMARIZER_BACKENDS:
+        raise ValueError(
+            f"SUMMARIZER_BACKEND inválido: {SUMMARIZER_BACKEND}. Opciones: {', '.join(SUMMARIZER_BACKENDS)}"
         )
-        
+
+    if SUMMARIZER_BACKEND == "onnx":
+        # Exporta encoder y decoder (con past key values) a ONNX Runtime
         try:
-            result = summarizer(
-                prompt, 
-                max_length=max_length, 
-                min_length=40, 
+            from optimum.onnxruntime import ORTModelForSeq2SeqLM
+        except ImportError as e:
+            raise RuntimeError(
+                "SUMMARIZER_BACKEND=onnx requiere instalar 'optimum[onnxruntime]'."
+            ) from e
+        return ORTModelForSeq2SeqLM.from_pretrained(_model_name, export=True)
+
+    model = AutoModelForSeq2SeqLM.from_pretrained(_model_name)
+    model.eval()
+    if SUMMARIZER_BACKEND == "int8":
+        # Cuantización dinámica int8 de las capas lineales (pesos int8, activaciones en float)
+        model = torch.ao.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+    return model
+
+
+def warmup_summarizer():
+    """Carga el modelo y hace una generación corta para que el primer request no pague la latencia."""
+    initialize_summarizer()
+    _generate(["Resumen de prueba del modelo."], max_length=16, mode="greedy", num_beams=1, batch_size=1)
+
+
+# =====================
+# CHUNKING POR TOKENS
+# =====================
+
+_PROMPT = (
+    "Resume de forma profesional este CV. "
+    "Mantén nombres, fechas y empleadores sin modificar. "
+    "No inventes información. "
+    "Texto: "
+)
+
+# Frases: hasta un signo de cierre o un salto de línea (las líneas de un CV suelen ser unidades)
+_SENTENCE_REGEX = re.compile(r"[^.!?\n]+(?:[.!?]+|\n|$)")
+
+
+def _sentence_spans(text: str) -> List[Tuple[int, int]]:
+    return [(m.start(), m.end()) for m in _SENTENCE_REGEX.finditer(text) if m.group().strip()]
+
+
+def _token_starts(text: str, tokenizer) -> List[int]:
+    """Offset de inicio (en caracteres) de cada token: una sola pasada del tokenizer."""
+    if getattr(tokenizer, "is_fast", False):
+        enc = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)
+        return [start for start, _ in enc["offset_mapping"]]
+    # Tokenizer lento: aproximación por frase
+    starts = []
+    for start, end in _sentence_spans(text):
+        n = len(tokenizer(text[start:end], add_special_tokens=False)["input_ids"])
+        starts.extend([start] * n)
+    return starts
+
+
+def split_into_token_chunks(
+    text: str, tokenizer, max_tokens: int, overlap_tokens: int = 0
+) -> List[str]:
+    """
+    Agrupa frases completas en chunks de como máximo `max_tokens` tokens. Las últimas
+    frases de cada chunk se repiten al inicio del siguiente (hasta `overlap_tokens`)
+    para que el modelo no pierda contexto en los bordes. Una frase que por sí sola
+    excede el límite se corta en ventanas de tokens.
+    """
+    starts = _token_starts(text, tokenizer)
+
+    # (inicio, fin, nº tokens) por frase; frases demasiado largas -> ventanas de tokens
+    pieces: List[Tuple[int, int, int]] = []
+    for start, end in _sentence_spans(text):
+        lo, hi = bisect_left(starts, start), bisect_left(starts, end)
+        n = hi - lo
+        if n <= max_tokens:
+            pieces.append((start, end, n))
+            continue
+        for w in range(lo, hi, max_tokens):
+            w_end = min(w + max_tokens, hi)
+            pieces.append((
+                starts[w] if w > lo else start,
+                starts[w_end] if w_end < hi else end,
+                w_end - w,
+            ))
+
+    chunks: List[str] = []
+    current: List[Tuple[int, int, int]] = []
+    current_tokens = 0
+    for piece in pieces:
+        if current and current_tokens + piece[2] > max_tokens:
+            chunks.append(text[current[0][0]:current[-1][1]].strip())
+            keep: List[Tuple[int, int, int]] = []
+            kept = 0
+            for prev in reversed(current):
+                if kept + prev[2] > overlap_tokens or kept + prev[2] + piece[2] > max_tokens:
+                    break
+                keep.insert(0, prev)
+                kept += prev[2]
+            current, current_tokens = keep, kept
+        current.append(piece)
+        current_tokens += piece[2]
+
+    if current:
+        chunks.append(text[current[0][0]:current[-1][1]].strip())
+    return [c for c in chunks if c]
+
+
+# =====================
+# GENERACIÓN POR LOTES
+# =====================
+
+def _generate(chunks: List[str], max_length: int, mode: str, num_beams: int, batch_size: int) -> List[str]:
+    """Un único `generate` por lote de chunks (todos en uno si caben en batch_size)."""
+    prompts = [_PROMPT + chunk for chunk in chunks]
+    beams = num_beams if mode == "beam" else 1
+    device = _model.device
+    outputs: List[str] = []
+
+    for i in range(0, len(prompts), batch_size):
+        batch = _tokenizer(
+            prompts[i:i + batch_size],
+            padding=True,
+            truncation=True,
+            return_tensors="pt",
+        ).to(device)
+        with torch.inference_mode():
+            generated = _model.generate(
+                **batch,
+                max_length=max_length,
+                min_length=min(40, max_length),
                 do_sample=False,
-                num_beams=4,
-            )[0]['summary_text']
-            summaries.append(result)
+                num_beams=beams,
+                early_stopping=beams > 1,
+            )
+        outputs.extend(_tokenizer.batch_decode(generated, skip_special_tokens=True))
+    return [o.strip() for o in outputs]
+
+
+@timed("summarize")
+def summarize_cv(
+    raw_text: str,
+    max_length: int = 120,
+    chunk_tokens: int = 512,
+    overlap_tokens: int = 48,
+    mode: Optional[str] = None,
+    num_beams: Optional[int] = None,
+    batch_size: int = SUMMARIZER_BATCH_SIZE,
+    max_depth: int = 2,
+) -> str:
+    """
+    Resume un CV: chunks por tokens respetando frases (con solape) -> un `generate`
+    por lotes -> si la concatenación de resúmenes parciales no cabe en un chunk,
+    se vuelve a resumir (reducción jerárquica, hasta `max_depth` niveles).
+    mode: "beam" (calidad) | "greedy" (latencia).
+    """
+    initialize_summarizer()
+    mode = mode or SUMMARIZER_DECODING
+    num_beams = num_beams or SUMMARIZER_NUM_BEAMS
+
+    prompt_tokens = len(_tokenizer(_PROMPT, add_special_tokens=False)["input_ids"])
+    max_tokens = max(32, min(chunk_tokens, _tokenizer.model_max_length - prompt_tokens - 2))
+
+    text = raw_text
+    for depth in range(max_depth + 1):
+        chunks = split_into_token_chunks(text, _tokenizer, max_tokens, overlap_tokens)
+        if not chunks:
+            return ""
+        logger.debug("Resumiendo nivel %d: %d chunks", depth, len(chunks))
+        try:
+            summaries = _generate(chunks, max_length, mode, num_beams, batch_size)
         except Exception as e:
-            print(f"Error en chunk {i}: {e}")
-            summaries.append("Resumen no disponible")
-    
-    # Concatena y limpia
-    full_summary = " ".join(summaries)
-    return full_summary.strip()[:1200]  # Límite razonable para API
+            logger.exception("Error al generar resumen: %s", e)
+            return "Resumen no disponible"
+
+        text = " ".join(summaries).strip()
+        # Reducción jerárquica solo si los resúmenes parciales no caben en un chunk
+        if len(chunks) == 1 or len(_token_starts(text, _tokenizer)) <= max_tokens:
+            break
+
+    return text[:1200]  # Límite razonable para API
@@ -1,12 +1,14 @@
 import os
-import joblib
-import pandas as pd  
-import unicodedata
-from rapidfuzz import process
-from sklearn.preprocessing import MultiLabelBinarizer
-from typing import List, Dict, Any, Optional  
+import logging
+from typing import List, Dict, Any, Optional, Tuple
 from schemas.cv import CandidateData
 from utils.tags import etiquetas
+from utils.metrics import timed, timer
+from utils.normalize import fold
+from utils.model_registry import MODELS, load_joblib
+
+# pandas, sklearn, rapidfuzz y joblib se importan dentro de las funciones que los usan:
+# importar main no debe pagar ~1 s de librerías ni la carga del modelo
 
 # --- Rutas para la carga del modelo y features ---
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -18,56 +20,68 @@ EMPLOYABILITY_MODEL_PATH = os.path.join(
 )
 FEATURE_COLUMNS_PATH = os.path.join(TRAINED_MODELS_DIR, "empleabilidad_features.joblib")
 
-# --- Cargar el modelo real y las columnas de features ---
-employability_model: Optional[Any] = None
-expected_feature_columns: Optional[List[str]] = None
+logger = logging.getLogger(__name__)
 
-try:
-    if os.path.exists(EMPLOYABILITY_MODEL_PATH):
-        employability_model = joblib.load(EMPLOYABILITY_MODEL_PATH)
-        print(
-            f"Modelo de empleabilidad cargado exitosamente desde: {EMPLOYABILITY_MODEL_PATH}"
-        )
-    else:
-        print(
-            f"ADVERTENCIA: Archivo del modelo de empleabilidad no encontrado en: {EMPLOYABILITY_MODEL_PATH}. Se usará una simulación."
-        )
-except Exception as e:
-    print(
-        f"ERROR al cargar el modelo de empleabilidad desde {EMPLOYABILITY_MODEL_PATH}: {e}. Se usará una simulación."
-    )
-    employability_model = None
 
-try:
-    if os.path.exists(FEATURE_COLUMNS_PATH):
-        expected_feature_columns = joblib.load(FEATURE_COLUMNS_PATH)
-        print(
-            f"Columnas de features cargadas exitosamente desde: {FEATURE_COLUMNS_PATH} ({len(expected_feature_columns)} features)"
+# --- Cargar el modelo real y las columnas de features (vía MODELS, en el primer uso) ---
+def load_employability_model() -> Tuple[Optional[Any], Optional[List[str]]]:
+    # Las librerías de _transform_data_for_employability_model también: tras el
+    # calentamiento la primera predicción no paga sus imports
+    import pandas  # noqa: F401
+    import rapidfuzz  # noqa: F401
+    import sklearn.preprocessing  # noqa: F401
+
+    employability_model: Optional[Any] = None
+    expected_feature_columns: Optional[List[str]] = None
+
+    try:
+        if os.path.exists(EMPLOYABILITY_MODEL_PATH):
+            employability_model = load_joblib(EMPLOYABILITY_MODEL_PATH)
+            logger.info("Modelo de empleabilidad cargado exitosamente desde: %s", EMPLOYABILITY_MODEL_PATH)
+        else:
+            logger.warning(
+                "Archivo del modelo de empleabilidad no encontrado en: %s. Se usará una simulación.",
+                EMPLOYABILITY_MODEL_PATH,
+            )
+    except Exception as e:
+        logger.error(
+            "Error al cargar el modelo de empleabilidad desde %s: %s. Se usará una simulación.",
+            EMPLOYABILITY_MODEL_PATH, e,
         )
-    else:
-        print(
-            f"ADVERTENCIA: Archivo de columnas de features no encontrado en: {FEATURE_COLUMNS_PATH}. La predicción podría ser incorrecta sin la lista exacta de features."
+        employability_model = None
+
+    try:
+        if os.path.exists(FEATURE_COLUMNS_PATH):
+            expected_feature_columns = load_joblib(FEATURE_COLUMNS_PATH)
+            logger.info(
+                "Columnas de features cargadas exitosamente desde: %s (%d features)",
+                FEATURE_COLUMNS_PATH, len(expected_feature_columns),
+            )
+        else:
+            logger.warning(
+                "Archivo de columnas de features no encontrado en: %s. La predicción podría ser incorrecta sin la lista exacta de features.",
+                FEATURE_COLUMNS_PATH,
+            )
+    except Exception as e:
+        logger.error(
+            "Error al cargar las columnas de features desde %s: %s. La predicción podría ser incorrecta.",
+            FEATURE_COLUMNS_PATH, e,
         )
-except Exception as e:
-    print(
-        f"ERROR al cargar las columnas de features desde {FEATURE_COLUMNS_PATH}: {e}. La predicción podría ser incorrecta."
-    )
-    expected_feature_columns = None
+        expected_feature_columns = None
+
+    return employability_model, expected_feature_columns
 
 
 # --- REPLICACIÓN DE FUNCIONES DE PREPROCESAMIENTO DEL CUADERNO ---
 
-# Normalizador
-def normalizar(texto: str) -> str:
-    texto = texto.lower()
-    texto = (
-        unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode("utf-8")
-    )
-    return texto.strip()
+# Normalizador: minúsculas y sin tildes, como el del cuaderno (utils.normalize.fold)
+normalizar = fold
 
 
 # 1. Construir vocabulario único (adaptado para una sola cadena de entrada)
 def obtener_terminos_unicos_de_string(text_data: str) -> List[str]:
+    import pandas as pd
+
     vocab = set()
     if pd.isnull(text_data) or text_data.strip() == "":
         return []
@@ -76,9 +90,12 @@ def obtener_terminos_unicos_de_string(text_data: str) -> List[str]:
     return list(vocab)
 
 # 2. Precalcular matches (usamos el mismo del cuaderno)
+@timed("fuzzy_tags")
 def precalcular_diccionario(
     vocabulario: List[str], etiquetas_set: set, threshold: int = 70
 ) -> Dict[str, str]:
+    from rapidfuzz import process
+
     diccionario_match = {}
     for termino in vocabulario:
         result = process.extractOne(
@@ -93,6 +110,8 @@ def precalcular_diccionario(
 def estandarizar_entrada(
     texto: Optional[str], diccionario: Dict[str, str]
 ) -> List[str]:
+    import pandas as pd
+
     if pd.isnull(texto) or texto.strip() == "":
         return ["Desconocido"]  # Usamos "Desconocido" como en el cuaderno
     etiquetas_detectadas = set()
@@ -196,6 +215,11 @@ def _transform_data_for_employability_model(
         "Formación_candidato": formacion_candidato,
     }
 
+    import pandas as pd
+    from sklearn.preprocessing import MultiLabelBinarizer
+
+    _, expected_feature_columns = MODELS.get("employability")
+
     # Convertir a Series para aplicar lógica de pandas más fácil
     df_single = pd.Series(data_row).to_frame().T
 
@@ -334,8 +358,8 @@ def _transform_data_for_employability_model(
         model_input = final_df_processed[expected_feature_columns]
     else:
         # Si no se cargaron las columnas esperadas, hacemos un fallback simple (¡peligroso!)
-        print(
-            "ADVERTENCIA: No se pudieron cargar las columnas de features. Intentando usar las características generadas (la predicción podría ser incorrecta)."
+        logger.warning(
+            "No se pudieron cargar las columnas de features. Intentando usar las características generadas (la predicción podría ser incorrecta)."
         )
         model_input = final_df_processed
 
@@ -344,12 +368,25 @@ def _transform_data_for_employability_model(
 
 
 # --- Función predict_employability (sin cambios en la lógica de predicción si ya estaba bien) ---
-async def predict_employability(candidate_data: CandidateData) -> Dict[str, Any]:
+def _predict_score(employability_model: Any, model_features: List[float]) -> float:
+    if hasattr(employability_model, "predict_proba"):
+        return float(employability_model.predict_proba([model_features])[0][1])
+    if hasattr(employability_model, "predict"):
+        return float(employability_model.predict([model_features])[0])
+    raise ValueError(
+        "Modelo cargado no tiene métodos predict_proba o predict."
+    )
+
+
+def compute_employability(candidate_data: CandidateData) -> Dict[str, Any]:
     """
     Predice el score de empleabilidad y sugiere áreas de desarrollo.
+    Síncrona (CPU): se puede ejecutar en un pool de hilos/procesos.
     """
-    model_features = _transform_data_for_employability_model(candidate_data)
+    with timer("employability_features"):
+        model_features = _transform_data_for_employability_model(candidate_data)
 
+    employability_model, expected_feature_columns = MODELS.get("employability")
     score: float
 
     if (
@@ -358,27 +395,17 @@ async def predict_employability(candidate_data: CandidateData) -> Dict[str, Any]
         and len(model_features) == len(expected_feature_columns)
     ):
         try:
-            if hasattr(employability_model, "predict_proba"):
-                score = float(employability_model.predict_proba([model_features])[0][1])
-            elif hasattr(employability_model, "predict"):
-                score = float(employability_model.predict([model_features])[0])
-            else:
-                raise ValueError(
-                    "Modelo cargado no tiene métodos predict_proba o predict."
-                )
+            with timer("employability_inference"):
+                score = _predict_score(employability_model, model_features)
 
             score = max(0.0, min(1.0, score))
 
         except Exception as e:
-            print(
-                f"ERROR durante la predicción del modelo de empleabilidad: {e}. Usando simulación de score."
-            )
+            logger.error("Error durante la predicción del modelo de empleabilidad: %s. Usando simulación de score.", e)
             score = 0.5  # Fallback a un score neutral si falla
 
     else:
-        print(
-            "ADVERTENCIA: Modelo o features no disponibles/incorrectos. Usando simulación de score."
-        )
+        logger.warning("Modelo o features no disponibles/incorrectos. Usando simulación de score.")
         score = 0.5  # Fallback a un score neutral
 
     # --- Generación de áreas de desarrollo (puedes hacer esto más sofisticado) ---
@@ -421,3 +448,7 @@ async def predict_employability(candidate_data: CandidateData) -> Dict[str, Any]
         "employability_score": round(score, 2),
         "areas_for_development": areas_for_development,
     }
+
+
+async def predict_employability(candidate_data: CandidateData) -> Dict[str, Any]:
+    return compute_employability(candidate_data)
@@ -1,37 +1,161 @@
 # models/interview_prep.py
 
-from typing import List
+import hashlib
+import json
 import random
+from functools import lru_cache
+from pathlib import Path
+from string import Formatter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 from schemas.cv import ExperienceItem
+from models.recommendation_model import PUESTOS_CATALOG
+from utils.metrics import timed
 
+TEMPLATES_PATH = Path("data/interview_templates.json")
 
-async def generate_interview_questions(
+# Campos que puede usar cada plantilla
+_FIELDS = {"skill", "area", "puesto"}
+
+
+# ==================================
+# BANCO DE PLANTILLAS (se carga y compila una vez)
+# ==================================
+class QuestionTemplate:
+    """Plantilla pre-troceada en (literal, campo): renderizar es solo un join."""
+    __slots__ = ("parts",)
+
+    def __init__(self, text: str):
+        parts = []
+        for literal, field, _, _ in Formatter().parse(text):
+            if field is not None and field not in _FIELDS:
+                raise ValueError(f"Campo desconocido '{field}' en plantilla: {text}")
+            parts.append((literal, field))
+        self.parts: Tuple[Tuple[str, Optional[str]], ...] = tuple(parts)
+
+    def render(self, **values: str) -> str:
+        return "".join(literal + (values[field] if field else "") for literal, field in self.parts)
+
+
+def _compile(texts: Iterable[str]) -> List[QuestionTemplate]:
+    return [QuestionTemplate(t) for t in texts]
+
+
+with open(TEMPLATES_PATH, "r", encoding="utf-8") as f:
+    _bank = json.load(f)
+
+GENERAL_TEMPLATES = _compile(_bank["generales"])
+SKILL_TEMPLATES = _compile(_bank["habilidad"])
+AREA_TEMPLATES = _compile(_bank["area"])
+DEFAULT_AREA = _bank["area_por_defecto"]
+PUESTO_TEMPLATES = _compile(_bank["puesto"])
+TEMPLATES_BY_AREA = {area: _compile(t) for area, t in _bank["por_area"].items()}
+TEMPLATES_BY_CATEGORY = {cat: _compile(t) for cat, t in _bank["por_categoria"].items()}
+
+# Puesto recomendado -> categoría del catálogo
+PUESTO_CATEGORY = {p["puesto"]: p["categoria"] for p in PUESTOS_CATALOG}
+
+
+# ==================================
+# GENERACIÓN
+# ==================================
+def candidate_seed(
+    candidate_name: str,
+    skills: Sequence[str],
+    areas_for_development: Sequence[str],
+    job_recommendations: Sequence[str],
+) -> int:
+    """Semilla estable por perfil: mismas entradas (en cualquier orden) -> mismas preguntas."""
+    key = "\x1f".join([
+        candidate_name or "",
+        "\x1e".join(sorted(skills)),
+        "\x1e".join(sorted(areas_for_development)),
+        "\x1e".join(sorted(job_recommendations)),
+    ])
+    return int.from_bytes(hashlib.sha1(key.encode("utf-8")).digest()[:8], "big")
+
+
+@lru_cache(maxsize=4096)
+def _questions(
+    skills: Tuple[str, ...],
+    areas_for_development: Tuple[str, ...],
+    job_recommendations: Tuple[str, ...],
+    num_questions: int,
+    seed: int,
+) -> Tuple[str, ...]:
+    rng = random.Random(seed)
+
+    # Candidatas sin renderizar: (plantilla, valores)
+    pool: List[Tuple[QuestionTemplate, Dict[str, str]]] = []
+    if skills:
+        pool.append((rng.choice(SKILL_TEMPLATES), {"skill": rng.choice(skills)}))
+
+    area = rng.choice(areas_for_development) if areas_for_development else DEFAULT_AREA
+    area_templates = TEMPLATES_BY_AREA.get(area, []) + AREA_TEMPLATES
+    pool.append((rng.choice(area_templates), {"area": area}))
+
+    if job_recommendations:
+        puesto = rng.choice(job_recommendations)
+        puesto_templates = TEMPLATES_BY_CATEGORY.get(PUESTO_CATEGORY.get(puesto), []) + PUESTO_TEMPLATES
+        pool.append((rng.choice(puesto_templates), {"puesto": puesto}))
+
+    pool.extend((t, {}) for t in GENERAL_TEMPLATES)
+    rng.shuffle(pool)
+
+    # Solo se renderizan las seleccionadas
+    return tuple(template.render(**values) for template, values in pool[:num_questions])
+
+
+@timed("interview_questions")
+def build_interview_questions(
     candidate_name: str,
     skills: List[str],
     experience: List[ExperienceItem],
     areas_for_development: List[str],
     job_recommendations: List[str],
-    num_questions: int = 5
+    num_questions: int = 5,
+    seed: Optional[int] = None,
 ) -> List[str]:
+    """
+    Preguntas de entrevista a partir del banco de plantillas. Con seed=None la semilla
+    se deriva del perfil, así el resultado es reproducible (y se cachea).
+    """
+    # Ordenadas antes de la semilla y de cada rng.choice: recomendaciones y áreas pueden
+    # venir de un set, cuyo orden cambia entre procesos
+    skills, areas_for_development, job_recommendations = (
+        tuple(sorted(values)) for values in (skills, areas_for_development, job_recommendations)
+    )
+    if seed is None:
+        seed = candidate_seed(candidate_name, skills, areas_for_development, job_recommendations)
+    return list(_questions(skills, areas_for_development, job_recommendations, num_questions, seed))
 
-    prompt_parts = [
-        f"Genera {num_questions} preguntas de entrevista para el candidato {candidate_name}.",
-        f"Sus habilidades clave son: {', '.join(skills)}.",
-        f"Tiene experiencia en: {', '.join([exp.title for exp in experience]) if experience else 'ninguna reportada'}.",
-        f"Las áreas de desarrollo sugeridas son: {', '.join(areas_for_development) if areas_for_development else 'ninguna'}.",
-        f"Los roles recomendados incluyen: {', '.join(job_recommendations)}."
-    ]
-    prompt = " ".join(prompt_parts) + "\n\nLas preguntas deben ser relevantes para su perfil y los puestos sugeridos, y considerar sus posibles desafíos."
-    print(prompt)
-    # Simulación de preguntas
-    sample_questions = [
-        f"Háblame de un momento en que usaste tu habilidad de {random.choice(skills)}.",
-        f"¿Cómo manejas los desafíos en el trabajo, especialmente considerando un área como '{random.choice(areas_for_development) if areas_for_development else 'manejo del estrés'}'?",
-        f"¿Qué te atrae del rol de {random.choice(job_recommendations)} y cómo crees que tus habilidades se aplicarían?",
-        "¿Cuáles son tus objetivos profesionales a corto y largo plazo?",
-        "Háblanos de tu experiencia previa que creas que es más relevante para un nuevo rol.",
-        "¿Cómo manejas las situaciones de estrés o presión?",
-        "¿Qué planes tienes para seguir aprendiendo y desarrollándote profesionalmente?",
+
+def build_interview_questions_batch(profiles: Iterable[Dict], num_questions: int = 5) -> List[List[str]]:
+    """
+    Versión por lotes. Cada perfil es un dict con las claves de build_interview_questions
+    (candidate_name, skills, experience, areas_for_development, job_recommendations y seed opcional).
+    """
+    return [
+        build_interview_questions(
+            candidate_name=p.get("candidate_name", ""),
+            skills=p.get("skills", []),
+            experience=p.get("experience", []),
+            areas_for_development=p.get("areas_for_development", []),
+            job_recommendations=p.get("job_recommendations", []),
+            num_questions=num_questions,
+            seed=p.get("seed"),
+        )
+        for p in profiles
     ]
-    random.shuffle(sample_questions)
-    return sample_questions[:num_questions]
\ No newline at end of file
+
+
+async def generate_interview_questions(
+    candidate_name: str,
+    skills: List[str],
+    experience: List[ExperienceItem],
+    areas_for_development: List[str],
+    job_recommendations: List[str],
+    num_questions: int = 5
+) -> List[str]:
+    return build_interview_questions(
+        candidate_name, skills, experience, areas_for_development, job_recommendations, num_questions
+    )
@@ -0,0 +1,66 @@
+from sqlalchemy import Column, Integer, String, JSON, DateTime, Index
+from sqlalchemy.orm import declarative_base
+
+Base = declarative_base()
+
+class BulkMatchResult(Base):
+    """Resultado del cruce masivo ofertas x candidatos (último run)."""
+    __tablename__ = "bulk_match_results"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    run_id = Column(String, index=True)
+    direction = Column(String, index=True)  # "offer" -> top candidatos de la oferta | "candidate" -> top ofertas del candidato
+    offer_id = Column(String, index=True)
+    candidate_id = Column(String, index=True)
+    rank = Column(Integer)
+    score = Column(Integer)
+    reasons = Column(JSON)
+    created_at = Column(DateTime)
+
+
+class MatchResult(Base):
+    """
+    Tabla materializada de matching. Una fila por par con score > 0 y dirección:
+    "offer" -> reglas de /candidate-matcher | "candidate" -> reglas de /offer-matcher.
+    offer_fp / candidate_fp son las huellas de los campos que afectan al score. Los
+    endpoints solo leen la tabla si la huella de su lado coincide; las filas de las
+    ofertas / candidatos del otro lado que están en match_changes se descartan en la
+    misma consulta y esos pocos se puntúan en vivo.
+    """
+    __tablename__ = "match_results"
+    __table_args__ = (
+        Index("ix_match_results_offer", "direction", "offer_id", "score"),
+        Index("ix_match_results_candidate", "direction", "candidate_id", "score"),
+    )
+
+    direction = Column(String, primary_key=True)
+    offer_id = Column(String, primary_key=True)
+    candidate_id = Column(String, primary_key=True)
+    score = Column(Integer)
+    reasons = Column(JSON)
+    offer_fp = Column(String)
+    candidate_fp = Column(String)
+
+
+class MatchFingerprint(Base):
+    """Huella del último estado puntuado de cada oferta / candidato."""
+    __tablename__ = "match_fingerprints"
+
+    kind = Column(String, primary_key=True)  # "offer" | "candidate"
+    source_id = Column(String, primary_key=True)
+    fingerprint = Column(String)
+    updated_at = Column(DateTime)
+
+
+class MatchChange(Base):
+    """
+    Ofertas / candidatos dados de alta o con cambios en los campos que puntúan desde la
+    última pasada del worker. Lo escriben triggers de la DB sobre offers y candidates
+    (ensure_match_tables); version sube con cada cambio para que el worker solo borre
+    los que llegó a cargar.
+    """
+    __tablename__ = "match_changes"
+
+    kind = Column(String, primary_key=True)  # "offer" | "candidate"
+    source_id = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=1)
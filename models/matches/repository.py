@@ -0,0 +1,316 @@
+import datetime
+import logging
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Tuple
+from sqlalchemy import String, bindparam, cast, delete, insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.matches.model import Base, BulkMatchResult, MatchChange, MatchFingerprint, MatchResult
+from models.candidate.matcher import match_candidates_from_offer
+from models.candidate.model import Candidate
+from models.candidate.repository import get_candidates_for_matching
+from models.offers.matcher import match_offers
+from models.offers.model import Offer
+from schemas.cv import ExtractedCVData
+
+logger = logging.getLogger(__name__)
+
+PRECOMPUTED_MATCHES = True  # 👈 False para calcular siempre el matching en vivo
+
+# Lotes para IN (...) y executemany
+_BATCH = 1000
+
+
+def _batches(items: List, size: int = _BATCH):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+async def ensure_match_tables(db: AsyncSession) -> None:
+    conn = await db.connection()
+    await conn.run_sync(Base.metadata.create_all)
+    for statement in _change_triggers(conn.dialect.name):
+        await conn.exec_driver_sql(statement)
+
+
+async def replace_bulk_matches(db: AsyncSession, rows: List[Dict]) -> int:
+    """Sustituye el contenido de bulk_match_results por el último run."""
+    await ensure_match_tables(db)
+
+    await db.execute(delete(BulkMatchResult))
+    if rows:
+        await db.execute(insert(BulkMatchResult), rows)
+    await db.commit()
+    return len(rows)
+
+
+# ==================================
+# TABLA MATERIALIZADA: CAMBIOS (triggers sobre offers y candidates)
+# ==================================
+# (kind, tabla, campos vigilados): los que puntúan y, en ofertas, los que la publican
+_WATCHED = (
+    ("candidate", "candidates", ("experience", "skills")),
+    ("offer", "offers", ("puesto", "descripcion", "categoria", "activo", "fechaInicio", "fechaFin")),
+)
+
+_UPSERT_CHANGE = (
+    "INSERT INTO match_changes (kind, source_id, version) VALUES ({kind}, CAST(NEW.id AS TEXT), 1) "
+    "ON CONFLICT (kind, source_id) DO UPDATE SET version = match_changes.version + 1"
+)
+
+
+def _change_triggers(dialect: str) -> List[str]:
+    """DDL idempotente de los triggers que anotan altas y cambios en match_changes."""
+    statements = []
+    if dialect == "postgresql":
+        statements.append(
+            "CREATE OR REPLACE FUNCTION match_changes_mark() RETURNS trigger AS $$ BEGIN "
+            + _UPSERT_CHANGE.format(kind="TG_ARGV[0]")
+            + "; RETURN NULL; END $$ LANGUAGE plpgsql"
+        )
+    for kind, table, columns in _WATCHED:
+        quoted = ", ".join(f'"{c}"' for c in columns)
+        if dialect == "postgresql":
+            changed = " OR ".join(
+                f'CAST(OLD."{c}" AS TEXT) IS DISTINCT FROM CAST(NEW."{c}" AS TEXT)' for c in columns
+            )
+            for name, event in (("insert", "INSERT"), ("update", f"UPDATE OF {quoted}")):
+                when = f" WHEN ({changed})" if name == "update" else ""
+                statements.append(
+                    f"DO $$ BEGIN IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = "
+                    f"'match_changes_{table}_{name}') THEN CREATE TRIGGER match_changes_{table}_{name} "
+                    f"AFTER {event} ON {table} FOR EACH ROW{when} "
+                    f"EXECUTE PROCEDURE match_changes_mark('{kind}'); END IF; END $$"
+                )
+        elif dialect == "sqlite":
+            changed = " OR ".join(f'OLD."{c}" IS NOT NEW."{c}"' for c in columns)
+            upsert = _UPSERT_CHANGE.format(kind=f"'{kind}'")
+            statements.append(
+                f"CREATE TRIGGER IF NOT EXISTS match_changes_{table}_insert AFTER INSERT ON {table} "
+                f"BEGIN {upsert}; END"
+            )
+            statements.append(
+                f"CREATE TRIGGER IF NOT EXISTS match_changes_{table}_update AFTER UPDATE OF {quoted} "
+                f"ON {table} WHEN {changed} BEGIN {upsert}; END"
+            )
+        else:
+            raise NotImplementedError(f"match_changes: triggers no disponibles para {dialect}")
+    return statements
+
+
+def _active_offers(today: date) -> Tuple:
+    return Offer.activo.is_(True), Offer.fechaInicio <= today, Offer.fechaFin >= today
+
+
+def _changed(kind: str):
+    """Subconsulta con los ids de match_changes de un lado."""
+    return select(MatchChange.source_id).where(MatchChange.kind == kind)
+
+
+async def get_changes(db: AsyncSession) -> Dict[Tuple[str, str], int]:
+    """(kind, source_id) -> version de lo cambiado desde la última pasada."""
+    result = await db.execute(select(MatchChange.kind, MatchChange.source_id, MatchChange.version))
+    return {(r.kind, r.source_id): r.version for r in result.all()}
+
+
+# ==================================
+# TABLA MATERIALIZADA: ESCRITURA (worker)
+# ==================================
+async def get_fingerprints(db: AsyncSession) -> Dict[Tuple[str, str], str]:
+    result = await db.execute(
+        select(MatchFingerprint.kind, MatchFingerprint.source_id, MatchFingerprint.fingerprint)
+    )
+    return {(r.kind, r.source_id): r.fingerprint for r in result.all()}
+
+
+async def apply_match_updates(
+    db: AsyncSession,
+    stale_offer_ids: Iterable[str],
+    stale_candidate_ids: Iterable[str],
+    rows: List[Dict],
+    fingerprints: Dict[Tuple[str, str], str],
+    removed: Iterable[Tuple[str, str]] = (),
+    changes: Dict[Tuple[str, str], int] | None = None,
+) -> None:
+    """
+    Invalida (borra) las filas de las ofertas/candidatos cambiados, inserta las
+    nuevas puntuaciones, actualiza las huellas y quita de match_changes lo leído al
+    empezar la pasada (solo si no ha vuelto a cambiar). Todo en una transacción.
+    """
+    stale_offer_ids = list(stale_offer_ids)
+    stale_candidate_ids = list(stale_candidate_ids)
+
+    for ids in _batches(stale_offer_ids):
+        await db.execute(delete(MatchResult).where(MatchResult.offer_id.in_(ids)))
+    for ids in _batches(stale_candidate_ids):
+        await db.execute(delete(MatchResult).where(MatchResult.candidate_id.in_(ids)))
+
+    for batch in _batches(rows):
+        await db.execute(insert(MatchResult), batch)
+
+    for kind, source_id in removed:
+        await db.execute(
+            delete(MatchFingerprint).where(
+                MatchFingerprint.kind == kind, MatchFingerprint.source_id == source_id
+            )
+        )
+
+    keys = list(fingerprints)
+    for batch in _batches(keys):
+        for kind in ("offer", "candidate"):
+            ids = [source_id for k, source_id in batch if k == kind]
+            if ids:
+                await db.execute(
+                    delete(MatchFingerprint).where(
+                        MatchFingerprint.kind == kind, MatchFingerprint.source_id.in_(ids)
+                    )
+                )
+        now = datetime.datetime.now()
+        await db.execute(insert(MatchFingerprint), [
+            {"kind": kind, "source_id": source_id, "fingerprint": fingerprints[(kind, source_id)], "updated_at": now}
+            for kind, source_id in batch
+        ])
+
+    table = MatchChange.__table__
+    consumed = table.delete().where(
+        table.c.kind == bindparam("k"), table.c.source_id == bindparam("s"), table.c.version == bindparam("v")
+    )
+    for batch in _batches(list((changes or {}).items())):
+        await db.execute(consumed, [{"k": kind, "s": source_id, "v": version} for (kind, source_id), version in batch])
+
+    await db.commit()
+
+
+# ==================================
+# TABLA MATERIALIZADA: LECTURA (endpoints)
+# ==================================
+def _by_id(db: AsyncSession, column):
+    """Desempate por id en orden de código, el de sorted() en Python (Postgres ordena según el locale)."""
+    return column.collate("C") if db.get_bind().dialect.name == "postgresql" else column
+
+
+async def get_top_candidates_for_offer(
+    db: AsyncSession, offer: Dict, offer_fp: str, limit: int = 10
+) -> List[Dict]:
+    """
+    Mismo formato y orden que match_candidates_from_offer. Un único ORDER BY score LIMIT k
+    sobre las filas de la oferta que descarta a los candidatos de match_changes (nuevos o
+    cambiados desde la última pasada); esos pocos se puntúan en vivo y se mezclan.
+    Vacía si la oferta no está puntuada con esta huella.
+    """
+    stmt = (
+        select(
+            MatchResult.candidate_id,
+            MatchResult.score,
+            MatchResult.reasons,
+            Candidate.name,
+            Candidate.email,
+            Candidate.phone,
+            Candidate.experience,
+        )
+        .join(Candidate, Candidate.id == MatchResult.candidate_id)
+        .where(
+            MatchResult.direction == "offer",
+            MatchResult.offer_id == str(offer["id"]),
+            MatchResult.offer_fp == offer_fp,
+            MatchResult.candidate_id.not_in(_changed("candidate")),
+        )
+        .order_by(MatchResult.score.desc(), _by_id(db, MatchResult.candidate_id))
+        .limit(limit)
+    )
+    result = await db.execute(stmt)
+    matches = [
+        {
+            "id": r.candidate_id,
+            "name": r.name,
+            "email": r.email,
+            "phone": r.phone,
+            "current_position": r.experience[0]["title"] if r.experience else None,
+            "match_percentage": r.score,
+            "reasons": r.reasons,
+        }
+        for r in result.all()
+    ]
+    if not matches:
+        return []
+
+    changed = await get_candidates_for_matching(db, _changed("candidate"))
+    fresh = match_candidates_from_offer(offer, changed, limit)
+    return _merge(matches, fresh, lambda m: (-m["match_percentage"], m["id"]), limit)
+
+
+async def get_top_offers_for_candidate(
+    db: AsyncSession,
+    candidate_data: ExtractedCVData,
+    recommended_positions: List[str],
+    candidate_id: str,
+    candidate_fp: str,
+    limit: int | None = None,
+) -> List[Dict]:
+    """
+    Mismo formato y orden que match_offers; solo ofertas que siguen activas hoy. Las de
+    match_changes se puntúan en vivo (con las reglas de match_offers) y se mezclan.
+    """
+    stmt = (
+        select(
+            MatchResult.offer_id,
+            MatchResult.score,
+            MatchResult.reasons,
+            Offer.id,
+            Offer.puesto,
+            Offer.empresa,
+        )
+        .join(Offer, cast(Offer.id, String) == MatchResult.offer_id)
+        .where(
+            MatchResult.direction == "candidate",
+            MatchResult.candidate_id == str(candidate_id),
+            MatchResult.candidate_fp == candidate_fp,
+            MatchResult.offer_id.not_in(_changed("offer")),
+            *_active_offers(date.today()),
+        )
+        .order_by(MatchResult.score.desc(), Offer.id)
+    )
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    result = await db.execute(stmt)
+    matches = [
+        {
+            "offer_id": r.id,
+            "puesto": r.puesto,
+            "empresa": r.empresa,
+            "score": r.score,
+            "reasons": r.reasons,
+        }
+        for r in result.all()
+    ]
+    if not matches:
+        return []
+
+    changed = await db.execute(
+        select(Offer).where(cast(Offer.id, String).in_(_changed("offer")), *_active_offers(date.today()))
+    )
+    fresh = await match_offers(candidate_data, recommended_positions, offers=changed.scalars().all())
+    return _merge(matches, fresh, lambda m: (-m["score"], m["offer_id"]), limit)
+
+
+def _merge(matches: List[Dict], fresh: List[Dict], key: Callable, limit: int | None) -> List[Dict]:
+    """Filas leídas + puntuadas en vivo, en el orden de los matchers (score desc, id)."""
+    if not fresh:
+        return matches
+    merged = sorted(matches + fresh, key=key)
+    return merged if limit is None else merged[:limit]
+
+
+async def read_precomputed(db: AsyncSession, reader: Callable, *args) -> List[Dict]:
+    """
+    Ejecuta una lectura de match_results. Lista vacía (-> matching en vivo) si está
+    desactivado, si no hay filas vigentes o si la tabla aún no existe.
+    """
+    if not PRECOMPUTED_MATCHES:
+        return []
+    try:
+        return await reader(db, *args)
+    except SQLAlchemyError as e:
+        logger.warning("match_results no disponible, se calcula en vivo: %s", e)
+        await db.rollback()
+        return []
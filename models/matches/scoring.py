@@ -0,0 +1,343 @@
+"""
+Scoring vectorizado ofertas x candidatos.
+
+Replica exactamente las reglas de `match_candidates_from_offer` (/candidate-matcher)
+y de `match_offers` (/offer-matcher), pero evaluadas como matrices booleanas
+(n_ofertas x n_candidatos) en lugar de bucles Python por par.
+
+Truco principal: los textos y conjuntos de los candidatos se deduplican
+(muchos candidatos comparten "limpiador", "mozo de almacen"...), los predicados
+se evalúan una vez por valor único y se expanden con el índice inverso.
+"""
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from utils.normalize import normalize, normalize_many
+from models.candidate.table import CandidateTable
+from models.recommendation_model import DEFAULT_POSITION, positions_for_title
+from utils.metrics import timed
+
+# =====================
+# MOTIVOS (un bit por regla)
+# =====================
+
+# /candidate-matcher: match_candidates_from_offer
+CANDIDATE_RULES = [
+    (40, "Experiencia directa en el puesto"),
+    (25, "Experiencia relacionada"),
+    (25, "Habilidades relevantes"),
+    (10, "Categoría compatible"),
+]
+
+# /offer-matcher: match_offers
+OFFER_RULES = [
+    (40, "Puesto recomendado para el candidato"),
+    (30, "Experiencia previa relacionada"),
+    (20, "Habilidades coincidentes"),
+    (10, "Categoría compatible"),
+]
+
+
+def _score_table(rules) -> np.ndarray:
+    return np.array(
+        [min(sum(w for bit, (w, _) in enumerate(rules) if flags >> bit & 1), 100)
+         for flags in range(1 << len(rules))],
+        dtype=np.int16,
+    )
+
+
+CANDIDATE_SCORE_TABLE = _score_table(CANDIDATE_RULES)
+OFFER_SCORE_TABLE = _score_table(OFFER_RULES)
+
+
+def decode_reasons(flags: int, rules) -> List[str]:
+    return [reason for bit, (_, reason) in enumerate(rules) if flags >> bit & 1]
+
+
+# =====================
+# HUELLAS (invalidación de la tabla materializada)
+# =====================
+
+def _fingerprint(payload) -> str:
+    raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def offer_fingerprint(offer: Dict) -> str:
+    """Solo puesto/descripcion/categoria influyen en el score de una oferta."""
+    return _fingerprint([offer.get("puesto") or "", offer.get("descripcion") or "", offer.get("categoria") or ""])
+
+
+def candidate_fingerprint(
+    experience: Iterable[Tuple[Optional[str], int]], skills: Iterable[str]
+) -> str:
+    """Solo la experiencia (título, años) y las skills influyen en el score de un candidato."""
+    return _fingerprint([[[t, y] for t, y in experience], list(skills)])
+
+
+# =====================
+# MATRIZ DE CANDIDATOS
+# =====================
+
+@dataclass
+class SetIncidence:
+    """Incidencia dispersa (CSR) grupo único -> términos del vocabulario."""
+    vocab: List[str]
+    indptr: np.ndarray
+    indices: np.ndarray
+    inverse: np.ndarray  # candidato -> grupo único
+
+
+@dataclass
+class CandidateMatrix:
+    ids: List[str]
+    # Reglas de /candidate-matcher
+    exp_titles: np.ndarray        # textos únicos de títulos normalizados
+    exp_titles_inv: np.ndarray    # candidato -> índice en exp_titles
+    skill_tokens: SetIncidence
+    # Reglas de /offer-matcher
+    exp_text: np.ndarray
+    exp_text_inv: np.ndarray
+    skills: SetIncidence
+    recommended: SetIncidence
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def _dedupe_strings(values: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    uniques: Dict[str, int] = {}
+    inverse = np.fromiter(
+        (uniques.setdefault(v, len(uniques)) for v in values),
+        dtype=np.int32,
+        count=len(values),
+    )
+    return np.array(list(uniques) or [""], dtype=str), inverse
+
+
+def _dedupe_sets(sets: List[Sequence[str]]) -> SetIncidence:
+    vocab: Dict[str, int] = {}
+    groups: Dict[Tuple[int, ...], int] = {}
+    indptr = [0]
+    indices: List[int] = []
+    inverse = np.empty(len(sets), dtype=np.int32)
+
+    for i, items in enumerate(sets):
+        key = tuple(sorted({vocab.setdefault(t, len(vocab)) for t in items}))
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = len(groups)
+            indices.extend(key)
+            indptr.append(len(indices))
+        inverse[i] = group
+
+    return SetIncidence(
+        vocab=list(vocab),
+        indptr=np.array(indptr, dtype=np.int64),
+        indices=np.array(indices, dtype=np.int64),
+        inverse=inverse,
+    )
+
+
+@timed("build_candidate_matrix")
+def build_candidate_matrix(candidates: Union[CandidateTable, List[Dict]]) -> CandidateMatrix:
+    """
+    Precalcula (una sola vez) todo lo que las reglas necesitan de cada candidato.
+    Sobre la tabla columnar cada valor se calcula por combinación única de títulos o
+    de skills y se expande a los candidatos con los índices inversos.
+    """
+    table = candidates if isinstance(candidates, CandidateTable) else CandidateTable.from_dicts(candidates)
+    norm_titles = table.normalized_titles()
+    norm_skills = table.normalized_skills()
+
+    # --- Por combinación de títulos ---
+    title_groups, title_inv = table.title_groups()
+    exp_titles, exp_text = [], []
+    for title_ids in title_groups:
+        exp_titles.append(" ".join(norm_titles[t] if t >= 0 else "" for t in title_ids))
+        exp_text.append(normalize(" ".join(norm_titles[t] for t in title_ids if t >= 0 and table.titles[t])))
+
+    # --- Por combinación de skills ---
+    skill_groups, skill_inv = table.skill_groups()
+    skill_tokens, skills = [], []
+    for skill_ids in skill_groups:
+        present = [s for s in skill_ids if s >= 0]
+        skill_tokens.append(" ".join(norm_skills[s] for s in present).split())
+        skills.append([norm_skills[s] for s in present if table.skill_vocab[s]])
+
+    # --- recommend_positions: unión de los puestos de cada título con años > 0 ---
+    experience_groups, experience_inv = table.experience_groups()
+    title_positions: Dict[int, List[str]] = {}
+    recommended = []
+    for pairs in experience_groups:
+        positions = set()
+        for t, positive in pairs:
+            if positive and t >= 0 and table.titles[t]:
+                if t not in title_positions:
+                    title_positions[t] = normalize_many(positions_for_title(table.titles[t]))
+                positions.update(title_positions[t])
+        recommended.append(positions or [normalize(DEFAULT_POSITION)])
+
+    exp_titles_u, exp_titles_inv = _dedupe_strings(exp_titles)
+    exp_text_u, exp_text_inv = _dedupe_strings(exp_text)
+
+    return CandidateMatrix(
+        ids=list(table.ids),
+        exp_titles=exp_titles_u,
+        exp_titles_inv=exp_titles_inv[title_inv],
+        skill_tokens=_expand(_dedupe_sets(skill_tokens), skill_inv),
+        exp_text=exp_text_u,
+        exp_text_inv=exp_text_inv[title_inv],
+        skills=_expand(_dedupe_sets(skills), skill_inv),
+        recommended=_expand(_dedupe_sets(recommended), experience_inv),
+    )
+
+
+def _expand(incidence: SetIncidence, group_inv: np.ndarray) -> SetIncidence:
+    """Índice inverso por grupo -> por candidato."""
+    incidence.inverse = incidence.inverse[group_inv]
+    return incidence
+
+
+# =====================
+# PREDICADOS VECTORIZADOS
+# =====================
+
+class _ContainsCache:
+    """`needle in text` para todos los textos únicos, memoizado por needle."""
+
+    def __init__(self, texts: np.ndarray):
+        self.texts = texts
+        self._cache: Dict[str, np.ndarray] = {}
+
+    def __call__(self, needle: str) -> np.ndarray:
+        hit = self._cache.get(needle)
+        if hit is None:
+            hit = self._cache[needle] = np.char.find(self.texts, needle) >= 0
+        return hit
+
+    def any_of(self, needles: List[str]) -> np.ndarray:
+        out = np.zeros(len(self.texts), dtype=bool)
+        for needle in needles:
+            out |= self(needle)
+        return out
+
+
+def _any_in_groups(vocab_hits: np.ndarray, incidence: SetIncidence) -> np.ndarray:
+    """(n_ofertas x vocab) -> (n_ofertas x grupos): algún término del grupo cumple."""
+    hits = vocab_hits[:, incidence.indices]
+    cum = np.zeros((hits.shape[0], hits.shape[1] + 1), dtype=np.int32)
+    np.cumsum(hits, axis=1, out=cum[:, 1:])
+    return (cum[:, incidence.indptr[1:]] - cum[:, incidence.indptr[:-1]]) > 0
+
+
+def _vocab_in_text(vocab: List[str], texts: List[Optional[str]]) -> np.ndarray:
+    """(n_ofertas x vocab): término contenido en el texto de la oferta (None -> False)."""
+    out = np.zeros((len(texts), len(vocab)), dtype=bool)
+    for row, text in enumerate(texts):
+        if text is not None:
+            out[row] = [term in text for term in vocab]
+    return out
+
+
+@timed("score_offers_chunk")
+def score_offers_chunk(
+    offers: List[Dict], matrix: CandidateMatrix
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Devuelve dos matrices de flags (n_ofertas x n_candidatos, uint8):
+    reglas de /candidate-matcher y reglas de /offer-matcher.
+    Los scores se obtienen con CANDIDATE_SCORE_TABLE[flags] / OFFER_SCORE_TABLE[flags].
+    """
+    n_offers = len(offers)
+    titles = _ContainsCache(matrix.exp_titles)
+    text = _ContainsCache(matrix.exp_text)
+
+    cm = np.zeros((4, n_offers, len(matrix.exp_titles)), dtype=bool)
+    om = np.zeros((4, n_offers, len(matrix.exp_text)), dtype=bool)
+    cm_desc: List[Optional[str]] = []
+    om_desc: List[Optional[str]] = []
+    om_puesto = np.zeros((n_offers, len(matrix.recommended.vocab)), dtype=bool)
+    recommended_index = {p: i for i, p in enumerate(matrix.recommended.vocab)}
+
+    for row, offer in enumerate(offers):
+        puesto = normalize(offer["puesto"])
+        descripcion = offer.get("descripcion")
+        categoria = offer.get("categoria")
+        desc = normalize(descripcion or "")
+        cat = normalize(categoria or "")
+
+        # /candidate-matcher
+        cm[0, row] = titles(puesto)
+        if desc:
+            cm[1, row] = titles.any_of(desc.split())
+        if cat:
+            cm[3, row] = titles(cat)
+        cm_desc.append(desc if desc else None)
+
+        # /offer-matcher
+        if puesto in recommended_index:
+            om_puesto[row, recommended_index[puesto]] = True
+        om[1, row] = text.any_of(puesto.split())
+        if categoria:
+            om[3, row] = text.any_of(cat.split())
+        om_desc.append(desc if descripcion else None)
+
+    cm_skills = _any_in_groups(_vocab_in_text(matrix.skill_tokens.vocab, cm_desc), matrix.skill_tokens)
+    om_skills = _any_in_groups(_vocab_in_text(matrix.skills.vocab, om_desc), matrix.skills)
+    om_recommended = _any_in_groups(om_puesto, matrix.recommended)
+
+    inv_t = matrix.exp_titles_inv
+    candidate_flags = (
+        cm[0][:, inv_t].astype(np.uint8)
+        | cm[1][:, inv_t] << 1
+        | cm_skills[:, matrix.skill_tokens.inverse] << 2
+        | cm[3][:, inv_t] << 3
+    ).astype(np.uint8)
+
+    inv_x = matrix.exp_text_inv
+    offer_flags = (
+        om_recommended[:, matrix.recommended.inverse].astype(np.uint8)
+        | om[1][:, inv_x] << 1
+        | om_skills[:, matrix.skills.inverse] << 2
+        | om[3][:, inv_x] << 3
+    ).astype(np.uint8)
+
+    return candidate_flags, offer_flags
+
+
+# =====================
+# TOP-K
+# =====================
+
+def top_k(
+    scores: np.ndarray, positions: np.ndarray, k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Top-k por fila ordenado por score desc y, en empate, por menor `positions`
+    (el mismo orden que el sort estable de los matchers).
+    Devuelve (columnas elegidas, scores); las columnas con score 0 quedan en -1.
+    """
+    rows, n = scores.shape
+    if rows == 0 or n == 0 or k <= 0:
+        return np.full((rows, 0), -1, dtype=np.int64), np.zeros((rows, 0), dtype=np.int16)
+
+    positions = np.broadcast_to(positions, scores.shape)
+    span = int(positions.max()) + 1
+    key = scores.astype(np.int64) * span + (span - 1 - positions)
+
+    k = min(k, n)
+    if k < n:
+        cols = np.argpartition(-key, k - 1, axis=1)[:, :k]
+    else:
+        cols = np.broadcast_to(np.arange(n), (rows, n)).copy()
+    order = np.argsort(-np.take_along_axis(key, cols, axis=1), axis=1)
+    cols = np.take_along_axis(cols, order, axis=1)
+
+    top_scores = np.take_along_axis(scores, cols, axis=1)
+    cols = np.where(top_scores > 0, cols, -1)
+    return cols, top_scores
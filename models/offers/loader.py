@@ -1,20 +1,29 @@
 import json
+import logging
 from pathlib import Path
 from typing import List
 from sqlalchemy.ext.asyncio import AsyncSession
 from models.offers.repository import get_active_offers
+from utils.metrics import timed
 
 OFFERS_SOURCE = "db"  # 👈 cambiar aqui si queremos usar la "db" o queremos usar el "json" que esta en el reposotirio /data/ofertas_activas.json
 OFFERS_PATH = Path("data/ofertas_activas.json")
 
-print(f'seleccionada {OFFERS_SOURCE}')
+logger = logging.getLogger(__name__)
+logger.info("Fuente de ofertas seleccionada: %s", OFFERS_SOURCE)
 
+@timed("load_offers")
 async def load_offers(db: AsyncSession | None = None) -> List:
     if OFFERS_SOURCE == "db":
         if db is None:
             raise ValueError("DB session requerida cuando OFFERS_SOURCE='db'")
         
         offers = await get_active_offers(db)
-        print(f"[load_offers] Ofertas traídas de DB: {len(offers)}")
-        print(f"[load_offers] Primera oferta: {offers[0] if offers else 'NINGUNA'}")
+        logger.debug("load_offers: %d ofertas traídas de DB", len(offers))
         return offers
+
+    if OFFERS_SOURCE == "json":
+        with open(OFFERS_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    raise ValueError(f"OFFERS_SOURCE inválido: {OFFERS_SOURCE}")
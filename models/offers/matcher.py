@@ -1,81 +1,142 @@
-from typing import List, Dict
-from utils.auxiliar import normalize
+import logging
+import os
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+from utils.normalize import normalize, normalize_many
 from schemas.cv import ExtractedCVData
 # from models.offers.repository import get_active_offers
 from sqlalchemy.ext.asyncio import AsyncSession
 from models.offers.loader import load_offers
+from utils.metrics import timed
+
+logger = logging.getLogger(__name__)
+
+OFFER_TEXT_CACHE_SIZE = int(os.getenv("OFFER_TEXT_CACHE_SIZE", "4096"))
 
 # =====================
 # HELPERS
 # =====================
 
-def text_contains_any(text: str, keywords: List[str]) -> bool:
-    text_norm = normalize(text)
-    return any(kw in text_norm for kw in keywords)
+# Descripciones normalizadas: las ofertas activas se repiten en cada petición y las
+# descripciones largas no entran en la LRU de utils.normalize
+_normalize_description = lru_cache(maxsize=OFFER_TEXT_CACHE_SIZE)(normalize)
 
 # =====================
-# MATCHER PRINCIPAL
+# QUERY DEL CANDIDATO
 # =====================
 
-async def match_offers(
-    candidate_data: ExtractedCVData,
-    recommended_positions: List[str],
-    db: AsyncSession | None = None
-) -> List[Dict]:
-
-    offers = await load_offers(db)
-    results = []
-
-    # Normalizar recomendaciones UNA sola vez
-    recommended_norm = [normalize(p) for p in recommended_positions]
-
-    exp_titles = [normalize(exp.title) for exp in candidate_data.experience if exp.title]
-    skills = [normalize(skill) for skill in candidate_data.skills if skill]
-    exp_text = " ".join(exp_titles)
-    print("OFFERSSSSSSSSSSS", offers)
-
-    for offer in offers:
-        is_dict = isinstance(offer, dict)
-
-        puesto      = offer["puesto"]      if is_dict else offer.puesto
-        categoria   = offer["categoria"]   if is_dict else offer.categoria
-        empresa     = offer["empresa"]     if is_dict else offer.empresa
-        descripcion = offer.get("descripcion") if is_dict else offer.descripcion
-        offer_id    = offer["id"]          if is_dict else offer.id
-
+class CandidateQuery:
+    """
+    Lado del candidato de /offer-matcher, calculado una vez por petición: puestos
+    recomendados (set), texto de experiencia y skills normalizados. Cada regla se
+    resuelve con una consulta a un dict por texto de oferta: puestos, categorías y
+    descripciones se repiten mucho entre ofertas y solo se evalúan la primera vez.
+    """
+
+    __slots__ = ("recommended", "exp_text", "skills", "_exp_hits", "_skill_hits")
+
+    def __init__(self, recommended_positions: Iterable[str], experience_titles: Iterable[str], skills: Iterable[str]):
+        self.recommended = frozenset(normalize_many(recommended_positions))
+        self.exp_text = " ".join(normalize_many(experience_titles))
+        # Una skill que contiene a otra sobra: si aparece ella, aparece la más corta
+        unique = sorted(set(normalize_many(skills)), key=len)
+        self.skills: Tuple[str, ...] = ()
+        for skill in unique:
+            if not any(short in skill for short in self.skills):
+                self.skills += (skill,)
+        self._exp_hits: Dict[str, bool] = {}
+        self._skill_hits: Dict[str, bool] = {}
+
+    @classmethod
+    def from_candidate(cls, candidate_data: ExtractedCVData, recommended_positions: List[str]) -> "CandidateQuery":
+        return cls(
+            recommended_positions,
+            (exp.title for exp in candidate_data.experience if exp.title),
+            (skill for skill in candidate_data.skills if skill),
+        )
+
+    def matches_experience(self, text_norm: str) -> bool:
+        """Alguna palabra del texto (puesto o categoría normalizados) aparece en la experiencia."""
+        hit = self._exp_hits.get(text_norm)
+        if hit is None:
+            hit = self._exp_hits[text_norm] = any(map(self.exp_text.__contains__, text_norm.split()))
+        return hit
+
+    def matches_skills(self, descripcion: str) -> bool:
+        """Alguna skill aparece en la descripción."""
+        hit = self._skill_hits.get(descripcion)
+        if hit is None:
+            desc_norm = _normalize_description(descripcion)
+            hit = self._skill_hits[descripcion] = any(map(desc_norm.__contains__, self.skills))
+        return hit
+
+    def score(self, puesto: str, categoria: Optional[str], descripcion: Optional[str]) -> Tuple[int, List[str]]:
         puesto_norm = normalize(puesto)  # 👈 normalizar el puesto de la BD
 
         score = 0
         reasons = []
 
         # 1. Puesto recomendado ✅ comparación normalizada
-        if puesto_norm in recommended_norm:
+        if puesto_norm in self.recommended:
             score += 40
             reasons.append("Puesto recomendado para el candidato")
 
         # 2. Experiencia relacionada
-        if text_contains_any(exp_text, puesto_norm.split()):
+        if self.matches_experience(puesto_norm):
             score += 30
             reasons.append("Experiencia previa relacionada")
 
         # 3. Skills en descripción
-        if descripcion and skills:
-            if text_contains_any(normalize(descripcion), skills):
-                score += 20
-                reasons.append("Habilidades coincidentes")
+        if descripcion and self.skills and self.matches_skills(descripcion):
+            score += 20
+            reasons.append("Habilidades coincidentes")
 
         # 4. Categoría compatible
-        if categoria and text_contains_any(exp_text, normalize(categoria).split()):
+        if categoria and self.matches_experience(normalize(categoria)):
             score += 10
             reasons.append("Categoría compatible")
 
+        return min(score, 100), reasons
+
+# =====================
+# MATCHER PRINCIPAL
+# =====================
+
+@timed("match_offers")
+async def match_offers(
+    candidate_data: ExtractedCVData,
+    recommended_positions: List[str],
+    db: AsyncSession | None = None,
+    offers: List | None = None,
+) -> List[Dict]:
+
+    # offers ya cargadas (jobs, benchmarks) evitan la consulta
+    if offers is None:
+        offers = await load_offers(db)
+    results = []
+
+    # Lado del candidato UNA sola vez por petición
+    query = CandidateQuery.from_candidate(candidate_data, recommended_positions)
+    logger.debug("match_offers: %d ofertas a evaluar", len(offers))
+
+    for offer in offers:
+        is_dict = isinstance(offer, dict)
+
+        puesto      = offer["puesto"]      if is_dict else offer.puesto
+        categoria   = offer["categoria"]   if is_dict else offer.categoria
+        empresa     = offer["empresa"]     if is_dict else offer.empresa
+        descripcion = offer.get("descripcion") if is_dict else offer.descripcion
+        offer_id    = offer["id"]          if is_dict else offer.id
+
+        score, reasons = query.score(puesto, categoria, descripcion)
         if score > 0:
             results.append({
                 "offer_id": offer_id,
                 "puesto": puesto,
                 "empresa": empresa,
-                "score": min(score, 100),
+                "score": score,
                 "reasons": reasons
             })
 
-    return sorted(results, key=lambda x: x["score"], reverse=True)
\ No newline at end of file
+    # En empate, por id: el mismo orden que la lectura de match_results
+    return sorted(results, key=lambda x: (-x["score"], x["offer_id"]))
\ No newline at end of file
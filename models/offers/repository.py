@@ -1,11 +1,13 @@
+import logging
 from sqlalchemy import select
 from datetime import date
 from sqlalchemy.ext.asyncio import AsyncSession
 from models.offers.model import Offer
 
+logger = logging.getLogger(__name__)
+
 async def get_active_offers(db: AsyncSession):
     today = date.today()
-    print(f"[get_active_offers] Buscando ofertas activas para fecha: {today}")
 
     result = await db.execute(
         select(Offer).where(
@@ -16,5 +18,15 @@ async def get_active_offers(db: AsyncSession):
     )
 
     offers = result.scalars().all()
-    print(f"[get_active_offers] Total encontradas: {len(offers)}")
-    return offers
\ No newline at end of file
+    logger.debug("get_active_offers: %d ofertas activas a fecha %s", len(offers), today)
+    return offers
+
+async def get_open_offers(db: AsyncSession):
+    """Activas hoy o que empiezan más adelante: el worker las puntúa antes de que se publiquen."""
+    result = await db.execute(
+        select(Offer).where(
+            Offer.activo.is_(True),
+            Offer.fechaFin >= date.today()
+        )
+    )
+    return result.scalars().all()
@@ -1,9 +1,10 @@
 
-from typing import List
+from typing import Iterable, List, Optional, Tuple
 from schemas.cv import ExtractedCVData
 import json
 from pathlib import Path
-from utils.auxiliar import normalize
+from utils.normalize import normalize
+from utils.metrics import timed
 
 CATALOG_PATH = Path("data/puestos_keywords.json")
 
@@ -20,27 +21,36 @@ def experience_matches_puesto(
     matches = sum(1 for kw in puesto_keywords if kw in title_norm)
     return matches >= min_matches
 
-async def recommend_jobs(processed_cv_data: ExtractedCVData) -> list[str]:
-    experience_items = processed_cv_data.experience or []
+DEFAULT_POSITION = "Puestos operativos generales"
+
+
+def positions_for_title(title: str) -> List[str]:
+    """Puestos del catálogo compatibles con un título (sin el puesto por defecto)."""
+    title_word_count = len(normalize(title).split())
+    min_matches = 1 if title_word_count <= 2 else 2
+    return [
+        puesto["puesto"]
+        for puesto in PUESTOS_CATALOG
+        if experience_matches_puesto(title, puesto["keywords"], min_matches=min_matches)
+    ]
+
+
+@timed("recommend_positions")
+def recommend_positions(experience: Iterable[Tuple[Optional[str], int]]) -> list[str]:
+    """Versión síncrona de recommend_jobs sobre pares (título, años)."""
     recommendations = set()
 
-    for exp in experience_items:
-        if not exp.title or exp.years <= 0:
+    for title, years in experience:
+        if not title or years <= 0:
             continue
-        
-        title_word_count = len(normalize(exp.title).split())
-
-        for puesto in PUESTOS_CATALOG:
-            min_matches = 1 if title_word_count <= 2 else 2
-
-            if experience_matches_puesto(
-                exp.title,
-                puesto["keywords"],
-                min_matches=min_matches
-            ):
-                recommendations.add(puesto["puesto"])
+        recommendations.update(positions_for_title(title))
                 
     if not recommendations:
-        recommendations.add("Puestos operativos generales")
+        recommendations.add(DEFAULT_POSITION)
+
+    # Ordenado: el orden de un set cambia entre procesos (hash aleatorio)
+    return sorted(recommendations)
 
-    return list(recommendations)
+async def recommend_jobs(processed_cv_data: ExtractedCVData) -> list[str]:
+    experience_items = processed_cv_data.experience or []
+    return recommend_positions((exp.title, exp.years) for exp in experience_items)
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from typing import Optional
+
+# Estado de un trabajo asíncrono (extracción de CV / procesamiento de candidato)
+class JobStatus(BaseModel):
+    job_id: str
+    kind: str
+    status: str  # queued | running | done | failed
+    created_at: str
+    finished_at: Optional[str] = None
+    error: Optional[str] = None
+    status_url: str
+    result_url: str
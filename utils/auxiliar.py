@@ -101,14 +101,6 @@ def normalize_job_title(title: str) -> str:
             return standard_title.title() 
     return "Otro" 
 
-def normalize(text: str) -> str:
-    text = text.lower()
-    text = unicodedata.normalize("NFKD", text)
-    text = text.encode("ascii", "ignore").decode("utf-8")
-    text = re.sub(r"[^a-z\s]", "", text)
-    return text.strip()
-
-
 def categorize_education_level(text: str) -> str:
     text_lower = text.lower()
 
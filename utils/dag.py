@@ -0,0 +1,54 @@
+# utils/dag.py
+
+import asyncio
+import contextvars
+import time
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Etapa: (función síncrona, nombres de las etapas de las que depende).
+# La función recibe como kwargs los resultados de sus dependencias.
+Stage = Tuple[Callable[..., Any], List[str]]
+
+
+async def run_dag(
+    stages: Dict[str, Stage],
+    executor: Optional[Executor] = None,
+) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """
+    Ejecuta un pequeño DAG de etapas síncronas: las independientes corren a la vez en
+    `executor` (por defecto el pool de hilos del loop) y cada etapa espera solo a sus
+    entradas. Devuelve (resultados por etapa, duración en ms por etapa).
+    """
+    for name, (_, deps) in stages.items():
+        missing = [d for d in deps if d not in stages]
+        if missing:
+            raise ValueError(f"Etapa '{name}' depende de etapas inexistentes: {missing}")
+
+    loop = asyncio.get_running_loop()
+    tasks: Dict[str, asyncio.Task] = {}
+    timings: Dict[str, float] = {}
+
+    async def run_stage(name: str) -> Any:
+        func, deps = stages[name]
+        inputs = {dep: await tasks[dep] for dep in deps}
+        started = time.perf_counter()
+        try:
+            # El contexto (request_id, colector de métricas) viaja al hilo de la etapa
+            ctx = contextvars.copy_context()
+            return await loop.run_in_executor(executor, lambda: ctx.run(func, **inputs))
+        finally:
+            timings[name] = (time.perf_counter() - started) * 1000
+
+    # Todas las tareas existen antes de que ninguna espere a otra
+    for name in stages:
+        tasks[name] = asyncio.ensure_future(run_stage(name))
+
+    try:
+        results = await asyncio.gather(*tasks.values())
+    except Exception:
+        for task in tasks.values():
+            task.cancel()
+        raise
+
+    return dict(zip(tasks, results)), timings
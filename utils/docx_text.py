@@ -0,0 +1,119 @@
+# utils/docx_text.py
+"""
+Texto de un DOCX leído en streaming desde el zip, sin construir el DOM de python-docx.
+
+Se recorre cada parte XML con expat (sin crear elementos) y se recoge el texto de los
+runs (w:t, tabuladores y saltos) en orden de documento, incluidos:
+
+- párrafos del cuerpo (como python-docx: uno por línea),
+- tablas (un párrafo por celda, en orden de filas),
+- cuadros de texto (w:txbxContent; se ignora el mc:Fallback VML, que los duplica),
+- cabeceras al principio y pies al final (sin repetir los idénticos), donde muchas
+  plantillas de CV ponen los datos de contacto.
+
+    text = extract_docx_text("cv.docx")
+"""
+import posixpath
+import zipfile
+from typing import BinaryIO, List, Union
+from xml.parsers import expat
+
+_W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main "
+_MC = "http://schemas.openxmlformats.org/markup-compatibility/2006 "
+_REL = "http://schemas.openxmlformats.org/package/2006/relationships "
+_REL_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/"
+
+W_P, W_R, W_T = _W + "p", _W + "r", _W + "t"
+W_TAB, W_BR, W_CR, W_HYPHEN = _W + "tab", _W + "br", _W + "cr", _W + "noBreakHyphen"
+W_TXBX = _W + "txbxContent"
+MC_FALLBACK = _MC + "Fallback"
+
+_IN_RUN = {W_TAB: "\t", W_BR: "\n", W_CR: "\n", W_HYPHEN: "-"}
+
+MAIN_PART = "word/document.xml"
+
+
+def _part_text(stream) -> str:
+    parts: List[str] = []
+    state = {"text": False, "run": 0, "skip": 0}
+
+    def start(name, attrs):
+        if name == MC_FALLBACK:
+            state["skip"] += 1
+        elif state["skip"]:
+            return
+        elif name == W_T:
+            state["text"] = True
+        elif name == W_R:
+            state["run"] += 1
+        elif name == W_TXBX:
+            # El cuadro de texto va dentro de un run del párrafo que lo ancla: en su propia línea
+            if parts and not parts[-1].endswith("\n"):
+                parts.append("\n")
+        elif state["run"] and name in _IN_RUN:
+            # w:tab también define tabulaciones en w:pPr: solo cuenta dentro de un run
+            parts.append(_IN_RUN[name])
+
+    def end(name):
+        if name == MC_FALLBACK:
+            state["skip"] -= 1
+        elif state["skip"]:
+            return
+        elif name == W_T:
+            state["text"] = False
+        elif name == W_R:
+            state["run"] -= 1
+        elif name == W_P:
+            parts.append("\n")
+
+    def chars(data):
+        if state["text"] and not state["skip"]:
+            parts.append(data)
+
+    parser = expat.ParserCreate(namespace_separator=" ")
+    parser.buffer_text = True
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.CharacterDataHandler = chars
+    parser.ParseFile(stream)
+    return "".join(parts)
+
+
+def _relationships(zf: zipfile.ZipFile, rels_path: str, base_dir: str, kind: str) -> List[str]:
+    """Partes de un tipo de relación (officeDocument, header, footer), en el orden del .rels."""
+    try:
+        stream = zf.open(rels_path)
+    except KeyError:
+        return []
+    targets: List[str] = []
+
+    def start(name, attrs):
+        if name == _REL + "Relationship" and attrs.get("Type") == _REL_TYPE + kind:
+            target = attrs["Target"]
+            targets.append(target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join(base_dir, target)))
+
+    parser = expat.ParserCreate(namespace_separator=" ")
+    parser.StartElementHandler = start
+    with stream:
+        parser.ParseFile(stream)
+    names = set(zf.namelist())
+    return [t for t in targets if t in names]
+
+
+def extract_docx_text(source: Union[str, BinaryIO]) -> str:
+    """Texto de cabeceras, cuerpo (párrafos, tablas, cuadros de texto) y pies (ruta o binario)."""
+    with zipfile.ZipFile(source) as zf:
+        main = (_relationships(zf, "_rels/.rels", "", "officeDocument") or [MAIN_PART])[0]
+        base_dir, name = posixpath.split(main)
+        rels = posixpath.join(base_dir, "_rels", name + ".rels")
+        headers = _relationships(zf, rels, base_dir, "header")
+        footers = _relationships(zf, rels, base_dir, "footer")
+
+        sections: List[str] = []
+        for part in [*headers, main, *footers]:
+            with zf.open(part) as stream:
+                text = _part_text(stream)
+            # Cabecera por defecto, de primera página y de páginas pares suelen repetirse
+            if text.strip() and (part == main or text not in sections):
+                sections.append(text)
+        return "".join(sections)
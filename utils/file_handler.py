@@ -1,6 +1,9 @@
 # utils/file_handler.py
 
 import os
+import posixpath
+import zipfile
+from typing import BinaryIO, Iterable, List, NamedTuple, Optional, Tuple
 from fastapi import UploadFile
 
 # Directorio donde se guardarán los CVs temporalmente o para persistencia
@@ -8,9 +11,13 @@ UPLOAD_DIR = "uploaded_cvs"
 
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
-async def save_upload_file(upload_file: UploadFile) -> str:
+async def save_upload_file(upload_file: UploadFile, file_id: Optional[str] = None) -> str:
     """ Guarda el archivo subido en el disco y devuelve la ruta. """
-    file_location = os.path.join(UPLOAD_DIR, upload_file.filename)
+    # Prefijo único para que dos subidas con el mismo nombre no se pisen
+    file_name = os.path.basename(upload_file.filename)
+    if file_id:
+        file_name = f"{file_id}_{file_name}"
+    file_location = os.path.join(UPLOAD_DIR, file_name)
     with open(file_location, "wb+") as file_object:
         file_object.write(await upload_file.read())
     return file_location
@@ -20,4 +27,74 @@ def get_file_content(file_path: str) -> bytes:
     with open(file_path, "rb") as file_object:
         return file_object.read()
 
-# Podrías añadir funciones para leer PDF, DOCX, etc., aquí o en el microservicio de PLN
\ No newline at end of file
+# ==================================
+# LOTES (/extract-cv-data/batch)
+# ==================================
+CV_EXTENSIONS = (".pdf", ".docx", ".txt")
+# Límites por lote (cuentan los CVs de dentro de los ZIP, ya descomprimidos)
+BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", "200"))
+BATCH_MAX_BYTES = int(os.getenv("BATCH_MAX_BYTES", str(100 * 2**20)))
+
+
+class BatchTooLargeError(Exception):
+    """El lote supera BATCH_MAX_FILES o BATCH_MAX_BYTES (413)."""
+
+
+class BatchEntry(NamedTuple):
+    name: str
+    data: Optional[bytes]
+    # Error propio de esta entrada (formato no soportado, ZIP dañado...): se informa en línea
+    error: Optional[str] = None
+
+
+def read_batch_entries(files: Iterable[Tuple[str, BinaryIO]]) -> List[BatchEntry]:
+    """
+    CVs de una subida múltiple: cada archivo, o cada entrada de un ZIP, leído en memoria
+    (sin descomprimir a disco) para enviarlo al pool de procesos. Se ignoran carpetas y
+    metadatos de macOS; el tamaño declarado de cada entrada se comprueba antes de leerla.
+    """
+    entries: List[BatchEntry] = []
+    budget = BATCH_MAX_BYTES
+
+    def add(name: str, read, size: int) -> None:
+        nonlocal budget
+        if len(entries) >= BATCH_MAX_FILES:
+            raise BatchTooLargeError(f"El lote supera el máximo de {BATCH_MAX_FILES} CVs.")
+        extension = os.path.splitext(name)[1].lower()
+        if extension not in CV_EXTENSIONS:
+            entries.append(BatchEntry(name, None, f"Formato de archivo no soportado: {extension or 'sin extensión'}. "
+                                                  "Solo se aceptan PDF, DOCX y TXT."))
+            return
+        if size > budget:
+            raise BatchTooLargeError(f"El lote supera el máximo de {BATCH_MAX_BYTES // 2**20} MB.")
+        data = read(budget + 1)
+        if len(data) > budget:
+            raise BatchTooLargeError(f"El lote supera el máximo de {BATCH_MAX_BYTES // 2**20} MB.")
+        budget -= len(data)
+        entries.append(BatchEntry(name, data))
+
+    for file_name, stream in files:
+        if os.path.splitext(file_name)[1].lower() != ".zip":
+            stream.seek(0, os.SEEK_END)
+            size = stream.tell()
+            stream.seek(0)
+            add(os.path.basename(file_name), stream.read, size)
+            continue
+        try:
+            archive = zipfile.ZipFile(stream)
+        except zipfile.BadZipFile:
+            entries.append(BatchEntry(file_name, None, "ZIP dañado o no válido."))
+            continue
+        with archive:
+            for info in archive.infolist():
+                base = posixpath.basename(info.filename)
+                if info.is_dir() or info.filename.startswith("__MACOSX/") or base.startswith("."):
+                    continue
+                name = f"{file_name}/{info.filename}"
+                try:
+                    with archive.open(info) as member:
+                        add(name, member.read, info.file_size)
+                except (zipfile.BadZipFile, RuntimeError, NotImplementedError) as e:
+                    # CRC incorrecto, entrada cifrada o compresión no soportada
+                    entries.append(BatchEntry(name, None, f"No se pudo leer la entrada del ZIP: {e}"))
+    return entries
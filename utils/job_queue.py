@@ -0,0 +1,192 @@
+# utils/job_queue.py
+
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from uuid import uuid4
+
+from utils.logging_config import configure_logging, current_context, log_context
+from utils.metrics import REGISTRY, replay_collected, run_collecting, stage_totals
+
+logger = logging.getLogger(__name__)
+
+# Configuración por entorno
+JOB_QUEUE_MAXSIZE = int(os.getenv("JOB_QUEUE_MAXSIZE", "100"))
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_PROCESS_POOL_SIZE = int(os.getenv("JOB_PROCESS_POOL_SIZE", str(os.cpu_count() or 1)))
+JOB_RESULT_TTL_SECONDS = int(os.getenv("JOB_RESULT_TTL_SECONDS", "900"))
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+class QueueFullError(Exception):
+    """La cola de trabajos está llena: el cliente debe reintentar más tarde (429)."""
+
+
+class Job:
+    __slots__ = (
+        "id", "kind", "status", "created_at", "started_at", "finished_at",
+        "result", "error", "error_status", "timings", "log_context", "_func", "_args", "_on_result",
+    )
+
+    def __init__(self, kind: str, func: Callable, args: tuple, on_result: Optional[Callable]):
+        self.id = str(uuid4())
+        self.kind = kind
+        self.status = QUEUED
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.error_status: Optional[int] = None
+        # Duración (ms) por etapa, para la cabecera Server-Timing del resultado
+        self.timings: Dict[str, float] = {}
+        # Contexto de log de quien encoló el trabajo (request_id...)
+        self.log_context: Dict[str, Any] = current_context()
+        self._func = func
+        self._args = args
+        self._on_result = on_result
+
+
+class JobQueue:
+    """
+    Cola acotada de trabajos en proceso. N tareas asyncio consumen la cola y ejecutan
+    cada trabajo en un pool de procesos, así el event loop nunca hace el trabajo pesado.
+    Los resultados se guardan en memoria durante `ttl_seconds` desde que terminan.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = JOB_QUEUE_MAXSIZE,
+        workers: int = JOB_WORKERS,
+        pool_size: int = JOB_PROCESS_POOL_SIZE,
+        ttl_seconds: int = JOB_RESULT_TTL_SECONDS,
+    ):
+        self.maxsize = maxsize
+        self.workers = workers
+        self.pool_size = pool_size
+        self.ttl_seconds = ttl_seconds
+        self._queue: Optional[asyncio.Queue] = None
+        self._jobs: Dict[str, Job] = {}
+        self._tasks: list = []
+        self._executor: Optional[Executor] = None
+
+    # ---------- ciclo de vida ----------
+    async def start(self, executor: Optional[Executor] = None) -> None:
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._executor = executor or ProcessPoolExecutor(
+            max_workers=self.pool_size, initializer=configure_logging
+        )
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._purge_expired()))
+        REGISTRY.gauge("job_queue_depth", self.qsize)
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    # ---------- API ----------
+    def submit(
+        self,
+        kind: str,
+        func: Callable,
+        *args,
+        on_result: Optional[Callable[[Any, Job], Any]] = None,
+    ) -> Job:
+        """
+        Encola func(*args) (debe ser picklable: se ejecuta en otro proceso).
+        on_result(result, job) transforma/guarda el resultado en el proceso principal
+        (y puede anotar job.timings con las etapas del trabajo).
+        """
+        if self._queue is None:
+            raise RuntimeError("JobQueue no iniciada")
+        job = Job(kind, func, args, on_result)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFullError(f"Cola de trabajos llena ({self.maxsize})")
+        self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        job = self._jobs.get(job_id)
+        if job is not None and self._expired(job, time.time()):
+            self._jobs.pop(job_id, None)
+            return None
+        return job
+
+    def qsize(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def run(self, kind: str, func: Callable, *args) -> Any:
+        """
+        Ejecuta func(*args) en el pool y espera su resultado, sin pasar por la cola ni
+        guardar el trabajo (para quien ya espera la respuesta, p. ej. un lote en streaming).
+        La concurrencia la acota quien llama.
+        """
+        if self._executor is None:
+            raise RuntimeError("JobQueue no iniciada")
+        job_status = FAILED
+        try:
+            result, _ = await self._execute(func, args)
+            job_status = DONE
+            return result
+        finally:
+            REGISTRY.inc("jobs_total", kind=kind, status=job_status)
+
+    # ---------- internos ----------
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            job.status = RUNNING
+            job.started_at = time.time()
+            job.timings["queue"] = (job.started_at - job.created_at) * 1000
+            try:
+                with log_context(**job.log_context, job_id=job.id):
+                    try:
+                        result, stages = await self._execute(job._func, job._args)
+                        job.timings["run"] = (time.time() - job.started_at) * 1000
+                        job.timings.update(stage_totals(stages))
+                        job.result = job._on_result(result, job) if job._on_result else result
+                        job.status = DONE
+                    except ValueError as e:
+                        job.error, job.error_status, job.status = str(e), 400, FAILED
+                    except Exception as e:
+                        logger.exception("Error en trabajo %s", job.kind)
+                        job.error, job.error_status, job.status = str(e), 500, FAILED
+            finally:
+                REGISTRY.inc("jobs_total", kind=job.kind, status=job.status)
+                job.finished_at = time.time()
+                job._func, job._args, job._on_result = None, (), None
+                self._queue.task_done()
+
+    async def _execute(self, func: Callable, args: tuple):
+        # Etapas y contadores medidos en el proceso hijo -> métricas de este proceso y
+        # Server-Timing, también cuando el trabajo falla
+        try:
+            result, collected = await asyncio.get_running_loop().run_in_executor(
+                self._executor, run_collecting, func, *args
+            )
+        except Exception as e:
+            replay_collected(getattr(e, "collected_metrics", None))
+            raise
+        replay_collected(collected)
+        return result, collected[0]
+
+    def _expired(self, job: Job, now: float) -> bool:
+        return job.finished_at is not None and now - job.finished_at > self.ttl_seconds
+
+    async def _purge_expired(self) -> None:
+        while True:
+            await asyncio.sleep(max(1, min(60, self.ttl_seconds)))
+            now = time.time()
+            for job_id in [j.id for j in self._jobs.values() if self._expired(j, now)]:
+                self._jobs.pop(job_id, None)
@@ -0,0 +1,212 @@
+# utils/logging_config.py
+"""
+Logging estructurado (JSON por línea) con niveles por módulo, contexto por request,
+muestreo y handlers no bloqueantes: los módulos encolan el registro (QueueHandler) y un
+hilo (QueueListener) formatea y escribe en stdout.
+
+Uso en los módulos, como hasta ahora:
+    logger = logging.getLogger(__name__)
+    logger.debug("Texto: %s", truncate(text, 500))   # solo se formatea si se emite
+
+Configuración por entorno:
+    LOG_LEVEL=INFO
+    LOG_LEVELS="models.cv_processing=DEBUG,models.offers=WARNING"
+    LOG_SAMPLE="models.cv_processing=0.1"   # fracción de registros < WARNING que se emiten
+    LOG_FORMAT=json | text
+"""
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+LOG_SAMPLE = os.getenv("LOG_SAMPLE", "")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+
+# Librerías ruidosas: solo avisos
+_DEFAULT_LEVELS = {"httpx": "WARNING", "httpcore": "WARNING", "urllib3": "WARNING"}
+
+# Atributos estándar de LogRecord: lo demás son campos `extra=` del registro
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_request_context: contextvars.ContextVar[Dict[str, Any]] = contextvars.ContextVar("log_context", default={})
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_configured_pid: Optional[int] = None
+
+
+# ==================================
+# CONTEXTO POR REQUEST
+# ==================================
+@contextmanager
+def log_context(**fields):
+    """Añade campos (request_id, job_id...) a todos los registros emitidos dentro del bloque."""
+    token = _request_context.set({**_request_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _request_context.reset(token)
+
+
+def current_context() -> Dict[str, Any]:
+    return dict(_request_context.get())
+
+
+# ==================================
+# FORMATEO PEREZOSO
+# ==================================
+class Lazy:
+    """Argumento de log que solo se calcula si el registro llega a formatearse."""
+    __slots__ = ("_func", "_args")
+
+    def __init__(self, func: Callable[..., Any], *args):
+        self._func = func
+        self._args = args
+
+    def __str__(self) -> str:
+        return str(self._func(*self._args))
+
+
+def truncate(text: Optional[str], limit: int = 200) -> Lazy:
+    return Lazy(lambda: text if text is None or len(text) <= limit else f"{text[:limit]}… (+{len(text) - limit} chars)")
+
+
+# ==================================
+# FILTROS Y FORMATOS
+# ==================================
+def _parse_pairs(spec: str) -> Dict[str, str]:
+    pairs = {}
+    for item in spec.split(","):
+        if "=" in item:
+            name, value = item.split("=", 1)
+            pairs[name.strip()] = value.strip()
+    return pairs
+
+
+class ContextFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        for key, value in _request_context.get().items():
+            if not hasattr(record, key):
+                setattr(record, key, value)
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Deja pasar una fracción de los registros < WARNING según el logger (prefijo más largo)."""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+
+    def _rate(self, name: str) -> float:
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition(".")[0]
+        return self.rates.get("", 1.0)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        return random.random() < self._rate(record.name)
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.created)) + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_text:
+            payload["exc"] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        extras = {k: v for k, v in vars(record).items() if k not in _RESERVED and not k.startswith("_")}
+        return f"{line} {extras}" if extras else line
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    Formatea el mensaje (y los Lazy) en el hilo que emite, ya filtrado por nivel y
+    muestreo; el JSON y la escritura quedan para el hilo del listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg, record.args = record.getMessage(), None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+# ==================================
+# CONFIGURACIÓN
+# ==================================
+def configure_logging(force: bool = False) -> None:
+    """
+    Idempotente por proceso. Se llama al arrancar la API, en los CLIs de jobs y como
+    initializer del pool de procesos (tras un fork, el hilo del listener no existe en el hijo).
+    """
+    global _listener, _configured_pid
+    if _configured_pid == os.getpid() and not force:
+        return
+
+    if _listener is not None and _configured_pid == os.getpid():
+        _listener.stop()
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = _QueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+    rates = {name: float(rate) for name, rate in _parse_pairs(LOG_SAMPLE).items()}
+    queue_handler.addFilter(SamplingFilter(rates))
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonFormatter() if LOG_FORMAT == "json" else TextFormatter())
+
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(LOG_LEVEL)
+    for name, level in {**_DEFAULT_LEVELS, **_parse_pairs(LOG_LEVELS)}.items():
+        logging.getLogger(name).setLevel(level.upper())
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    _configured_pid = os.getpid()
+
+
+def _stop_listener() -> None:
+    if _listener is not None and _configured_pid == os.getpid():
+        _listener.stop()
+
+
+def _reconfigure_after_fork() -> None:
+    # Workers de gunicorn / pool de procesos: el hijo hereda el QueueHandler pero no el hilo
+    if _configured_pid is not None:
+        configure_logging()
+
+
+atexit.register(_stop_listener)
+os.register_at_fork(after_in_child=_reconfigure_after_fork)
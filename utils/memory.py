@@ -0,0 +1,58 @@
+# utils/memory.py
+"""
+Memoria por proceso leída de /proc/<pid>/smaps_rollup (Linux):
+
+  rss    residente total (cuenta dos veces las páginas compartidas entre workers)
+  pss    reparto proporcional de las páginas compartidas (suma real entre procesos)
+  uss    páginas privadas: lo que se liberaría al matar ese worker
+
+La USS es la que decide cuántos workers caben por nodo: con los modelos precargados
+en el maestro (gunicorn --preload + MODEL_PRELOAD) los workers comparten sus páginas.
+"""
+import os
+from typing import Dict, List, Union
+
+Pid = Union[int, str]
+
+
+def memory_usage(pid: Pid = "self") -> Dict[str, int]:
+    """Bytes de rss, pss, uss y shared del proceso; {} si no hay /proc (macOS, Windows)."""
+    fields: Dict[str, int] = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", "r") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                    fields[parts[0][:-1]] = int(parts[1]) * 1024
+    except OSError:
+        return {}
+    private = fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)
+    return {
+        "rss": fields.get("Rss", 0),
+        "pss": fields.get("Pss", 0),
+        "uss": private,
+        "shared": fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0),
+    }
+
+
+def child_pids(pid: Pid) -> List[int]:
+    """Hijos directos de pid (workers de gunicorn/uvicorn, procesos del pool)."""
+    children: List[int] = []
+    try:
+        for task in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{task}/children", "r") as f:
+                children.extend(int(c) for c in f.read().split())
+    except OSError:
+        pass
+    return children
+
+
+def register_memory_gauges(registry) -> None:
+    """Gauges de memoria del proceso en /metrics (cada worker expone los suyos, con su pid)."""
+    pid = os.getpid()
+    for kind, name in (
+        ("rss", "process_resident_memory_bytes"),
+        ("pss", "process_proportional_memory_bytes"),
+        ("uss", "process_unique_memory_bytes"),
+    ):
+        registry.gauge(name, lambda kind=kind: memory_usage().get(kind, 0), pid=pid)
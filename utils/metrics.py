@@ -0,0 +1,262 @@
+# utils/metrics.py
+"""
+Instrumentación ligera: histogramas de latencia y contadores en memoria del proceso,
+expuestos en formato texto de Prometheus por GET /metrics.
+
+    @timed("ner")
+    def ner_via_hf(text): ...
+
+    with timer("employability_inference"):
+        ...
+
+Cada etapa se registra en el histograma `cv_stage_duration_seconds{stage=...}` y, si hay
+un colector activo (collect_stages: un request HTTP o un trabajo de la JobQueue), también
+en la lista de etapas de ese request para la cabecera Server-Timing.
+Con varios workers (gunicorn) cada proceso expone sus propias métricas.
+"""
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+STAGE_HISTOGRAM = "cv_stage_duration_seconds"
+STAGE_ERRORS = "cv_stage_errors_total"
+
+# Segundos: de 1 ms (extract_email) a decenas de segundos (NER en frío, resumidor)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_HELP = {
+    STAGE_HISTOGRAM: "Duración de cada etapa del procesamiento (segundos)",
+    STAGE_ERRORS: "Etapas que terminaron con excepción",
+    "http_request_duration_seconds": "Duración de los requests HTTP (segundos)",
+    "jobs_total": "Trabajos de la JobQueue terminados, por tipo y estado",
+    "job_queue_depth": "Trabajos en cola pendientes de ejecutar",
+    "process_resident_memory_bytes": "RSS del proceso (incluye páginas compartidas)",
+    "process_proportional_memory_bytes": "PSS del proceso (páginas compartidas repartidas)",
+    "process_unique_memory_bytes": "USS del proceso (páginas privadas)",
+    "ner_requests_total": "Llamadas NER terminadas, por resultado (ok o motivo del error)",
+    "ner_retries_total": "Reintentos de llamadas NER, por motivo",
+    "ner_hedged_total": "Llamadas NER en las que se lanzó un segundo intento (hedging)",
+    "ner_hedge_wins_total": "Llamadas NER resueltas por el segundo intento",
+    "ner_circuit_open": "1 si el circuit breaker del NER está abierto o en prueba",
+    "ner_circuit_opened_total": "Veces que se abrió el circuit breaker del NER",
+    "ner_cache_requests_total": "Consultas a la caché NER, por resultado (hit/miss) y nivel",
+    "ner_cache_evictions_total": "Entradas expulsadas de la caché NER, por nivel",
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+# ==================================
+# REGISTRO
+# ==================================
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # último: +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._gauges: Dict[Tuple[str, Labels], Callable[[], float]] = {}
+
+    @staticmethod
+    def _key(name: str, labels: Dict[str, Any]) -> Tuple[str, Labels]:
+        return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = self._key(name, labels)
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = Histogram()
+            hist.observe(value)
+
+    def inc(self, name: str, value: float = 1.0, **labels) -> None:
+        deferred = _deferred.get()
+        if deferred is not None:
+            # Dentro de run_collecting: lo registrará el proceso principal (replay_collected)
+            deferred.append((name, value, labels))
+            return
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def gauge(self, name: str, func: Callable[[], float], **labels) -> None:
+        """Gauge calculado al exportar (p. ej. profundidad de la cola)."""
+        self._gauges[self._key(name, labels)] = func
+
+    def render(self) -> str:
+        """Formato de exposición de texto de Prometheus (0.0.4)."""
+        with self._lock:
+            histograms = {k: (h.buckets, list(h.counts), h.sum, h.count) for k, h in self._histograms.items()}
+            counters = dict(self._counters)
+        lines: List[str] = []
+
+        for name, kind, items in (
+            *_by_name(histograms, "histogram"),
+            *_by_name(counters, "counter"),
+            *_by_name({k: f() for k, f in self._gauges.items()}, "gauge"),
+        ):
+            if name in _HELP:
+                lines.append(f"# HELP {name} {_HELP[name]}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in items:
+                if kind != "histogram":
+                    lines.append(f"{name}{_fmt_labels(labels)} {value}")
+                    continue
+                buckets, counts, total, count = value
+                cumulative = 0
+                for bound, n in zip(buckets, counts):
+                    cumulative += n
+                    lines.append(f"{name}_bucket{_fmt_labels(labels + (('le', repr(bound)),))} {cumulative}")
+                lines.append(f"{name}_bucket{_fmt_labels(labels + (('le', '+Inf'),))} {count}")
+                lines.append(f"{name}_sum{_fmt_labels(labels)} {total}")
+                lines.append(f"{name}_count{_fmt_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+def _by_name(series: Dict[Tuple[str, Labels], Any], kind: str):
+    grouped: Dict[str, List] = {}
+    for (name, labels), value in sorted(series.items()):
+        grouped.setdefault(name, []).append((labels, value))
+    return [(name, kind, items) for name, items in grouped.items()]
+
+
+def _fmt_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        k + '="' + v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+        for k, v in labels
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+REGISTRY = MetricsRegistry()
+
+
+# ==================================
+# ETAPAS (timers)
+# ==================================
+_stages: contextvars.ContextVar[Optional[List[Tuple[str, float]]]] = contextvars.ContextVar("metric_stages", default=None)
+# Dentro de run_collecting: contadores pendientes; el proceso principal registrará
+# estos y las etapas (replay_collected)
+_deferred: contextvars.ContextVar[Optional[List[Tuple[str, float, Dict[str, Any]]]]] = contextvars.ContextVar(
+    "metric_deferred", default=None
+)
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    if _deferred.get() is None:
+        REGISTRY.observe(STAGE_HISTOGRAM, seconds, stage=stage)
+    collected = _stages.get()
+    if collected is not None:
+        collected.append((stage, seconds))
+
+
+@contextmanager
+def timer(stage: str):
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        REGISTRY.inc(STAGE_ERRORS, stage=stage)
+        raise
+    finally:
+        record_stage(stage, time.perf_counter() - started)
+
+
+def timed(stage: str):
+    """Decorador de timer() para funciones síncronas y corrutinas."""
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with timer(stage):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timer(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def collect_stages():
+    """Recoge las etapas ejecutadas dentro del bloque (y de las tareas/hilos que hereden el contexto)."""
+    collected: List[Tuple[str, float]] = []
+    token = _stages.set(collected)
+    try:
+        yield collected
+    finally:
+        _stages.reset(token)
+
+
+def stage_totals(collected: Iterable[Tuple[str, float]]) -> Dict[str, float]:
+    """Milisegundos acumulados por etapa, en orden de primera aparición."""
+    totals: Dict[str, float] = {}
+    for stage, seconds in collected:
+        totals[stage] = totals.get(stage, 0.0) + seconds * 1000
+    return totals
+
+
+def run_collecting(func: Callable, *args) -> Tuple[Any, Tuple[List[Tuple[str, float]], List]]:
+    """
+    Para el pool de procesos: ejecuta func y devuelve también sus etapas y contadores,
+    que el proceso principal vuelca en su REGISTRY con replay_collected (los del hijo
+    no se exportan). Si func falla, viajan en el atributo `collected_metrics` de la
+    excepción (se picklea con su __dict__).
+    """
+    counters: List = []
+    token = _deferred.set(counters)
+    try:
+        with collect_stages() as collected:
+            try:
+                result = func(*args)
+            except Exception as e:
+                try:
+                    e.collected_metrics = (collected, counters)
+                except AttributeError:
+                    pass
+                raise
+    finally:
+        _deferred.reset(token)
+    return result, (collected, counters)
+
+
+def replay_stages(collected: Iterable[Tuple[str, float]]) -> None:
+    for stage, seconds in collected:
+        REGISTRY.observe(STAGE_HISTOGRAM, seconds, stage=stage)
+
+
+def replay_collected(collected: Optional[Tuple[List[Tuple[str, float]], List]]) -> None:
+    if not collected:
+        return
+    stages, counters = collected
+    replay_stages(stages)
+    for name, value, labels in counters:
+        REGISTRY.inc(name, value, **labels)
+
+def server_timing(timings: Dict[str, float]) -> str:
+    """Formato de la cabecera Server-Timing: `etapa;dur=12.3, otra;dur=4.0`."""
+    return ", ".join(f"{name};dur={ms:.1f}" for name, ms in timings.items())
@@ -0,0 +1,118 @@
+# utils/model_registry.py
+"""
+Registro de modelos y recursos pesados. Nada se carga al importar: cada modelo se
+carga la primera vez que se pide (MODELS.get), en el calentamiento explícito del
+lifespan (MODEL_WARMUP), antes de que el pool de procesos de la JobQueue haga fork,
+o en el maestro de gunicorn (MODEL_PRELOAD, ver gunicorn.conf.py) para que todos
+los workers compartan las páginas copy-on-write.
+
+Los loaders se registran como "modulo:funcion" para no importar el módulo del
+modelo (y sus librerías: sklearn, torch...) hasta que haga falta.
+
+    model, columns = MODELS.get("employability")
+"""
+import gc
+import importlib
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Union
+
+from utils.metrics import timer
+
+logger = logging.getLogger(__name__)
+
+# Modelos a cargar en el arranque: "employability,summarizer", "all" o vacío (todo bajo demanda)
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "")
+# Igual, pero en el maestro de gunicorn antes del fork (con preload_app)
+MODEL_PRELOAD = os.getenv("MODEL_PRELOAD", "")
+# Arrays de NumPy de los .joblib mapeados desde disco (solo lectura): la caché de páginas
+# del SO se comparte entre workers y pods del mismo nodo, aunque no compartan maestro
+MODEL_MMAP = os.getenv("MODEL_MMAP", "0") == "1"
+
+Loader = Union[str, Callable[[], Any]]
+
+
+class ModelRegistry:
+    def __init__(self):
+        self._loaders: Dict[str, Loader] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._models: Dict[str, Any] = {}
+
+    def register(self, name: str, loader: Loader) -> None:
+        self._loaders[name] = loader
+        self._locks[name] = threading.Lock()
+
+    def names(self) -> List[str]:
+        return list(self._loaders)
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def get(self, name: str) -> Any:
+        """Devuelve el modelo, cargándolo una sola vez (los demás hilos esperan a esa carga)."""
+        try:
+            return self._models[name]
+        except KeyError:
+            pass
+        if name not in self._loaders:
+            raise KeyError(f"Modelo no registrado: {name}. Opciones: {', '.join(self._loaders)}")
+
+        with self._locks[name]:
+            if name not in self._models:
+                started = time.perf_counter()
+                with timer(f"load_{name}"):
+                    self._models[name] = _resolve(self._loaders[name])()
+                logger.info("Modelo '%s' cargado en %.0f ms", name, (time.perf_counter() - started) * 1000)
+        return self._models[name]
+
+    def warmup(self, names: Iterable[str]) -> Dict[str, float]:
+        """Carga los modelos indicados; devuelve los ms de cada carga."""
+        timings = {}
+        for name in names:
+            started = time.perf_counter()
+            self.get(name)
+            timings[name] = (time.perf_counter() - started) * 1000
+        return timings
+
+    def preload_for_fork(self, names: Iterable[str]) -> Dict[str, float]:
+        """
+        Carga en el proceso maestro, antes del fork, sin ejecutar inferencia (los pools de
+        hilos de torch/OpenMP no sobreviven a un fork). gc.freeze evita que el GC de los
+        workers recorra (y copie) las páginas de los objetos ya cargados.
+        """
+        timings = self.warmup(names)
+        gc.collect()
+        gc.freeze()
+        return timings
+
+    def clear(self) -> None:
+        self._models.clear()
+
+
+def _resolve(loader: Loader) -> Callable[[], Any]:
+    if callable(loader):
+        return loader
+    module, _, attr = loader.partition(":")
+    return getattr(importlib.import_module(module), attr)
+
+
+def load_joblib(path: str) -> Any:
+    """joblib.load con mmap_mode="r" si MODEL_MMAP=1 (requiere un .joblib sin comprimir)."""
+    import joblib
+
+    return joblib.load(path, mmap_mode="r" if MODEL_MMAP else None)
+
+
+def warmup_names(spec: str = MODEL_WARMUP) -> List[str]:
+    """Interpreta MODEL_WARMUP / MODEL_PRELOAD ("all" = todos los registrados)."""
+    names = [n.strip() for n in spec.split(",") if n.strip()]
+    if "all" in names:
+        return MODELS.names()
+    return names
+
+
+MODELS = ModelRegistry()
+MODELS.register("employability", "models.employability_model:load_employability_model")
+MODELS.register("summarizer", "models.cv_summarizer:initialize_summarizer")
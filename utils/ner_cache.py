@@ -0,0 +1,220 @@
+# utils/ner_cache.py
+"""
+Caché de resultados NER: el NER remoto es la dependencia más cara y menos fiable, y el
+mismo texto vuelve a extraerse tras re-subidas, ediciones de revisión o reintentos.
+
+- Clave: sha256 del modelo, de la variante (modo y ventanas) y del texto limpio.
+- Memoria: LRU acotada (NER_CACHE_SIZE entradas) por proceso.
+- Disco (opcional, NER_CACHE_PATH): SQLite compartido por los procesos del pool y
+  entre reinicios, acotado (aproximadamente: se comprueba cada NER_CACHE_DISK_CHECK
+  escrituras) a NER_CACHE_DISK_MAX entradas; se expulsan las usadas hace más tiempo,
+  con used_at actualizado por tandas. Si cambia el modelo configurado, el fichero se
+  vacía al abrirlo. Cualquier error de SQLite cuenta como fallo de caché y, si es al
+  abrirlo, el proceso sigue solo con la memoria.
+- Métricas: ner_cache_requests_total{result=hit|miss, tier=...} (tasa de aciertos:
+  result="hit" / total) y ner_cache_evictions_total{tier=...}.
+
+Los resultados devueltos se comparten entre llamadas: no deben modificarse.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+NER_CACHE_SIZE = int(os.getenv("NER_CACHE_SIZE", "1024"))
+NER_CACHE_PATH = os.getenv("NER_CACHE_PATH", "")
+NER_CACHE_DISK_MAX = int(os.getenv("NER_CACHE_DISK_MAX", "100000"))
+# Escrituras entre comprobaciones del tamaño en disco y aciertos entre volcados de used_at
+NER_CACHE_DISK_CHECK = int(os.getenv("NER_CACHE_DISK_CHECK", "64"))
+
+Entities = List[Dict[str, Any]]
+
+
+class NERCache:
+    def __init__(
+        self,
+        model: str,
+        max_entries: int = NER_CACHE_SIZE,
+        path: Optional[str] = NER_CACHE_PATH or None,
+        disk_max_entries: int = NER_CACHE_DISK_MAX,
+    ):
+        self.model = model
+        self.max_entries = max_entries
+        self.path = path
+        self.disk_max_entries = disk_max_entries
+        self._memory: "OrderedDict[str, Entities]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_pid: Optional[int] = None
+        self._disk_failed_pid: Optional[int] = None
+        self._touched: Dict[str, float] = {}  # key -> used_at pendiente de escribir
+        self._puts = 0
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, text: str, variant: str = "") -> str:
+        digest = hashlib.sha256()
+        for part in (self.model, variant, text):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Entities]:
+        with self._lock:
+            entities = self._memory.get(key)
+            if entities is not None:
+                self._memory.move_to_end(key)
+                self._count("hit", "memory")
+                return entities
+            entities = self._disk_get(key)
+            if entities is not None:
+                self._remember(key, entities)
+                self._count("hit", "disk")
+                return entities
+            self._count("miss", "disk" if self.path else "memory")
+            return None
+
+    def put(self, key: str, entities: Entities) -> None:
+        with self._lock:
+            self._remember(key, entities)
+            self._disk_put(key, entities)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            try:
+                db = self._connection()
+                if db is not None:
+                    db.execute("DELETE FROM ner_cache")
+                    db.commit()
+            except sqlite3.Error as e:
+                logger.warning("No se pudo vaciar la caché NER en disco: %s", e)
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    # ---------- memoria ----------
+    def _remember(self, key: str, entities: Entities) -> None:
+        if self.max_entries <= 0:
+            return
+        self._memory[key] = entities
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            REGISTRY.inc("ner_cache_evictions_total", tier="memory")
+
+    def _count(self, result: str, tier: str) -> None:
+        if result == "hit":
+            self.hits += 1
+        else:
+            self.misses += 1
+        REGISTRY.inc("ner_cache_requests_total", result=result, tier=tier)
+
+    # ---------- disco ----------
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        if not self.path or self._disk_failed_pid == os.getpid():
+            return None
+        # Conexión propia por proceso: una conexión SQLite no sobrevive a un fork
+        if self._db is None or self._db_pid != os.getpid():
+            self._db, self._touched, self._puts = None, {}, 0
+            try:
+                self._db = self._open()
+            except sqlite3.Error as e:
+                # Fichero bloqueado o no escribible: este proceso sigue solo con la memoria
+                logger.warning("Caché NER en disco desactivada en este proceso: %s", e)
+                self._disk_failed_pid = os.getpid()
+                return None
+            self._db_pid = os.getpid()
+        return self._db
+
+    def _open(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+        try:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("CREATE TABLE IF NOT EXISTS ner_cache_meta (name TEXT PRIMARY KEY, value TEXT)")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS ner_cache "
+                "(key TEXT PRIMARY KEY, entities TEXT NOT NULL, used_at REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS ner_cache_used_at ON ner_cache (used_at)")
+            row = db.execute("SELECT value FROM ner_cache_meta WHERE name = 'model'").fetchone()
+            if row is None or row[0] != self.model:
+                if row is not None:
+                    logger.info("Modelo NER cambiado (%s -> %s): se vacía la caché en disco", row[0], self.model)
+                db.execute("DELETE FROM ner_cache")
+                db.execute("INSERT OR REPLACE INTO ner_cache_meta VALUES ('model', ?)", (self.model,))
+            db.commit()
+        except sqlite3.Error:
+            db.close()
+            raise
+        return db
+
+    def _disk_get(self, key: str) -> Optional[Entities]:
+        try:
+            db = self._connection()
+            if db is None:
+                return None
+            row = db.execute("SELECT entities FROM ner_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            # used_at por tandas: un acierto no toma el bloqueo de escritura del WAL
+            self._touched[key] = time.time()
+            if len(self._touched) >= NER_CACHE_DISK_CHECK:
+                self._flush_touched(db)
+                db.commit()
+            return json.loads(row[0])
+        except sqlite3.Error as e:
+            # La caché nunca debe tumbar la extracción
+            logger.warning("Caché NER en disco no disponible: %s", e)
+            return None
+
+    def _disk_put(self, key: str, entities: Entities) -> None:
+        try:
+            db = self._connection()
+            if db is None:
+                return
+            db.execute(
+                "INSERT OR REPLACE INTO ner_cache VALUES (?, ?, ?)",
+                (key, json.dumps(entities, ensure_ascii=False), time.time()),
+            )
+            self._touched.pop(key, None)
+            self._flush_touched(db)
+            self._puts += 1
+            if self._puts % NER_CACHE_DISK_CHECK == 0:
+                self._evict(db)
+            db.commit()
+        except sqlite3.Error as e:
+            logger.warning("No se pudo guardar en la caché NER en disco: %s", e)
+
+    def _flush_touched(self, db: sqlite3.Connection) -> None:
+        if self._touched:
+            db.executemany(
+                "UPDATE ner_cache SET used_at = ? WHERE key = ?",
+                [(used_at, key) for key, used_at in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        """Recorta el fichero a disk_max_entries (COUNT(*) solo cada NER_CACHE_DISK_CHECK escrituras)."""
+        excess = db.execute("SELECT COUNT(*) FROM ner_cache").fetchone()[0] - self.disk_max_entries
+        if excess > 0:
+            db.execute(
+                "DELETE FROM ner_cache WHERE key IN (SELECT key FROM ner_cache ORDER BY used_at LIMIT ?)",
+                (excess,),
+            )
+            REGISTRY.inc("ner_cache_evictions_total", excess, tier="disk")
@@ -0,0 +1,302 @@
+# utils/ner_client.py
+"""
+Cliente asíncrono de token_classification (Hugging Face Inference API, un Inference
+Endpoint propio o el servidor NER falso de las pruebas de carga).
+
+- Un httpx.AsyncClient por event loop con conexiones keep-alive (HTTP/2 si está h2).
+- Plazo total por llamada (NER_DEADLINE_S) y timeout por intento (NER_TIMEOUT_S).
+- Reintentos acotados con jitter ante "Model is currently loading", 429, 5xx y
+  errores de red; respeta estimated_time / Retry-After sin pasarse del plazo.
+- Circuit breaker por proceso: tras NER_BREAKER_FAILURES fallos seguidos falla al
+  instante durante NER_BREAKER_RESET_S y luego deja pasar una única prueba.
+- Hedging opcional (NER_HEDGE_AFTER_MS): si un intento no ha respondido a tiempo se
+  lanza un segundo igual y gana el primero que termine bien.
+
+    entities = await get_ner_client(url, token).token_classification(text)
+"""
+import asyncio
+import logging
+import os
+import random
+import time
+import weakref
+from typing import Any, Dict, List, Optional
+
+from utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+NER_TIMEOUT_S = float(os.getenv("NER_TIMEOUT_S", "10"))
+NER_DEADLINE_S = float(os.getenv("NER_DEADLINE_S", "30"))
+NER_MAX_RETRIES = int(os.getenv("NER_MAX_RETRIES", "3"))
+NER_BACKOFF_BASE_S = float(os.getenv("NER_BACKOFF_BASE_S", "0.5"))
+NER_BACKOFF_MAX_S = float(os.getenv("NER_BACKOFF_MAX_S", "10"))
+# 0 = sin hedging; conviene un valor cercano al p95 de la etapa "ner" en /metrics
+NER_HEDGE_AFTER_MS = float(os.getenv("NER_HEDGE_AFTER_MS", "0"))
+NER_BREAKER_FAILURES = int(os.getenv("NER_BREAKER_FAILURES", "5"))
+NER_BREAKER_RESET_S = float(os.getenv("NER_BREAKER_RESET_S", "30"))
+NER_HTTP2 = os.getenv("NER_HTTP2", "1") == "1"
+NER_MAX_CONNECTIONS = int(os.getenv("NER_MAX_CONNECTIONS", "20"))
+
+HF_INFERENCE_URL = "https://router.huggingface.co/hf-inference/models/{model}"
+
+
+class NERError(RuntimeError):
+    """Error de la llamada NER. `retryable` indica si otro intento puede salir bien."""
+
+    def __init__(self, message: str, reason: str, retryable: bool = False, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.reason = reason
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(NERError):
+    def __init__(self, retry_in: float):
+        super().__init__(
+            f"Servicio NER no disponible (circuito abierto), reintenta en {retry_in:.0f} s.",
+            reason="circuit_open",
+            retry_after=retry_in,
+        )
+
+
+# ==================================
+# CIRCUIT BREAKER
+# ==================================
+class CircuitBreaker:
+    """closed -> open tras `failures` fallos seguidos -> half_open pasado `reset_s` (una prueba)."""
+
+    def __init__(self, failures: int = NER_BREAKER_FAILURES, reset_s: float = NER_BREAKER_RESET_S):
+        self.failures = failures
+        self.reset_s = reset_s
+        self._consecutive = 0
+        self._opened_at: Optional[float] = None
+        self._probe_started: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_s:
+            return "half_open"
+        return "open"
+
+    def retry_in(self) -> float:
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self.reset_s - (time.monotonic() - self._opened_at))
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "open":
+            return False
+        # half_open: una sola prueba a la vez (si se cancela, otra pasado reset_s)
+        now = time.monotonic()
+        if self._probe_started is None or now - self._probe_started >= self.reset_s:
+            self._probe_started = now
+            return True
+        return False
+
+    def success(self) -> None:
+        if self._opened_at is not None:
+            logger.info("Circuito NER cerrado")
+        self._consecutive = 0
+        self._opened_at = None
+        self._probe_started = None
+
+    def failure(self) -> None:
+        self._consecutive += 1
+        self._probe_started = None
+        if self._opened_at is not None or self._consecutive >= self.failures:
+            if self._opened_at is None:
+                logger.warning("Circuito NER abierto tras %d fallos seguidos", self._consecutive)
+                REGISTRY.inc("ner_circuit_opened_total")
+            self._opened_at = time.monotonic()
+
+
+# Compartido por todos los clientes del proceso (uno por event loop). El gauge solo
+# refleja este proceso; desde el pool de la JobQueue llega ner_circuit_opened_total
+BREAKER = CircuitBreaker()
+REGISTRY.gauge("ner_circuit_open", lambda: 0.0 if BREAKER.state == "closed" else 1.0)
+
+
+# ==================================
+# CLIENTE
+# ==================================
+class NERClient:
+    def __init__(
+        self,
+        url: str,
+        token: Optional[str] = None,
+        *,
+        timeout_s: float = NER_TIMEOUT_S,
+        deadline_s: float = NER_DEADLINE_S,
+        max_retries: int = NER_MAX_RETRIES,
+        hedge_after_ms: float = NER_HEDGE_AFTER_MS,
+        breaker: Optional[CircuitBreaker] = None,
+        http2: bool = NER_HTTP2,
+        max_connections: int = NER_MAX_CONNECTIONS,
+    ):
+        import httpx
+
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("NER_HTTP2=1 pero falta el paquete h2 (httpx[http2]): se usa HTTP/1.1")
+                http2 = False
+
+        self.url = url
+        self.timeout_s = timeout_s
+        self.deadline_s = deadline_s
+        self.max_retries = max_retries
+        self.hedge_after_s = hedge_after_ms / 1000
+        self.breaker = breaker or BREAKER
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        self._client = httpx.AsyncClient(
+            http2=http2,
+            headers=headers,
+            timeout=httpx.Timeout(timeout_s, connect=min(timeout_s, 5.0)),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=60.0,
+            ),
+        )
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def token_classification(
+        self, text: str, aggregation_strategy: str = "simple", deadline_s: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """Mismo formato que InferenceClient.token_classification (lista de dicts)."""
+        payload = {"inputs": text, "parameters": {"aggregation_strategy": aggregation_strategy}}
+        deadline = time.monotonic() + (deadline_s or self.deadline_s)
+        attempt = 0
+        while True:
+            if not self.breaker.allow():
+                REGISTRY.inc("ner_requests_total", outcome="circuit_open")
+                raise CircuitOpenError(self.breaker.retry_in())
+            try:
+                entities = await self._hedged(payload, deadline)
+            except NERError as e:
+                # Un modelo cargándose no es un servicio caído: lo cubren los reintentos
+                if e.retryable and e.reason != "loading":
+                    self.breaker.failure()
+                delay = self._backoff(attempt, e.retry_after)
+                if not e.retryable or attempt >= self.max_retries or time.monotonic() + delay >= deadline:
+                    REGISTRY.inc("ner_requests_total", outcome=e.reason)
+                    raise
+                attempt += 1
+                REGISTRY.inc("ner_retries_total", reason=e.reason)
+                logger.info("NER: %s, reintento %d/%d en %.2f s", e.reason, attempt, self.max_retries, delay)
+                await asyncio.sleep(delay)
+                continue
+            self.breaker.success()
+            REGISTRY.inc("ner_requests_total", outcome="ok")
+            return entities
+
+    @staticmethod
+    def _backoff(attempt: int, retry_after: Optional[float]) -> float:
+        # Full jitter; si el servidor indica una espera (estimated_time, Retry-After), esa más un jitter
+        if retry_after:
+            return min(retry_after, NER_BACKOFF_MAX_S) + random.uniform(0, NER_BACKOFF_BASE_S)
+        return random.uniform(0, min(NER_BACKOFF_MAX_S, NER_BACKOFF_BASE_S * 2 ** attempt))
+
+    async def _hedged(self, payload: Dict, deadline: float) -> List[Dict[str, Any]]:
+        if not self.hedge_after_s:
+            return await self._post(payload, deadline)
+
+        tasks = {asyncio.ensure_future(self._post(payload, deadline))}
+        hedge = None
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=min(self.hedge_after_s, max(0.0, deadline - time.monotonic())))
+            if not done:
+                REGISTRY.inc("ner_hedged_total")
+                hedge = asyncio.ensure_future(self._post(payload, deadline))
+                tasks.add(hedge)
+            error: Optional[BaseException] = None
+            pending = tasks
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            REGISTRY.inc("ner_hedge_wins_total")
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _post(self, payload: Dict, deadline: float) -> List[Dict[str, Any]]:
+        import httpx
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise NERError("Plazo de la llamada NER agotado", reason="deadline")
+        try:
+            response = await asyncio.wait_for(self._client.post(self.url, json=payload), remaining)
+        except asyncio.TimeoutError:
+            raise NERError("Plazo de la llamada NER agotado", reason="deadline")
+        except httpx.TimeoutException as e:
+            raise NERError(f"Timeout en la llamada NER: {type(e).__name__}", reason="timeout", retryable=True)
+        except httpx.TransportError as e:
+            raise NERError(f"Error de conexión con el servicio NER: {e}", reason="connection", retryable=True)
+
+        if response.status_code == 200:
+            return response.json()
+        raise _error_from_response(response)
+
+
+def _error_from_response(response) -> NERError:
+    try:
+        body = response.json()
+    except ValueError:
+        body = None
+    if not isinstance(body, dict):
+        body = {}
+    message = body.get("error", response.text[:200])
+    status = response.status_code
+
+    if "currently loading" in str(message):
+        return NERError(
+            "Modelo HF está cargándose, espera 1-2 min y reintenta.",
+            reason="loading",
+            retryable=True,
+            retry_after=body.get("estimated_time"),
+        )
+    if status == 429 or status >= 500:
+        retry_after = response.headers.get("Retry-After")
+        return NERError(
+            f"Error {status} del servicio NER: {message}",
+            reason=f"http_{status}",
+            retryable=True,
+            retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None,
+        )
+    if status == 404:
+        return NERError(f"Modelo no encontrado: {response.url}", reason="not_found")
+    return NERError(f"Error al procesar NER: {status} {message}", reason=f"http_{status}")
+
+
+# Un cliente por event loop: las conexiones de httpx pertenecen al loop que las abrió
+# (cada proceso del pool de la JobQueue tiene el suyo)
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, NERClient]" = weakref.WeakKeyDictionary()
+
+
+def get_ner_client(url: str, token: Optional[str] = None) -> NERClient:
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = NERClient(url, token)
+    return client
+
+
+async def close_ner_client() -> None:
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
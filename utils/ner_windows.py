@@ -0,0 +1,76 @@
+# utils/ner_windows.py
+"""
+Ventanas solapadas para el NER remoto: el modelo BERT trunca la entrada en su longitud
+máxima (512 subtokens), así que un CV largo perdía las entidades del final.
+
+No hay tokenizer local del modelo (la inferencia es remota): las ventanas se miden en
+tokens básicos de BERT (palabras y signos de puntuación), que WordPiece puede partir en
+2-3 subtokens; 200 tokens básicos quedan holgadamente por debajo de 512.
+
+    windows = split_windows(text, max_tokens=200, overlap=32)
+    per_window = [ner(text[start:end]) for start, end in windows]
+    entities = merge_entities(windows, per_window)
+"""
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Tokenización básica de BERT: secuencias alfanuméricas y cada signo de puntuación
+_BASIC_TOKEN = re.compile(r"\w+|[^\w\s]")
+
+Span = Tuple[int, int]
+
+
+def split_windows(text: str, max_tokens: int, overlap: int = 0, limit: Optional[int] = None) -> List[Span]:
+    """
+    (inicio, fin) en caracteres de ventanas de `max_tokens` tokens básicos, cada una
+    solapada `overlap` tokens con la anterior. `limit` corta tras esas ventanas
+    (limit=1: solo la cabecera del texto).
+    """
+    tokens = [(m.start(), m.end()) for m in _BASIC_TOKEN.finditer(text)]
+    if not tokens:
+        return []
+    stride = max(1, max_tokens - overlap)
+    windows: List[Span] = []
+    for first in range(0, len(tokens), stride):
+        last = min(first + max_tokens, len(tokens)) - 1
+        windows.append((tokens[first][0], tokens[last][1]))
+        if last == len(tokens) - 1 or (limit is not None and len(windows) >= limit):
+            break
+    return windows
+
+
+def _owned_ranges(windows: Sequence[Span]) -> List[Span]:
+    # Cada ventana es dueña de su texto hasta la mitad del solape con la vecina: una
+    # entidad del solape se toma de la ventana en la que queda más lejos del borde
+    bounds = [0]
+    for (_, prev_end), (start, _) in zip(windows, windows[1:]):
+        bounds.append((start + prev_end) // 2 if start < prev_end else start)
+    bounds.append(float("inf"))
+    return [(bounds[i], bounds[i + 1]) for i in range(len(windows))]
+
+
+def merge_entities(windows: Sequence[Span], results: Sequence[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Une las entidades de cada ventana con offsets relativos al texto completo, sin
+    duplicados del solape, en orden de aparición.
+    """
+    merged: List[Dict[str, Any]] = []
+    seen = set()
+    for (window_start, _), (own_start, own_end), entities in zip(windows, _owned_ranges(windows), results):
+        for ent in entities:
+            ent = dict(ent)
+            if ent.get("start") is not None and ent.get("end") is not None:
+                ent["start"] += window_start
+                ent["end"] += window_start
+                if not own_start <= ent["start"] < own_end:
+                    continue
+                key = (ent.get("entity_group"), ent["start"], ent["end"])
+            else:
+                # Sin offsets (algunos endpoints): solo se puede deduplicar por texto
+                key = (ent.get("entity_group"), ent.get("word"))
+            if key in seen:
+                continue
+            seen.add(key)
+            merged.append(ent)
+    merged.sort(key=lambda e: e["start"] if e.get("start") is not None else float("inf"))
+    return merged
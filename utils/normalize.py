@@ -0,0 +1,112 @@
+# utils/normalize.py
+"""
+Normalización de texto compartida por los matchers, la recomendación y la empleabilidad.
+
+- normalize(text): minúsculas, sin tildes y solo letras a-z y espacios (lo que comparan
+  los matchers: puestos, categorías, skills, descripciones).
+- normalize_many(texts): normalize sobre una lista (títulos, skills, puestos de todos
+  los candidatos u ofertas), calculando una sola vez cada texto distinto.
+- fold(text): minúsculas y sin tildes, conserva dígitos y puntuación (vocabulario del
+  modelo de empleabilidad; antes employability_model.normalizar).
+
+El resultado es exactamente el de lower + NFKD + encode("ascii", "ignore") (+ quitar
+[^a-z\\s] en normalize) + strip, sin recorrer el texto cuatro veces:
+
+- ASCII puro: bytes.translate con una tabla de 256 bytes.
+- Resto: str.translate con una tabla precalculada por carácter para ASCII, Latin-1,
+  Latin Extended-A (tildes, ñ, ç...) y la puntuación general; vale carácter a carácter
+  porque NFKD descompone cada uno por separado y las marcas que reordena se descartan.
+  Si queda algún carácter fuera de la tabla, el cálculo completo (con bytes.translate en
+  lugar de re.sub).
+- Cadenas cortas (títulos, skills), que se repiten mucho: LRU de NORMALIZE_CACHE_SIZE.
+"""
+import os
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+NORMALIZE_CACHE_SIZE = int(os.getenv("NORMALIZE_CACHE_SIZE", "65536"))
+# Solo se guardan en la LRU las cadenas de hasta esta longitud
+NORMALIZE_CACHE_MAX_LEN = 64
+
+_LETTERS = re.compile(r"[a-z\s]")
+_PRECOMPUTED = (*range(0x180), *range(0x2000, 0x2070))
+
+
+def _fold_char(ch: str) -> str:
+    return unicodedata.normalize("NFKD", ch.lower()).encode("ascii", "ignore").decode("ascii")
+
+
+def _normalize_char(ch: str) -> str:
+    return "".join(c for c in _fold_char(ch) if _LETTERS.match(c))
+
+
+class _Tables(NamedTuple):
+    chars: Dict[int, Optional[str]]  # str.translate
+    ascii: bytes                     # bytes.translate del texto ASCII...
+    ascii_delete: bytes              # ...y bytes que borra
+    nfkd_delete: bytes               # bytes que borra tras lower + NFKD + ASCII
+
+
+def _tables(letters_only: bool) -> _Tables:
+    out = _normalize_char if letters_only else _fold_char
+    ascii_table, ascii_delete = bytearray(range(256)), bytearray()
+    for cp in range(0x80):
+        # Un carácter ASCII da como mucho un carácter
+        if out(chr(cp)):
+            ascii_table[cp] = ord(out(chr(cp)))
+        else:
+            ascii_delete.append(cp)
+    return _Tables(
+        chars={cp: out(chr(cp)) or None for cp in _PRECOMPUTED},
+        ascii=bytes(ascii_table),
+        ascii_delete=bytes(ascii_delete),
+        nfkd_delete=bytes(
+            cp for cp in range(0x80)
+            if letters_only and not _LETTERS.match(chr(cp))
+        ),
+    )
+
+
+_NORMALIZE = _tables(letters_only=True)
+_FOLD = _tables(letters_only=False)
+
+
+def _translate(text: str, tables: _Tables) -> str:
+    if text.isascii():
+        return text.encode("ascii").translate(tables.ascii, tables.ascii_delete).decode("ascii")
+    out = text.translate(tables.chars)
+    if out.isascii():
+        return out
+    # Algún carácter fuera de la tabla (sigue igual): cálculo completo
+    return (
+        unicodedata.normalize("NFKD", text.lower()).encode("ascii", "ignore")
+        .translate(None, tables.nfkd_delete).decode("ascii")
+    )
+
+
+def _normalize(text: str) -> str:
+    return _translate(text, _NORMALIZE).strip()
+
+
+_normalize_cached = lru_cache(maxsize=NORMALIZE_CACHE_SIZE)(_normalize)
+
+
+def normalize(text: str) -> str:
+    if len(text) <= NORMALIZE_CACHE_MAX_LEN:
+        return _normalize_cached(text)
+    return _normalize(text)
+
+
+def normalize_many(texts: Iterable[str]) -> List[str]:
+    """normalize de cada texto; los repetidos (muy frecuentes en estas listas) una sola vez."""
+    texts = texts if isinstance(texts, list) else list(texts)
+    normalized = {text: normalize(text) for text in dict.fromkeys(texts)}
+    return [normalized[text] for text in texts]
+
+
+def fold(text: str) -> str:
+    if text.isascii():
+        return text.lower().strip()
+    return _translate(text, _FOLD).strip()